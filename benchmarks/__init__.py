@@ -0,0 +1 @@
+"""Benchmarks de rendimiento de compuertas, construcción y evaluación del árbol."""
@@ -0,0 +1,288 @@
+"""
+Ejecutor de benchmarks de los caminos críticos del proyecto: Compuerta.operar,
+TreeBuilder.build, Nodo.evaluate, evaluate_with_flipflop (y su versión recursiva original
+como referencia), la evaluación iterativa por niveles, la evaluación por lotes y el
+barrido exhaustivo de la tabla de verdad. Cada escenario mide operaciones por segundo
+(la mejor de varias repeticiones) y los resultados se escriben en JSON.
+
+Uso:
+    python -m benchmarks.run --output resultados.json
+    python -m benchmarks.run --baseline base.json --threshold 0.15
+    python -m benchmarks.run --filter evaluate/L6 --min-time 0.5
+
+Con --baseline se compara cada escenario contra el archivo guardado y el proceso termina
+con código 1 si alguno es más lento que la base por más del umbral indicado.
+"""
+
+import argparse
+import json
+import platform
+import random
+import sys
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+from gates import AND, OR, NAND, NOR, XOR, FlipFlop
+from main import evaluate_with_flipflop
+from tree.batch import BatchEvaluator
+from tree.builder import TreeBuilder
+from tree.evaluation import builder_levels, evaluate_gate, evaluate_leaf, evaluate_levels
+from tree.truth_table import iter_chunks
+
+MAX_LEVELS = 6
+BATCH_VECTORS = 4096
+
+# Combinaciones de compuertas: una homogénea por tipo y una mezcla fija
+GATE_MIXES = {
+    'AND': [AND],
+    'OR': [OR],
+    'NAND': [NAND],
+    'NOR': [NOR],
+    'XOR': [XOR],
+    'MIX': [AND, OR, NAND, NOR, XOR],
+}
+
+
+def _gate_types(mix: str, num_levels: int) -> list:
+    cycle = GATE_MIXES[mix]
+    return [cycle[i % len(cycle)] for i in range(num_levels)]
+
+
+def _random_leaves(builder: TreeBuilder, seed: int = 0):
+    rng = random.Random(seed)
+    for leaf in builder.get_leaves():
+        leaf.value = rng.randint(0, 1)
+
+
+def _scenario_gate(gate_class) -> Tuple[Callable[[], None], int]:
+    gate = gate_class()
+    pairs = [(a, b) for a in (0, 1) for b in (0, 1)] * 25
+
+    def run():
+        for a, b in pairs:
+            gate.operar(a, b)
+    return run, len(pairs)
+
+
+def _scenario_build(num_levels: int) -> Tuple[Callable[[], None], int]:
+    gate_types = _gate_types('MIX', num_levels)
+
+    def run():
+        TreeBuilder(num_levels=num_levels, gate_types=gate_types).build()
+    return run, 1
+
+
+def _scenario_evaluate(mix: str, num_levels: int, with_ff: bool) -> Tuple[Callable[[], None], int]:
+    builder = TreeBuilder(num_levels=num_levels, gate_types=_gate_types(mix, num_levels))
+    root = builder.build()
+    _random_leaves(builder)
+    if not with_ff:
+        return root.evaluate, 1
+
+    # Un flip-flop en la entrada del hijo izquierdo de la raíz (o de la raíz con 1 nivel)
+    ff_map = {'L' if num_levels > 1 else '': (FlipFlop(), 'input')}
+    return (lambda: evaluate_with_flipflop(root, ff_map)), 1
+
+
+def _evaluate_recursive(node, ff_map: dict, path: str = "") -> int:
+    # Versión recursiva original de evaluate_with_flipflop, para comparar con recursive/L*
+    ff_entry = ff_map.get(path)
+    if node.is_leaf():
+        return evaluate_leaf(node, ff_entry)
+    left_val = _evaluate_recursive(node.left, ff_map, path + 'L')
+    right_val = _evaluate_recursive(node.right, ff_map, path + 'R')
+    return evaluate_gate(node, left_val, right_val, ff_entry)
+
+
+def _scenario_recursive(num_levels: int, with_ff: bool) -> Tuple[Callable[[], None], int]:
+    # Mismo circuito y ff_map que evaluate/L*/MIX[/ff]
+    builder = TreeBuilder(num_levels=num_levels, gate_types=_gate_types('MIX', num_levels))
+    root = builder.build()
+    _random_leaves(builder)
+    ff_map = {'L' if num_levels > 1 else '': (FlipFlop(), 'input')} if with_ff else {}
+    return (lambda: _evaluate_recursive(root, ff_map)), 1
+
+
+def _scenario_levels(num_levels: int) -> Tuple[Callable[[], None], int]:
+    builder = TreeBuilder(num_levels=num_levels, gate_types=_gate_types('MIX', num_levels))
+    builder.build()
+    _random_leaves(builder)
+    levels = builder_levels(builder)
+    return (lambda: evaluate_levels(levels)), 1
+
+
+def _scenario_batch(num_levels: int) -> Tuple[Callable[[], None], int]:
+    builder = TreeBuilder(num_levels=num_levels, gate_types=_gate_types('MIX', num_levels))
+    evaluator = BatchEvaluator(builder)
+    rng = random.Random(1)
+    columns = [rng.getrandbits(BATCH_VECTORS) for _ in range(evaluator.num_inputs)]
+    return (lambda: evaluator.evaluate(columns, BATCH_VECTORS)), BATCH_VECTORS
+
+
+def _scenario_sweep(num_levels: int) -> Tuple[Callable[[], None], int]:
+    builder = TreeBuilder(num_levels=num_levels, gate_types=_gate_types('MIX', num_levels))
+    rows = 2 ** (2 ** num_levels)
+
+    def run():
+        for _ in iter_chunks(builder):
+            pass
+    return run, rows
+
+
+def scenarios() -> Dict[str, Callable[[], Tuple[Callable[[], None], int]]]:
+    """
+    Retorna los escenarios disponibles. Cada valor es una función que prepara el
+    escenario y devuelve (función a medir, operaciones por llamada).
+    """
+    result = {}
+    for gate_class in (AND, OR, NAND, NOR, XOR):
+        result[f"gate/{gate_class.__name__}"] = lambda g=gate_class: _scenario_gate(g)
+    for num_levels in range(1, MAX_LEVELS + 1):
+        result[f"build/L{num_levels}"] = lambda n=num_levels: _scenario_build(n)
+    for num_levels in range(1, MAX_LEVELS + 1):
+        for mix in GATE_MIXES:
+            for with_ff in (False, True):
+                name = f"evaluate/L{num_levels}/{mix}" + ("/ff" if with_ff else "")
+                result[name] = lambda n=num_levels, m=mix, f=with_ff: _scenario_evaluate(m, n, f)
+    for num_levels in range(1, MAX_LEVELS + 1):
+        for with_ff in (False, True):
+            name = f"recursive/L{num_levels}" + ("/ff" if with_ff else "")
+            result[name] = lambda n=num_levels, f=with_ff: _scenario_recursive(n, f)
+    for num_levels in range(1, MAX_LEVELS + 1):
+        result[f"levels/L{num_levels}"] = lambda n=num_levels: _scenario_levels(n)
+    for num_levels in range(1, MAX_LEVELS + 1):
+        result[f"batch/L{num_levels}"] = lambda n=num_levels: _scenario_batch(n)
+    # El barrido exhaustivo crece como 2^(2^n): se limita a 4 niveles (65536 filas)
+    for num_levels in range(1, 5):
+        result[f"sweep/L{num_levels}"] = lambda n=num_levels: _scenario_sweep(n)
+    return result
+
+
+def measure(func: Callable[[], None], ops_per_call: int, min_time: float = 0.2, repeat: int = 3) -> dict:
+    """
+    Mide una función llamándola en bucle hasta superar min_time, repeat veces.
+
+    Args:
+        func: Función a medir
+        ops_per_call: Operaciones que representa cada llamada
+        min_time: Tiempo mínimo (segundos) de cada repetición
+        repeat: Cantidad de repeticiones; se reporta la mejor
+    Returns:
+        Diccionario con ops_per_sec, seconds_per_call e iterations de la mejor repetición
+    """
+    best = None
+    for _ in range(repeat):
+        iterations = 0
+        start = time.perf_counter()
+        elapsed = 0.0
+        while elapsed < min_time or iterations == 0:
+            func()
+            iterations += 1
+            elapsed = time.perf_counter() - start
+        per_call = elapsed / iterations
+        if best is None or per_call < best[0]:
+            best = (per_call, iterations)
+
+    per_call, iterations = best
+    return {
+        "ops_per_sec": ops_per_call / per_call if per_call else float('inf'),
+        "seconds_per_call": per_call,
+        "iterations": iterations,
+    }
+
+
+def run_benchmarks(name_filter: Optional[str] = None, min_time: float = 0.2, repeat: int = 3) -> dict:
+    """
+    Args:
+        name_filter: Si se indica, solo se ejecutan los escenarios cuyo nombre lo contiene
+        min_time: Tiempo mínimo por repetición
+        repeat: Repeticiones por escenario
+    Returns:
+        Diccionario serializable a JSON con "meta" y "results"
+    """
+    results = {}
+    for name, setup in scenarios().items():
+        if name_filter and name_filter not in name:
+            continue
+        func, ops = setup()
+        results[name] = measure(func, ops, min_time=min_time, repeat=repeat)
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "min_time": min_time,
+            "repeat": repeat,
+        },
+        "results": results,
+    }
+
+
+def compare_results(current: dict, baseline: dict, threshold: float = 0.1) -> List[dict]:
+    """
+    Compara dos ejecuciones escenario por escenario.
+
+    Args:
+        current: Resultado de run_benchmarks
+        baseline: Resultado guardado anteriormente
+        threshold: Caída relativa de ops_per_sec tolerada (0.1 = 10 %)
+    Returns:
+        Lista de regresiones, cada una con name, baseline, current y ratio
+    """
+    regressions = []
+    for name, result in current["results"].items():
+        base = baseline.get("results", {}).get(name)
+        if base is None or not base["ops_per_sec"]:
+            continue
+        ratio = result["ops_per_sec"] / base["ops_per_sec"]
+        if ratio < 1 - threshold:
+            regressions.append({
+                "name": name,
+                "baseline": base["ops_per_sec"],
+                "current": result["ops_per_sec"],
+                "ratio": ratio,
+            })
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmarks del simulador de compuertas lógicas")
+    parser.add_argument("--output", "-o", help="Archivo JSON donde guardar los resultados")
+    parser.add_argument("--baseline", "-b", help="Archivo JSON con resultados base para comparar")
+    parser.add_argument("--threshold", "-t", type=float, default=0.1,
+                        help="Caída relativa tolerada respecto a la base (por defecto 0.1)")
+    parser.add_argument("--filter", "-k", dest="name_filter", help="Solo escenarios que contengan este texto")
+    parser.add_argument("--min-time", type=float, default=0.2, help="Segundos mínimos por repetición")
+    parser.add_argument("--repeat", type=int, default=3, help="Repeticiones por escenario")
+    parser.add_argument("--list", action="store_true", help="Lista los escenarios y termina")
+    args = parser.parse_args(argv)
+
+    if args.list:
+        for name in scenarios():
+            print(name)
+        return 0
+
+    current = run_benchmarks(args.name_filter, args.min_time, args.repeat)
+    for name, result in current["results"].items():
+        print(f"{name:<28} {result['ops_per_sec']:>16,.1f} ops/s")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(current, f, indent=2, sort_keys=True)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare_results(current, baseline, args.threshold)
+        for reg in regressions:
+            print(
+                f"REGRESIÓN {reg['name']}: {reg['current']:,.1f} ops/s "
+                f"vs {reg['baseline']:,.1f} ops/s ({reg['ratio']:.0%})",
+                file=sys.stderr
+            )
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -3,18 +3,30 @@
 from gates.base import Compuerta
 
 
+def _es_arreglo(x) -> bool:
+    # Arreglos NumPy (o compatibles) sin necesidad de importar NumPy
+    return hasattr(x, 'shape') and hasattr(x, 'dtype')
+
+
 class CompuertaController:
     """
     Controller que gestiona las operaciones de las compuertas.
     Patrón: Controller para separar lógica de negocio de la presentación.
     """
     
-    def operar(self, compuerta: Compuerta, A, B=None):
+    def operar(self, compuerta: Compuerta, A, B=None, mask=None):
         """
+        Despacha automáticamente entre la versión escalar (operar) y la vectorizada
+        (operar_batch): se usa la vectorizada si se indica mask o si alguna entrada
+        es un arreglo NumPy.
+
         Args:
             compuerta: Instancia de Compuerta a utilizar
-            A: Primera entrada
+            A: Primera entrada (0/1, entero empaquetado o arreglo)
             B: Segunda entrada (opcional)
+            mask: Bits válidos para entradas empaquetadas en enteros
 
         """
+        if mask is not None or _es_arreglo(A) or _es_arreglo(B):
+            return compuerta.operar_batch(A, B, mask)
         return compuerta.operar(A, B)
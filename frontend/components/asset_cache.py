@@ -0,0 +1,64 @@
+"""
+Caché de assets SVG compartida por todo el proceso:
+Cada archivo de config.GATE_ASSETS se lee del disco una sola vez y, por cada combinación
+(asset, estado), se compila un único QSvgRenderer que todos los nodos comparten con
+setSharedRenderer. Así, alternar una entrada o repintar una columna completa no hace
+lecturas de disco, no vuelve a parsear el XML y no crea renderers nuevos.
+"""
+import os
+from PyQt6.QtSvg import QSvgRenderer
+from config import COLORS, GATE_ASSETS
+
+# Texto SVG original por ruta de archivo
+_templates = {}
+# Renderer compilado por (ruta, estado); el estado None es el dibujo sin modificar
+_renderers = {}
+
+
+def get_template(asset_path):
+    """Retorna el texto SVG del archivo, leyéndolo del disco solo la primera vez."""
+    template = _templates.get(asset_path)
+    if template is None:
+        if os.path.exists(asset_path):
+            with open(asset_path, 'r') as f:
+                template = f.read()
+        else:
+            print(f"Error: No se encontró el archivo en {asset_path}")
+            template = ""
+        _templates[asset_path] = template
+    return template
+
+
+def _render_state(template, state):
+    # Mismo reemplazo que hacía InputNode: color de fondo y texto según el estado
+    color = COLORS["ON"] if state == 1 else COLORS["OFF"]
+    xml = template.replace('fill="red"', f'fill="{color}"')
+    return xml.replace('>0<', f'>{state}<')
+
+
+def get_renderer(asset_path, state=None):
+    """
+    Args:
+        asset_path: Ruta del archivo SVG (un valor de GATE_ASSETS)
+        state: 0 o 1 para dibujar el estado de una entrada; None para el dibujo original
+    Returns:
+        QSvgRenderer compartido para esa combinación
+    """
+    key = (asset_path, state)
+    renderer = _renderers.get(key)
+    if renderer is None:
+        template = get_template(asset_path)
+        xml = template if state is None else _render_state(template, state)
+        renderer = QSvgRenderer(xml.encode('utf-8'))
+        _renderers[key] = renderer
+    return renderer
+
+
+def preload():
+    """Compila de antemano los renderers de todos los assets (las entradas en sus dos estados)."""
+    for nombre, asset_path in GATE_ASSETS.items():
+        if nombre == "INPUT":
+            get_renderer(asset_path, 0)
+            get_renderer(asset_path, 1)
+        else:
+            get_renderer(asset_path)
@@ -0,0 +1,191 @@
+"""
+Modelo del circuito para la interfaz:
+Mantiene el circuito real (TreeBuilder compilado a Netlist) que corresponde a lo que se ve en
+pantalla y lo evalúa en un hilo aparte (QThread), para que la evaluación de circuitos grandes
+o los barridos de la tabla de verdad nunca congelen el bucle de eventos.
+Los cambios se agrupan: varios clics seguidos sobre las entradas se juntan en una sola
+evaluación (un QTimer de disparo único), y mientras el hilo está ocupado los cambios nuevos
+se acumulan y se envían juntos cuando termina. El resultado trae solo los nodos cuyo valor
+cambió (Netlist.update_leaves), así la vista actualiza únicamente esos elementos.
+"""
+import sys
+from PyQt6.QtCore import QObject, QThread, QTimer, pyqtSignal, pyqtSlot
+from config import PROJECT_DIR
+
+# El motor (gates, tree) está en la carpeta raíz del proyecto
+if str(PROJECT_DIR) not in sys.path:
+    sys.path.append(str(PROJECT_DIR))
+
+from gates import AND, OR, NAND, NOR, XOR
+from tree.builder import TreeBuilder
+from tree.analytics import signal_statistics
+
+# Compuertas que el motor sabe evaluar, con el nombre que muestra la interfaz
+GATE_CLASSES = {
+    "AND": AND,
+    "OR": OR,
+    "NAND": NAND,
+    "NOR": NOR,
+    "XOR": XOR,
+}
+
+
+class EvaluationWorker(QObject):
+    """Objeto que vive en el hilo de evaluación; es el único que toca la Netlist."""
+
+    # (niveles, {heap: valor} de los nodos que cambiaron, salida de la raíz)
+    resultado = pyqtSignal(int, object, int)
+    # (filas con salida 1, filas totales); object porque superan los 64 bits desde 6 niveles
+    barrido_listo = pyqtSignal(object, object)
+
+    def __init__(self):
+        super().__init__()
+        self.builder = None
+        self.netlist = None
+
+    @pyqtSlot(object)
+    def procesar(self, trabajo):
+        tipos, hojas = trabajo
+        if tipos is not None:
+            # Circuito nuevo: se compila y se evalúa completo; todos los nodos se informan
+            self.builder = TreeBuilder(len(tipos), [GATE_CLASSES[t] for t in tipos])
+            self.netlist = self.builder.compile()
+            self.netlist.set_leaves(hojas)
+            self.netlist.evaluate()
+            values = self.netlist.values
+            cambios = {heap: values[heap] for heap in range(1, len(values))}
+        else:
+            flipped = self.netlist.update_leaves(hojas)
+            cambios = {heap: self.netlist.values[heap] for heap in flipped}
+        self.resultado.emit(self.netlist.num_levels, cambios, self.netlist.values[1])
+
+    @pyqtSlot()
+    def barrer(self):
+        """Cuenta las filas de la tabla de verdad cuya salida es 1."""
+        if self.builder is None:
+            return
+        # Cuenta exacta por programación dinámica, sin recorrer la tabla de verdad
+        ones = signal_statistics(self.builder).count()
+        self.barrido_listo.emit(ones, 2 ** self.netlist.num_inputs)
+
+
+class CircuitModel(QObject):
+    # Los trabajos viajan al hilo de evaluación por señales (conexión en cola)
+    _trabajo = pyqtSignal(object)
+    _barrido = pyqtSignal()
+
+    # ({heap: valor}, salida de la raíz) de los nodos que cambiaron
+    nodos_actualizados = pyqtSignal(object, int)
+    barrido_listo = pyqtSignal(object, object)
+    error = pyqtSignal(str)
+
+    def __init__(self, parent=None, demora_ms=15):
+        """
+        Args:
+            parent: QObject dueño del modelo
+            demora_ms: Tiempo durante el cual se juntan los cambios antes de evaluar
+        """
+        super().__init__(parent)
+        self.tipos = []
+        self.hojas = bytearray()
+
+        # Cambios pendientes de enviar al hilo de evaluación
+        self._hojas_pendientes = {}
+        self._reconstruir = False
+        self._ocupado = False
+        self._barrido_pendiente = False
+
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(demora_ms)
+        self._timer.timeout.connect(self._enviar)
+
+        self._hilo = QThread(self)
+        self._worker = EvaluationWorker()
+        self._worker.moveToThread(self._hilo)
+        self._trabajo.connect(self._worker.procesar)
+        self._barrido.connect(self._worker.barrer)
+        self._worker.resultado.connect(self._recibir)
+        self._worker.barrido_listo.connect(self.barrido_listo)
+        self._hilo.start()
+
+    def set_circuito(self, tipos):
+        """
+        Define las compuertas de cada nivel (tipos[0] es la raíz). Las hojas conservan su
+        valor cuando existen en el circuito nuevo y las agregadas empiezan en 0.
+        """
+        invalidos = [t for t in tipos if t not in GATE_CLASSES]
+        if invalidos:
+            self.error.emit(f"Compuerta no soportada por el motor: {invalidos[0]}")
+            return
+        cant = 2 ** len(tipos)
+        self.hojas = self.hojas[:cant] + bytearray(max(0, cant - len(self.hojas)))
+        self.tipos = list(tipos)
+        self._reconstruir = True
+        self._hojas_pendientes.clear()
+        self._programar()
+
+    def set_tipo(self, nivel, tipo):
+        """Cambia la compuerta del nivel indicado (1 = raíz)."""
+        if not 1 <= nivel <= len(self.tipos):
+            return
+        tipos = list(self.tipos)
+        tipos[nivel - 1] = tipo
+        self.set_circuito(tipos)
+
+    def set_hoja(self, index, valor):
+        """Asigna el valor de una entrada; la evaluación se agrupa con los demás cambios."""
+        valor = 1 if valor else 0
+        if not 0 <= index < len(self.hojas) or self.hojas[index] == valor:
+            return
+        self.hojas[index] = valor
+        self._hojas_pendientes[index] = valor
+        self._programar()
+
+    def solicitar_barrido(self):
+        """
+        Pide al hilo de evaluación contar las filas de la tabla de verdad con salida 1.
+        Si hay un circuito nuevo pendiente, se cuenta después de compilarlo.
+        """
+        self._barrido_pendiente = True
+        self._enviar_barrido()
+
+    def cerrar(self):
+        """Detiene el hilo de evaluación (llamar al cerrar la ventana)."""
+        self._timer.stop()
+        self._hilo.quit()
+        self._hilo.wait()
+
+    def _programar(self):
+        if not self._timer.isActive():
+            self._timer.start()
+
+    def _enviar(self):
+        # Si el hilo está ocupado, los cambios se envían juntos al recibir el resultado
+        if self._ocupado or not self.tipos:
+            return
+        if self._reconstruir:
+            trabajo = (tuple(self.tipos), bytes(self.hojas))
+        elif self._hojas_pendientes:
+            trabajo = (None, dict(self._hojas_pendientes))
+        else:
+            return
+        self._reconstruir = False
+        self._hojas_pendientes.clear()
+        self._ocupado = True
+        self._trabajo.emit(trabajo)
+
+    def _enviar_barrido(self):
+        if not self._barrido_pendiente or self._ocupado or self._reconstruir or not self.tipos:
+            return
+        self._barrido_pendiente = False
+        self._barrido.emit()
+
+    @pyqtSlot(int, object, int)
+    def _recibir(self, niveles, cambios, salida):
+        self._ocupado = False
+        # Un resultado de un circuito que ya se reemplazó se descarta
+        if niveles == len(self.tipos) and not self._reconstruir:
+            self.nodos_actualizados.emit(cambios, salida)
+        self._enviar()
+        self._enviar_barrido()
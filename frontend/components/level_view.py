@@ -0,0 +1,188 @@
+"""
+Administrador de la escena de niveles:
+Construye una sola vez los elementos de cada nivel (entradas, compuertas, cables y selectores)
+y los reutiliza cuando cambia el slider. Al pasar de N a M niveles solo se crean los elementos
+que todavía no existen, y los que sobran se sacan de la escena y quedan guardados para volver
+a usarse, en lugar de limpiar la escena y redibujar todo. Así la cantidad de elementos en la
+escena es exactamente la del circuito.
+"""
+from PyQt6.QtWidgets import (
+    QComboBox, QGraphicsEllipseItem, QGraphicsLineItem, QGraphicsProxyWidget, QLabel, QVBoxLayout, QWidget
+)
+from PyQt6.QtCore import Qt
+from PyQt6.QtGui import QBrush, QColor
+from components.circuit_model import GATE_CLASSES
+from components.input_node import InputNode
+from config import COLORS, GATE_ASSETS
+
+ANCHO_COLUMNA = 250
+X_INICIAL = 50
+ALTO_BASE = 50
+OFFSET_Y = 110
+
+
+class LevelSceneManager:
+    def __init__(self, escena, on_tipo_cambiado=None, on_input_cambiado=None):
+        """
+        Args:
+            escena: QGraphicsScene donde se dibuja el circuito
+            on_tipo_cambiado: Función (nivel, tipo) que se llama cuando cambia un selector
+            on_input_cambiado: Función (índice, estado) que se llama cuando se alterna una entrada
+        """
+        self.escena = escena
+        self.on_tipo_cambiado = on_tipo_cambiado
+        self.on_input_cambiado = on_input_cambiado
+        self.nivel = 0
+        self.brushes = {valor: QBrush(QColor(COLORS["ON" if valor else "OFF"])) for valor in (0, 1)}
+
+        # Entradas en el orden de las hojas
+        self.inputs = []
+        # Columnas de compuertas por distancia a las entradas (columna 1 = junto a las entradas):
+        # cada una guarda sus compuertas y los dos cables de cada compuerta
+        self.columnas = []
+        # Selectores por nivel del árbol (nivel 1 = raíz); se mueven cuando cambia la cantidad de niveles
+        self.selectores = {}
+
+    def mostrar(self, nivel):
+        """Ajusta la escena para mostrar un circuito de 'nivel' niveles reutilizando los elementos."""
+        self._ajustar_inputs(2 ** nivel)
+
+        for c in range(1, nivel + 1):
+            self._ajustar_columna(c, 2 ** (nivel - c))
+        for c in range(nivel + 1, len(self.columnas) + 1):
+            self._ajustar_columna(c, 0)
+
+        for n in range(1, nivel + 1):
+            proxy = self._selector(n)
+            proxy.setPos(self._x_columna(nivel - n + 1) - 30, 20)
+            self._mostrar_item(proxy, True)
+        for n, proxy in self.selectores.items():
+            if n > nivel:
+                self._mostrar_item(proxy, False)
+
+        self.nivel = nivel
+
+    def _mostrar_item(self, item, visible):
+        # Agrega o saca el elemento de la escena solo si cambia su estado; el objeto se conserva
+        if visible and item.scene() is None:
+            self.escena.addItem(item)
+        elif not visible and item.scene() is not None:
+            self.escena.removeItem(item)
+
+    def _y_input(self, i):
+        return i * ALTO_BASE + OFFSET_Y
+
+    def _x_columna(self, c):
+        return X_INICIAL + c * ANCHO_COLUMNA
+
+    def _y_gate(self, c, j):
+        # Promedio de las posiciones de las 2^c entradas que alimentan la compuerta j de la columna c
+        ancho = 2 ** c
+        return OFFSET_Y + ALTO_BASE * (j * ancho + (ancho - 1) / 2)
+
+    def _y_origen(self, c, j):
+        # Posición vertical de la señal j que entra a la columna c (entrada o compuerta anterior)
+        return self._y_input(j) if c == 1 else self._y_gate(c - 1, j)
+
+    def _ajustar_inputs(self, cantidad):
+        while len(self.inputs) < cantidad:
+            nodo_input = InputNode(GATE_ASSETS["INPUT"])
+            nodo_input.setPos(X_INICIAL, self._y_input(len(self.inputs)))
+            nodo_input.on_toggle = lambda estado, i=len(self.inputs): self._input_cambiado(i, estado)
+            self.inputs.append(nodo_input)
+        for i, nodo_input in enumerate(self.inputs):
+            self._mostrar_item(nodo_input, i < cantidad)
+
+    def _ajustar_columna(self, c, cantidad):
+        while len(self.columnas) < c:
+            self.columnas.append({"gates": [], "lineas": []})
+        columna = self.columnas[c - 1]
+        x_actual = self._x_columna(c)
+
+        while len(columna["gates"]) < cantidad:
+            j = len(columna["gates"])
+            y_gate = self._y_gate(c, j)
+            y_entrada_a = self._y_origen(c, 2 * j)
+            y_entrada_b = self._y_origen(c, 2 * j + 1)
+
+            # Dibujamos la compuerta (reemplazar con GateNode después)
+            columna["gates"].append(QGraphicsEllipseItem(x_actual, y_gate, 60, 40))
+
+            # Dibujamos los cables para ver la conexión
+            columna["lineas"].append((
+                QGraphicsLineItem(x_actual - ANCHO_COLUMNA + 30, y_entrada_a + 15, x_actual, y_gate + 10),
+                QGraphicsLineItem(x_actual - ANCHO_COLUMNA + 30, y_entrada_b + 15, x_actual, y_gate + 30),
+            ))
+
+        for j, gate in enumerate(columna["gates"]):
+            visible = j < cantidad
+            self._mostrar_item(gate, visible)
+            for linea in columna["lineas"][j]:
+                self._mostrar_item(linea, visible)
+
+    def _selector(self, n):
+        """Retorna (creándolo la primera vez) el ComboBox que flota sobre la columna del nivel n."""
+        if n in self.selectores:
+            return self.selectores[n]
+
+        cant = 2 ** (n - 1)
+        contenedor = QWidget()
+        layout = QVBoxLayout(contenedor)
+
+        # Etiqueta de info (Nivel y cantidad)
+        info = QLabel(f"NIVEL {n}\n2^{n-1} = {cant}")
+        info.setStyleSheet("color: white; font-weight: bold; font-size: 14px;")
+        info.setAlignment(Qt.AlignmentFlag.AlignCenter)
+
+        combo = QComboBox()
+        combo.addItems(list(GATE_CLASSES))
+        # Enviar el texto seleccionado
+        combo.currentTextChanged.connect(lambda texto, nivel=n: self._tipo_cambiado(nivel, texto))
+
+        layout.addWidget(info)
+        layout.addWidget(combo)
+
+        proxy = QGraphicsProxyWidget()
+        proxy.setWidget(contenedor)
+        # Aseguramos que el mouse funcione en el widget
+        proxy.setFocusPolicy(Qt.FocusPolicy.ClickFocus)
+        proxy.combo = combo
+        self.selectores[n] = proxy
+        return proxy
+
+    def _input_cambiado(self, index, estado):
+        if self.on_input_cambiado:
+            self.on_input_cambiado(index, estado)
+
+    def _tipo_cambiado(self, nivel, texto):
+        if self.on_tipo_cambiado:
+            self.on_tipo_cambiado(nivel, texto)
+
+    def gates_de_nivel(self, n):
+        """Retorna los elementos gráficos visibles de las compuertas del nivel n (1 = raíz)."""
+        c = self.nivel - n + 1
+        if not 1 <= c <= len(self.columnas):
+            return []
+        return self.columnas[c - 1]["gates"][:2 ** (n - 1)]
+
+    def tipos(self):
+        """Retorna el tipo elegido en el selector de cada nivel visible, empezando por la raíz."""
+        return [self.selectores[n].combo.currentText() for n in range(1, self.nivel + 1)]
+
+    def aplicar_valores(self, cambios, salida=None):
+        """
+        Actualiza solo los elementos de los nodos indicados.
+
+        Args:
+            cambios: Diccionario índice de heap -> valor (1 = raíz; las hojas empiezan en 2^nivel)
+            salida: Salida de la raíz (no se usa; se acepta para conectar la señal del modelo)
+        """
+        hojas = 2 ** self.nivel
+        for heap, valor in cambios.items():
+            if heap >= 2 * hojas:
+                continue
+            if heap >= hojas:
+                self.inputs[heap - hojas].set_state(valor)
+                continue
+            n = heap.bit_length()
+            self.columnas[self.nivel - n]["gates"][heap - 2 ** (n - 1)].setBrush(self.brushes[valor])
@@ -4,7 +4,7 @@ from PyQt6.QtWidgets import (
 )
 from PyQt6.QtGui import QPixmap, QFont
 from PyQt6.QtCore import Qt, QSize
-from config import GATE_ASSETS
+from config import GATE_ASSETS, MAX_DISPLAY_LEVELS
 
 class SideBar(QWidget):
     def __init__(self, on_level_change_callback):
@@ -40,7 +40,7 @@ class SideBar(QWidget):
 
         self.slider_niveles = QSlider(Qt.Orientation.Horizontal)
         self.slider_niveles.setMinimum(1)
-        self.slider_niveles.setMaximum(6)
+        self.slider_niveles.setMaximum(MAX_DISPLAY_LEVELS)
         self.slider_niveles.setStyleSheet("padding: 5px;")
 
         self.slider_niveles.valueChanged.connect(self.actualizar_valor_slider)
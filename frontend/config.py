@@ -4,6 +4,8 @@ from pathlib import Path
 # Buscamos la carpeta donde está este archivo
 BASE_DIR = Path(__file__).resolve().parent
 ASSETS_DIR = BASE_DIR / "assets"
+# Carpeta raíz del proyecto, donde está el motor (gates, tree)
+PROJECT_DIR = BASE_DIR.parent
 
 # Diccionario de Assets
 GATE_ASSETS = {
@@ -17,6 +19,9 @@ GATE_ASSETS = {
     "FF_SR": str(ASSETS_DIR / "flipflop_sr.svg"),
 }
 
+# Máximo de niveles que la interfaz dibuja (política de visualización; el motor no tiene límite)
+MAX_DISPLAY_LEVELS = 6
+
 # Configuraciones visuales globales
 COLORS = {
     "ON": "#00FF00",  # Verde para el 1
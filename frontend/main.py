@@ -1,9 +1,9 @@
 # Lo tengo mas para ir probando las cosas hay unas que sirven y otras que no, esta con Gemini y he cambiado algunas cosas 
 import sys
-from PyQt6.QtWidgets import QApplication, QMainWindow, QHBoxLayout, QWidget, QGraphicsScene, QGraphicsView, QComboBox, QGraphicsProxyWidget, QVBoxLayout, QLabel
-from PyQt6.QtCore import Qt
-from components.input_node import InputNode
-from config import GATE_ASSETS
+from PyQt6.QtWidgets import QApplication, QMainWindow, QHBoxLayout, QLabel, QWidget, QGraphicsScene, QGraphicsView
+from components import asset_cache
+from components.circuit_model import CircuitModel
+from components.level_view import LevelSceneManager
 from components.sidebar import SideBar 
 
 class MainWindow(QMainWindow):
@@ -24,6 +24,21 @@ class MainWindow(QMainWindow):
         # 3. Configurar la Escena (Lienzo)
         self.escena = QGraphicsScene(0, 0, 2000, 2000)
         self.vista = QGraphicsView(self.escena)
+        self.niveles_view = LevelSceneManager(
+            self.escena,
+            on_tipo_cambiado=self.cambiar_tipo_columna,
+            on_input_cambiado=self.cambiar_entrada
+        )
+
+        # Modelo del circuito: se evalúa en otro hilo y avisa qué nodos cambiaron
+        self.modelo = CircuitModel(self)
+        self.modelo.nodos_actualizados.connect(self.niveles_view.aplicar_valores)
+        self.modelo.error.connect(lambda mensaje: self.statusBar().showMessage(mensaje, 3000))
+
+        # Cantidad de combinaciones de entrada con salida 1, se actualiza con cada circuito nuevo
+        self.etiqueta_unos = QLabel()
+        self.statusBar().addPermanentWidget(self.etiqueta_unos)
+        self.modelo.barrido_listo.connect(self.mostrar_barrido)
 
         # 4. Agregar a la interfaz
         self.layout_principal.addWidget(self.sidebar)
@@ -33,97 +48,37 @@ class MainWindow(QMainWindow):
     def generar_niveles(self, nivel):
         """
         Esta función se ejecuta CADA VEZ que mueves el slider. 
-        Recibe el número de niveles seleccionados y se encarga de dibujar la estructura base en el lienzo.
+        Recibe el número de niveles seleccionados y ajusta la estructura en el lienzo:
+        los elementos ya dibujados se reutilizan y solo se agregan o quitan los del cambio.
         """
-        # Limpiamos la escena anterior
-        self.escena.clear()
+        self.niveles_view.mostrar(nivel)
+        self.modelo.set_circuito(self.niveles_view.tipos())
+        self.modelo.solicitar_barrido()
 
-        ancho_columna = 250
-        x_inicial = 50
-        alto_base = 50
-
-        # --- DIBUJAR LOS INPUT NODES ---
-        cant_inputs = 2**nivel
-        nodos_previos = []
-        offset_y = 110
-
-        for i in range(cant_inputs):
-            y_pos = i * alto_base + offset_y
-    
-            nodo_input = InputNode(GATE_ASSETS["INPUT"])
-            self.escena.addItem(nodo_input)
-            nodo_input.setPos(x_inicial, y_pos)
-
-            nodos_previos.append(y_pos)
-
-            # --- PASO 2: DIBUJAR LAS COLUMNAS DE COMPUERTAS ---
-            x_actual = x_inicial
-            
-            for n in range(nivel, 0, -1):
-                x_actual += ancho_columna
-                cant_gates = 2**(n-1)
-                nodos_actuales = [] # Guardaremos las nuevas Y para la siguiente columna
-                
-                # Creamos el selector de este nivel
-                self.crear_selector_nivel(x_actual, n, cant_gates)
-
-                for i in range(cant_gates):
-                    idx_a = i * 2
-                    idx_b = i * 2 + 1
-                    
-                    if idx_b < len(nodos_previos):
-                        y_entrada_a = nodos_previos[idx_a]
-                        y_entrada_b = nodos_previos[idx_b]
-                        y_gate = (y_entrada_a + y_entrada_b) / 2
-                        
-                        # Dibujamos la compuerta (reemplazar con GateNode después)
-                        self.escena.addEllipse(x_actual, y_gate, 60, 40)
-                        
-                        # Dibujamos los cables para ver la conexión
-                        self.escena.addLine(x_actual - ancho_columna + 30, y_entrada_a + 15, x_actual, y_gate + 10)
-                        self.escena.addLine(x_actual - ancho_columna + 30, y_entrada_b + 15, x_actual, y_gate + 30)
-                        
-                        nodos_actuales.append(y_gate)
-                    
-                    nodos_previos = nodos_actuales
-
-    def crear_selector_nivel(self, x, n, cant):
-        """Genera el ComboBox que flota sobre la columna"""
-        contenedor = QWidget()
-        layout = QVBoxLayout(contenedor)
-
-        # Etiqueta de info (Nivel y cantidad)
-        info = QLabel(f"NIVEL {n}\n2^{n-1} = {cant}")
-        info.setStyleSheet("color: white; font-weight: bold; font-size: 14px;")
-        info.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        
-        combo = QComboBox()
-        combo.addItems(["AND", "OR", "NAND", "NOR", "XOR", "XNOR"])
-        # Enviar el texto seleccionado
-        combo.currentTextChanged.connect(lambda texto, nivel=n: self.cambiar_tipo_columna(nivel, texto))
-
-        layout.addWidget(info)
-        layout.addWidget(combo)
-
-        proxy = QGraphicsProxyWidget()
-        proxy.setWidget(contenedor)
-        proxy.setPos(x - 30, 20)
-        # Aseguramos que el mouse funcione en el widget
-        proxy.setFocusPolicy(Qt.FocusPolicy.ClickFocus) 
-        self.escena.addItem(proxy)
-    
     def cambiar_tipo_columna(self, nivel, tipo_compuerta):
         """
         Esta función se activa cuando el ComboBox cambia.
         'nivel' nos dice qué columna es, 'tipo_compuerta' nos dice si es AND, OR, etc.
         """
-        print(f"Columna del Nivel {nivel} ahora será de tipo: {tipo_compuerta}")
-        
-        # Aquí es donde buscaremos los círculos de esa columna y les 
-        # cambiaremos la imagen en el siguiente paso.
+        self.modelo.set_tipo(nivel, tipo_compuerta)
+        self.modelo.solicitar_barrido()
+
+    def mostrar_barrido(self, unos, total):
+        """Muestra en la barra de estado cuántas combinaciones de entrada dan salida 1."""
+        self.etiqueta_unos.setText(f"Salida en 1: {unos:,} de {total:,} combinaciones")
+
+    def cambiar_entrada(self, index, estado):
+        """Se activa al hacer clic en una entrada; el modelo junta los clics seguidos en una evaluación."""
+        self.modelo.set_hoja(index, estado)
+
+    def closeEvent(self, event):
+        # Detenemos el hilo de evaluación antes de cerrar
+        self.modelo.cerrar()
+        super().closeEvent(event)
 
 if __name__ == "__main__":
     app = QApplication(sys.argv)
+    asset_cache.preload()
     ventana = MainWindow()
     ventana.show()
     sys.exit(app.exec())
\ No newline at end of file
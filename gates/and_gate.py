@@ -4,5 +4,10 @@ from gates.base import Compuerta
 class AND(Compuerta):
     """Compuerta AND: retorna 1 si ambas entradas son 1."""
     
+    controlling_value = 0
+    
     def operar(self, A, B=None):
         return int(A and B)
+
+    def operar_batch(self, A, B=None, mask=None):
+        return A & B
@@ -3,6 +3,9 @@ from abc import ABC, abstractmethod
 
 class Compuerta(ABC):
     """Clase abstracta que define la interfaz para todas las compuertas lógicas."""
+
+    # Valor de entrada que por sí solo determina la salida (None si no existe)
+    controlling_value = None
     
     def __init__(self):
         self.flip_flop = False
@@ -17,3 +20,31 @@ class Compuerta(ABC):
             B: Segunda entrada (opcional para NOT)
         """
         pass
+
+    def operar_batch(self, A, B=None, mask=None):
+        """
+        Versión vectorizada de operar: aplica la compuerta a muchos valores a la vez.
+
+        Acepta enteros de Python empaquetados (el bit k es el valor k) o arreglos NumPy.
+        Los arreglos bool se operan elemento a elemento; los arreglos uint8/uint64 se
+        interpretan como palabras empaquetadas (para arreglos de 0/1 en uint8 use mask=1).
+
+        Args:
+            A: Primera entrada (entero empaquetado o arreglo)
+            B: Segunda entrada (mismo tipo que A)
+            mask: Bits válidos; obligatorio para negar enteros de Python
+        Raises:
+            ValueError: Si la compuerta no tiene versión vectorizada
+        """
+        raise ValueError(
+            f"La compuerta {self.__class__.__name__} no tiene versión vectorizada"
+        )
+
+    @staticmethod
+    def _negar(x, mask=None):
+        """Niega x respetando mask (necesaria para enteros de Python, que no tienen ancho fijo)."""
+        if mask is not None:
+            return x ^ mask
+        if isinstance(x, int):
+            raise ValueError("Se requiere mask para negar enteros empaquetados")
+        return ~x
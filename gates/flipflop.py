@@ -1,4 +1,32 @@
 from gates.base import Compuerta
+from typing import Tuple
+
+
+def sr_scan(set_col: int, reset_col: int, state: int, count: int) -> Tuple[int, int]:
+    """
+    Calcula la secuencia de salidas de un Flip-Flop SR a lo largo de count ciclos,
+    con la misma tabla de FlipFlop.operar (S=1 y R=1 se trata como Set).
+
+    Args:
+        set_col: Columna empaquetada de S (bit t = ciclo t)
+        reset_col: Columna empaquetada de R
+        state: Estado antes del ciclo 0
+        count: Cantidad de ciclos
+    Returns:
+        Tupla (columna de Q, estado después del último ciclo)
+    """
+    if count == 0:
+        return 0, state
+    mask = (1 << count) - 1
+    full = (mask << 1) | 1
+    # El estado inicial se modela como un evento virtual en el bit 0 (todo se corre un bit)
+    seeds = ((set_col & mask) << 1) | (1 if state else 0)
+    resets = ((reset_col & ~set_col & mask) << 1) | (0 if state else 1)
+    keep = full & ~resets
+    # Dentro de cada tramo sin resets, la suma propaga un acarreo desde el primer Set hasta el final
+    # del tramo: los bits que se apagan son justamente los que quedan en 1 a partir de ese Set
+    q = ((keep & ~(keep + seeds)) | seeds) >> 1
+    return q, (q >> (count - 1)) & 1
 
 
 class FlipFlop(Compuerta):
@@ -36,3 +64,36 @@ class FlipFlop(Compuerta):
             self.value = 1
         
         return self.value, int(not self.value)
+
+    def operar_batch(self, A, B=None, mask=None):
+        """
+        Opera el FlipFlop sobre una serie temporal de pares (S, R) sin un ciclo de Python
+        por muestra. El estado se arrastra de una muestra a la siguiente y al final
+        queda en self.value.
+
+        Args:
+            A: Serie de Set; entero empaquetado (bit t = muestra t) o arreglo NumPy de 0/1
+            B: Serie de Reset, del mismo tipo que A (None = sin Reset)
+            mask: Para enteros empaquetados, un 1 por muestra (define la cantidad de muestras)
+        Raises:
+            ValueError: Si A es un entero y no se indica mask
+        Returns:
+            Tupla (serie de Q, serie de Q negado) del mismo tipo que la entrada
+        """
+        if isinstance(A, int):
+            if mask is None:
+                raise ValueError("Se requiere mask para series empaquetadas en enteros")
+            q, self.value = sr_scan(A, B or 0, self.value, mask.bit_length())
+            return q, q ^ mask
+
+        import numpy as np
+
+        s = np.asarray(A, dtype=bool)
+        r = np.zeros_like(s) if B is None else np.asarray(B, dtype=bool)
+        # Q en cada muestra es el valor de S en el último evento (S o R activo) hasta esa muestra
+        events = np.where(s | r, np.arange(s.size), -1)
+        last = np.maximum.accumulate(events) if s.size else events
+        q = np.where(last >= 0, s[np.maximum(last, 0)], bool(self.value))
+        if q.size:
+            self.value = int(q[-1])
+        return q.astype(np.uint8), (~q).astype(np.uint8)
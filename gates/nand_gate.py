@@ -4,5 +4,10 @@ from gates.base import Compuerta
 class NAND(Compuerta):
     """Compuerta NAND: retorna la negación de AND."""
     
+    controlling_value = 0
+    
     def operar(self, A, B=None):
         return int(not (A and B))
+
+    def operar_batch(self, A, B=None, mask=None):
+        return self._negar(A & B, mask)
@@ -4,5 +4,10 @@ from gates.base import Compuerta
 class NOR(Compuerta):
     """Compuerta NOR: retorna la negación de OR."""
     
+    controlling_value = 1
+    
     def operar(self, A, B=None):
         return int(not (A or B))
+
+    def operar_batch(self, A, B=None, mask=None):
+        return self._negar(A | B, mask)
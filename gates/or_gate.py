@@ -4,5 +4,10 @@ from gates.base import Compuerta
 class OR(Compuerta):
     """Compuerta OR: retorna 1 si al menos una entrada es 1."""
     
+    controlling_value = 1
+    
     def operar(self, A, B=None):
         return int(A or B)
+
+    def operar_batch(self, A, B=None, mask=None):
+        return A | B
@@ -6,3 +6,6 @@ class XOR(Compuerta):
     
     def operar(self, A, B=None):
         return int(A ^ B)
+
+    def operar_batch(self, A, B=None, mask=None):
+        return A ^ B
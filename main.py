@@ -1,16 +1,32 @@
 """
 Este módulo implementa una consola interactiva que permite construir y evaluar
 un circuito lógico representado como un árbol binario perfecto. El usuario puede
-definir la cantidad de niveles (hasta 6), seleccionar el tipo de compuerta por
-nivel, asignar valores a las entradas (hojas), agregar opcionalmente un Flip-Flop
+definir la cantidad de niveles (hasta MAX_CONSOLE_LEVELS), seleccionar el tipo de compuerta por
+nivel, asignar valores a las entradas (hojas), agregar opcionalmente Flip-Flops
 SR en cualquier nodo (ya sea en su entrada o salida), evaluar el circuito y
 visualizar tanto su estructura como el resultado final. Para integrarlo en una
 interfaz gráfica, bastaría con reemplazar las entradas por consola por elementos
 visuales como formularios, listas desplegables y botones, reutilizando directamente
 la lógica de construcción (TreeBuilder), evaluación (evaluate_with_flipflop) y
 representación estructural del árbol.
+
+Además ofrece un modo no interactivo (subcomandos de argparse) para usarlo en scripts:
+    python main.py                                   consola interactiva
+    python main.py eval --levels 2 --gates AND OR < vectores.txt
+    python main.py eval --circuit circuito.bin --ff L:input --format binary -o salida.bin
+    python main.py table --levels 2 --gates XOR --format csv
+'eval' lee un vector por línea ("0101" o "0 1 0 1") desde un archivo o la entrada estándar
+y escribe una salida por línea (o un bitmap empaquetado). Las líneas se procesan por
+bloques con E/S en buffer y evaluación bit-paralela; al final informa vectores/segundo.
+Con AC_PROFILE=1 (o AC_PROFILE=archivo) la ejecución se perfila con cProfile, y con
+AC_INSTRUMENT=1 se imprime el reporte de tree.instrumentation en stderr.
 """
 
+import argparse
+import itertools
+import sys
+import time
+
 # Importa las compuertas disponibles y el FlipFlop desde el módulo de compuertas
 from gates import AND, OR, NAND, NOR, XOR, FlipFlop
 
@@ -20,6 +36,23 @@ from tree.node import Nodo
 # Importa el constructor del árbol lógico
 from tree.builder import TreeBuilder
 
+# Importa la evaluación iterativa por niveles (con flip-flops) y la reevaluación incremental
+from tree.evaluation import plan_for
+from tree.incremental import IncrementalEvaluator
+
+# Búsqueda de entradas que producen un valor deseado (problema inverso)
+from tree.solver import solve
+
+# Evaluación por lotes (sin flip-flops), simulación por ciclos (con flip-flops),
+# tabla de verdad y carga de circuitos guardados para el modo no interactivo
+from tree.batch import BatchEvaluator
+from tree.sequential import SequentialSimulator
+from tree.serialization import load, load_json
+from tree.truth_table import write_bitmap, write_csv
+
+# Perfilado e instrumentación opcionales (variables de entorno AC_PROFILE y AC_INSTRUMENT)
+from tree.instrumentation import from_env as instrumentation_from_env
+
 
 # Diccionario que asocia el nombre textual de cada compuerta con su clase correspondiente
 # Permite seleccionar dinámicamente el tipo de compuerta en cada nivel
@@ -32,6 +65,11 @@ GATE_MAP = {
 }
 
 
+# Máximo de niveles que la consola permite construir e imprimir. Es solo una política de
+# visualización: TreeBuilder.compile() admite árboles mucho más grandes.
+MAX_CONSOLE_LEVELS = 6
+
+
 # Imprime una línea separadora en consola, opcionalmente con un título centrado
 # Se utiliza para organizar visualmente las secciones del programa
 def print_separator(title: str = ""):
@@ -51,25 +89,28 @@ def color_bit(b: int) -> str:
     return f"\x1b[31m0\x1b[0m"
 
 
-# Imprime recursivamente el árbol lógico mostrando cada nodo y su resultado
+# Imprime el árbol lógico mostrando cada nodo y su resultado, en preorden (izquierda primero)
 # Las hojas muestran su valor, y los nodos internos muestran la compuerta y su salida
+# Usa una pila explícita en lugar de recursión, así funciona con árboles de cualquier profundidad
 def print_tree(node: Nodo, prefix: str = ""):
-    if node is None:
-        return
+    stack = [(node, prefix)]
+    while stack:
+        node, prefix = stack.pop()
+        if node is None:
+            continue
 
-    if node.is_leaf():
-        val = node.value if node.result is None else node.result
-        print(f"{prefix} Hoja (val={color_bit(int(val))})")
-    else:
-        gate_name = node.gate.__class__.__name__
-        res = node.result if node.result is not None else "?"
-        res_str = color_bit(int(res)) if isinstance(res, int) else res
-        print(f"{prefix} {gate_name} -> {res_str}")
+        if node.is_leaf():
+            val = node.value if node.result is None else node.result
+            print(f"{prefix} Hoja (val={color_bit(int(val))})")
+        else:
+            gate_name = node.gate.__class__.__name__
+            res = node.result if node.result is not None else "?"
+            res_str = color_bit(int(res)) if isinstance(res, int) else res
+            print(f"{prefix} {gate_name} -> {res_str}")
 
-    if node.left is not None:
-        print_tree(node.left, prefix + "  ├─ ")
-    if node.right is not None:
-        print_tree(node.right, prefix + "  └─ ")
+        # El derecho se apila primero para que el izquierdo se imprima antes
+        stack.append((node.right, prefix + "  └─ "))
+        stack.append((node.left, prefix + "  ├─ "))
 
 
 # Permite obtener un nodo específico del árbol usando una ruta basada en L (left) y R (right)
@@ -88,47 +129,17 @@ def get_node_by_path(root: Nodo, path: str) -> Nodo:
     return node
 
 
-# Evalúa recursivamente el árbol lógico considerando la posible inserción
-# de un único Flip-Flop SR en cualquier nodo (entrada o salida)
-# ff_map almacena la ubicación del flip-flop y si está en 'input' o 'output'
+# Evalúa el árbol lógico considerando Flip-Flops SR en cualquier nodo (entrada o salida)
+# ff_map almacena la ubicación de cada flip-flop y si está en 'input' o 'output'
+# node puede ser un subárbol: path es su ruta desde la raíz, y solo se aplican los
+# flip-flops de ff_map que quedan dentro de él
+# La evaluación es iterativa por niveles (tree.evaluation.evaluate_levels): no usa recursión
+# y ubica los flip-flops por (nivel, índice) en lugar de construir rutas para cada nodo
+# Los niveles, las tablas de verdad y las posiciones de los flip-flops se guardan en un
+# LevelPlan asociado al nodo, así las llamadas repetidas (la consola, los benchmarks) no
+# vuelven a recorrer el árbol ni a interpretar las rutas del ff_map
 def evaluate_with_flipflop(node: Nodo, ff_map: dict, path: str = ""):
-    if node.is_leaf():
-        val = int(node.value)
-
-        # Si existe un flip-flop en la entrada de esta hoja, se procesa antes de devolver el valor
-        if path in ff_map and ff_map[path][1] == 'input':
-            ff = ff_map[path][0]
-            out = ff.operar(val, 0)
-            val = out[0] if isinstance(out, tuple) else int(out)
-
-        node.result = val
-        return val
-
-    # Evaluación recursiva de los subárboles izquierdo y derecho
-    left_val = evaluate_with_flipflop(node.left, ff_map, path + 'L')
-    right_val = evaluate_with_flipflop(node.right, ff_map, path + 'R')
-
-    # Si hay un flip-flop en la entrada del nodo actual, procesa antes de la compuerta
-    if path in ff_map and ff_map[path][1] == 'input':
-        ff = ff_map[path][0]
-        out = ff.operar(left_val, right_val)
-        if isinstance(out, tuple):
-            left_val = right_val = out[0]
-        else:
-            left_val = right_val = int(out)
-
-    # Se ejecuta la compuerta lógica asociada al nodo
-    gate_out = node.gate.operar(int(left_val), int(right_val))
-
-    # Si hay un flip-flop en la salida del nodo, se procesa después de la compuerta
-    if path in ff_map and ff_map[path][1] == 'output':
-        ff = ff_map[path][0]
-        out = ff.operar(int(gate_out), 0)
-        gate_out = out[0] if isinstance(out, tuple) else int(out)
-
-    # Se almacena el resultado final en el nodo
-    node.result = int(gate_out) if not isinstance(gate_out, tuple) else int(gate_out[0])
-    return node.result
+    return plan_for(node).evaluate(ff_map, path)
 
 
 # Función principal que controla toda la interacción por consola
@@ -137,11 +148,11 @@ def evaluate_with_flipflop(node: Nodo, ff_map: dict, path: str = ""):
 def interactive_console():
     print_separator("CIRCUITO LÓGICO - MODO CONSOLA")
 
-    # Solicita al usuario la cantidad de niveles del árbol (máximo 6)
+    # Solicita al usuario la cantidad de niveles del árbol (máximo MAX_CONSOLE_LEVELS)
     while True:
         try:
-            num_levels = int(input("Ingrese cantidad de niveles de compuertas (1-6): ").strip())
-            if 1 <= num_levels <= 6:
+            num_levels = int(input(f"Ingrese cantidad de niveles de compuertas (1-{MAX_CONSOLE_LEVELS}): ").strip())
+            if 1 <= num_levels <= MAX_CONSOLE_LEVELS:
                 break
         except Exception:
             pass
@@ -198,11 +209,10 @@ def interactive_console():
     for i, v in enumerate(vals):
         print(f"  Entrada {i}: {v}")
 
-    # Permite agregar opcionalmente un único Flip-Flop SR
+    # Permite agregar opcionalmente Flip-Flops SR (cualquier cantidad, uno por nodo)
     ff_map = {}
-    add_ff = input("Desea agregar un FlipFlop SR en alguna entrada/salida? (s/N): ").strip().lower() == 's'
-
-    if add_ff:
+    question = "Desea agregar un FlipFlop SR en alguna entrada/salida? (s/N): "
+    while input(question).strip().lower() == 's':
         print("Indique la posición del nodo donde colocar el FlipFlop.")
         print("Use ruta desde la raíz con L/R (ej: ''=raiz, L=izq, RL=der-izq).")
 
@@ -217,19 +227,25 @@ def interactive_console():
         if target is None:
             print("Ruta inválida. No se agregó FlipFlop.")
         else:
+            if path in ff_map:
+                print(f"Se reemplaza el FlipFlop que había en la ruta '{path}'.")
             ff = FlipFlop()
             ff_map[path] = (ff, 'input' if pos=='INPUT' else 'output')
             print(f"FlipFlop agregado en ruta '{path}' como {pos}.")
+        question = "Desea agregar otro FlipFlop SR? (s/N): "
 
     # Evalúa el circuito completo y muestra el resultado
-    evaluate_with_flipflop(root, ff_map, path='')
+    # El evaluador incremental conserva los resultados para reevaluar solo lo que cambie
+    evaluator = IncrementalEvaluator(builder, ff_map)
+    evaluator.evaluate()
+    pending = set()
     print_separator("Resultado del circuito")
     print_tree(root)
     print(f"\nResultado final (raíz): {root.result}")
 
     # Bucle interactivo para modificar entradas y reevaluar el circuito
     while True:
-        cmd = input("\nComandos: [c]ambiar entradas, [r]e-evaluar, [p]rint árbol, [q] salir: ").strip().lower()
+        cmd = input("\nComandos: [c]ambiar entradas, [b]uscar entradas, [r]e-evaluar, [p]rint árbol, [q] salir: ").strip().lower()
 
         if cmd == 'q':
             break
@@ -245,22 +261,227 @@ def interactive_console():
                 print("Entrada inválida")
                 continue
             for i, p in enumerate(parts):
-                leaves[i].value = int(p)
+                if leaves[i].value != int(p):
+                    leaves[i].value = int(p)
+                    pending.add(i)
             print("Entradas actualizadas")
             continue
 
+        if cmd == 'b':
+            # Busca entradas que produzcan el valor deseado en la raíz o en otro nodo,
+            # con el estado actual de los flip-flops
+            path = input("Ruta del nodo objetivo (vacío = raíz): ").strip().upper()
+            target = input("Valor deseado (0/1): ").strip()
+            if target not in ('0', '1') or any(ch not in 'LR' for ch in path) or len(path) > num_levels:
+                print("Entrada inválida")
+                continue
+            solution = solve(builder, int(target), path, ff_map=ff_map)
+            if solution is None:
+                print("Ninguna combinación de entradas produce ese valor")
+                continue
+            for i, v in enumerate(solution):
+                if leaves[i].value != v:
+                    leaves[i].value = v
+                    pending.add(i)
+            print(f"Entradas encontradas: {' '.join(map(str, solution))} (use [r] para re-evaluar)")
+            continue
+
         if cmd == 'r':
-            evaluate_with_flipflop(root, ff_map, path='')
+            # Solo se recalculan los caminos desde las hojas modificadas hasta la raíz
+            flipped = evaluator.update(pending)
+            pending.clear()
             print_tree(root)
             print(f"Resultado final (raíz): {root.result}")
+            print(f"Nodos que cambiaron: {len(flipped)}")
             continue
 
         print("Comando no reconocido")
 
 
+# Convierte una especificación "ruta:posición[:estado]" de --ff en la entrada del ff_map
+# La ruta vacía es la raíz (por ejemplo ":output"); el estado inicial por defecto es 0
+def parse_ff_spec(spec: str):
+    parts = spec.split(':')
+    if len(parts) not in (2, 3):
+        raise argparse.ArgumentTypeError(f"FlipFlop inválido {spec!r}: use ruta:input|output[:estado]")
+    path, position = parts[0].strip().upper(), parts[1].strip().lower()
+    if position not in ('input', 'output') or any(ch not in 'LR' for ch in path):
+        raise argparse.ArgumentTypeError(f"FlipFlop inválido {spec!r}: use ruta:input|output[:estado]")
+    ff = FlipFlop()
+    if len(parts) == 3:
+        if parts[2] not in ('0', '1'):
+            raise argparse.ArgumentTypeError(f"Estado inválido en {spec!r}: use 0 o 1")
+        ff.value = int(parts[2])
+    return path, (ff, position)
+
+
+# Construye el parser de argumentos con los subcomandos interactive, eval y table
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Circuito lógico en árbol binario perfecto")
+    subparsers = parser.add_subparsers(dest='command')
+    subparsers.add_parser('interactive', help="Consola interactiva (por defecto)")
+
+    # Opciones comunes para describir el circuito
+    circuit = argparse.ArgumentParser(add_help=False)
+    circuit.add_argument('--levels', type=int, help="Cantidad de niveles de compuertas")
+    circuit.add_argument('--gates', nargs='+', type=str.upper, choices=list(GATE_MAP), metavar='GATE',
+                         help=f"Compuerta por nivel desde la raíz ({', '.join(GATE_MAP)}); "
+                              "una sola se repite en todos los niveles")
+    circuit.add_argument('--circuit', help="Circuito guardado (.json o binario, ver tree.serialization)")
+    circuit.add_argument('--ff', action='append', type=parse_ff_spec, default=[], metavar='RUTA:POS[:ESTADO]',
+                         help="FlipFlop SR en la ruta L/R indicada, en su entrada o salida (repetible)")
+    circuit.add_argument('-o', '--output', help="Archivo de salida (por defecto, la salida estándar)")
+
+    eval_parser = subparsers.add_parser('eval', parents=[circuit], help="Evalúa vectores de entrada")
+    eval_parser.add_argument('-i', '--input', help="Archivo de vectores (por defecto, la entrada estándar)")
+    eval_parser.add_argument('--format', choices=('text', 'binary'), default='text',
+                             help="text: una salida por línea; binary: bitmap empaquetado little-endian")
+    eval_parser.add_argument('--chunk', type=int, default=4096, help="Vectores por bloque")
+
+    table_parser = subparsers.add_parser('table', parents=[circuit], help="Genera la tabla de verdad")
+    table_parser.add_argument('--format', choices=('csv', 'bitmap'), default='csv')
+    table_parser.add_argument('--order', choices=('binary', 'gray'), default='binary')
+    return parser
+
+
+# Arma (builder, ff_map) a partir de --circuit o de --levels/--gates, más los --ff indicados
+def load_circuit(args, parser: argparse.ArgumentParser):
+    ff_map = {}
+    if args.circuit:
+        if args.levels or args.gates:
+            parser.error("--circuit no se puede combinar con --levels/--gates")
+        loader = load_json if args.circuit.lower().endswith('.json') else load
+        builder, _, ff_map = loader(args.circuit)
+    else:
+        if not args.gates:
+            parser.error("Indique --gates (y opcionalmente --levels) o --circuit")
+        levels = args.levels or len(args.gates)
+        gates = args.gates * levels if len(args.gates) == 1 else args.gates
+        if levels < 1 or len(gates) != levels:
+            parser.error(f"Se esperan {levels} compuertas en --gates, se recibieron {len(args.gates)}")
+        builder = TreeBuilder(num_levels=levels, gate_types=[GATE_MAP[g] for g in gates])
+    ff_map.update(dict(args.ff))
+    for path in ff_map:
+        if len(path) > builder.num_levels:
+            parser.error(f"La ruta de FlipFlop {path!r} está fuera del árbol")
+    return builder, ff_map
+
+
+# Lee los vectores por bloques: cada bloque es (bytes con los vectores concatenados, cantidad)
+# Se aceptan líneas como "0101" o "0 1 0 1"; las líneas vacías se ignoran
+# Todos los bloques salvo el último tienen exactamente chunk vectores: las filas que sobran
+# (por líneas vacías descartadas) pasan al bloque siguiente, así la salida binaria de cada
+# bloque intermedio queda en bytes completos
+def read_vector_chunks(stream, num_inputs: int, chunk: int):
+    line_number = 0
+    rows = []
+    while True:
+        lines = list(itertools.islice(stream, chunk))
+        for line in lines:
+            line_number += 1
+            row = line.translate(None, b' \t,\r\n')
+            if not row:
+                continue
+            if len(row) != num_inputs or row.translate(None, b'01'):
+                text = line.decode('ascii', 'replace').strip()
+                raise ValueError(
+                    f"Línea {line_number}: se esperan {num_inputs} valores 0/1, se recibió {text!r}"
+                )
+            rows.append(row)
+        while len(rows) >= chunk:
+            yield b''.join(rows[:chunk]), chunk
+            del rows[:chunk]
+        if not lines:
+            if rows:
+                yield b''.join(rows), len(rows)
+            return
+
+
+# Empaqueta un bloque de vectores en columnas (el bit k de la columna i es la hoja i del vector k)
+# El slice con paso num_inputs toma la columna completa sin recorrer los vectores en Python
+def pack_block(block: bytes, num_inputs: int):
+    return [int(block[i::num_inputs][::-1], 2) for i in range(num_inputs)]
+
+
+# Convierte la columna de salida de un bloque en bytes de texto ("0\n1\n...") o binarios
+def format_outputs(outputs: int, count: int, binary: bool) -> bytes:
+    if binary:
+        return outputs.to_bytes((count + 7) // 8, 'little')
+    text = bytearray(2 * count)
+    text[0::2] = format(outputs, f'0{count}b')[::-1].encode('ascii')
+    text[1::2] = b'\n' * count
+    return bytes(text)
+
+
+# Subcomando eval: evalúa un flujo de vectores y escribe una salida por vector
+# Sin flip-flops usa el evaluador por lotes; con flip-flops simula ciclo a ciclo
+# (cada vector es un ciclo de reloj y el estado se conserva entre bloques)
+def run_eval(args, parser: argparse.ArgumentParser) -> int:
+    builder, ff_map = load_circuit(args, parser)
+    num_inputs = 2 ** builder.num_levels
+    # Bloques múltiplos de 8 para que la salida binaria quede en bytes completos
+    chunk = max(8, args.chunk - args.chunk % 8)
+    if ff_map:
+        simulator = SequentialSimulator(builder, ff_map)
+        step = lambda columns, count: simulator.step_columns(columns, count)[0]
+    else:
+        evaluator = BatchEvaluator(builder)
+        step = lambda columns, count: evaluator.evaluate(columns, count).output
+
+    source = open(args.input, 'rb') if args.input else sys.stdin.buffer
+    dest = open(args.output, 'wb') if args.output else sys.stdout.buffer
+    total = 0
+    start = time.perf_counter()
+    try:
+        for block, count in read_vector_chunks(source, num_inputs, chunk):
+            outputs = step(pack_block(block, num_inputs), count)
+            dest.write(format_outputs(outputs, count, args.format == 'binary'))
+            total += count
+        dest.flush()
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    finally:
+        if args.input:
+            source.close()
+        if args.output:
+            dest.close()
+
+    elapsed = time.perf_counter() - start
+    rate = total / elapsed if elapsed > 0 else 0.0
+    print(f"{total} vectores en {elapsed:.3f} s ({rate:,.0f} vectores/s)", file=sys.stderr)
+    return 0
+
+
+# Subcomando table: escribe la tabla de verdad completa como CSV o como bitmap
+def run_table(args, parser: argparse.ArgumentParser) -> int:
+    builder, ff_map = load_circuit(args, parser)
+    if ff_map:
+        parser.error("La tabla de verdad no admite FlipFlops (use eval para simularlos)")
+    if args.format == 'bitmap':
+        write_bitmap(builder, args.output or sys.stdout.buffer)
+    else:
+        write_csv(builder, args.output or sys.stdout, args.order)
+    return 0
+
+
+# Punto de entrada de la línea de comandos; sin subcomando abre la consola interactiva
+# Con AC_PROFILE / AC_INSTRUMENT definidas se perfila o instrumenta toda la ejecución
+def main(argv=None) -> int:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    with instrumentation_from_env():
+        if args.command == 'eval':
+            return run_eval(args, parser)
+        if args.command == 'table':
+            return run_table(args, parser)
+        try:
+            interactive_console()
+        except KeyboardInterrupt:
+            print("\nSaliendo...")
+        return 0
+
+
 # Punto de entrada del programa cuando se ejecuta directamente el archivo
 if __name__ == '__main__':
-    try:
-        interactive_console()
-    except KeyboardInterrupt:
-        print("\nSaliendo...")
\ No newline at end of file
+    sys.exit(main())
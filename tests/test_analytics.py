@@ -0,0 +1,98 @@
+import itertools
+import random
+import time
+from fractions import Fraction
+
+import pytest
+
+from gates import AND, OR, NAND, NOR, XOR, FlipFlop
+from main import evaluate_with_flipflop, get_node_by_path
+from tree import TreeBuilder
+from tree.analytics import signal_statistics
+from tree.netlist import heap_to_path
+
+
+GATES = [AND, OR, NAND, NOR, XOR]
+
+
+def _node_outputs(builder, leaves, ff_map):
+    # Salida de cada nodo (por ruta) evaluando con el estado original de los flip-flops
+    root = builder.build()
+    for leaf, value in zip(builder.get_leaves(), leaves):
+        leaf.value = value
+    states = {p: ff.value for p, (ff, _) in ff_map.items()}
+    outputs = {}
+    for heap in range(1, 2 ** (builder.num_levels + 1)):
+        path = heap_to_path(heap)
+        for p, (ff, _) in ff_map.items():
+            ff.value = states[p]
+        relevant = {p[len(path):]: e for p, e in ff_map.items() if p.startswith(path)}
+        outputs[path] = evaluate_with_flipflop(get_node_by_path(root, path), relevant)
+    for p, (ff, _) in ff_map.items():
+        ff.value = states[p]
+    return outputs
+
+
+def test_counts_and_probabilities_match_exhaustive_sweep():
+    rng = random.Random(0)
+    for _ in range(40):
+        num_levels = rng.randint(1, 3)
+        builder = TreeBuilder(num_levels, [rng.choice(GATES) for _ in range(num_levels)])
+        ff_map = {}
+        for _ in range(rng.randint(0, 2)):
+            ff = FlipFlop()
+            ff.value = rng.randint(0, 1)
+            path = ''.join(rng.choice('LR') for _ in range(rng.randint(0, num_levels)))
+            ff_map[path] = (ff, rng.choice(['input', 'output']))
+        num_inputs = 2 ** num_levels
+        biases = {i: Fraction(rng.randint(0, 4), 4) for i in range(num_inputs)}
+
+        uniform = signal_statistics(builder, ff_map=ff_map)
+        biased = signal_statistics(builder, biases, ff_map)
+        counts = {}
+        weighted = {}
+        for leaves in itertools.product((0, 1), repeat=num_inputs):
+            weight = Fraction(1)
+            for i, v in enumerate(leaves):
+                weight *= biases[i] if v else 1 - biases[i]
+            for path, out in _node_outputs(builder, leaves, ff_map).items():
+                counts[path] = counts.get(path, 0) + out
+                weighted[path] = weighted.get(path, 0) + (weight if out else 0)
+        for path in counts:
+            assert uniform.count(path) == counts[path]
+            assert uniform.probability(path) == Fraction(counts[path], 2 ** num_inputs)
+            assert biased.probability(path) == weighted[path]
+
+
+def test_activity_and_annotations():
+    stats = signal_statistics(TreeBuilder(2, [AND, AND]))
+    assert stats.probability() == Fraction(1, 16)
+    assert stats.activity() == 2 * Fraction(1, 16) * Fraction(15, 16)
+    assert stats.activity('L') == Fraction(3, 8)
+    assert stats.total_activity() == stats.activity() + 2 * stats.activity('L')
+    annotations = stats.by_heap()
+    assert set(annotations) == set(range(1, 8))
+    assert annotations[4] == (0.5, 0.5)
+    assert signal_statistics(TreeBuilder(1, [XOR]), {0: 1, 1: '0'}).probability() == 1
+
+
+def test_large_tree_is_linear():
+    builder = TreeBuilder(16, [NAND, XOR, NOR, OR] * 4)
+    start = time.perf_counter()
+    stats = signal_statistics(builder)
+    assert 0 < stats.count() < 2 ** 2 ** 16
+    assert time.perf_counter() - start < 5.0
+
+
+def test_invalid_inputs():
+    builder = TreeBuilder(1, [AND])
+    with pytest.raises(IndexError):
+        signal_statistics(builder, {2: 0.5})
+    with pytest.raises(ValueError):
+        signal_statistics(builder, {0: 1.5})
+    with pytest.raises(ValueError):
+        signal_statistics(builder, {0: 0.25}).count()
+    with pytest.raises(ValueError):
+        signal_statistics(builder).probability('LLL')
+    with pytest.raises(ValueError):
+        signal_statistics(TreeBuilder(1, [FlipFlop]))
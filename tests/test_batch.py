@@ -0,0 +1,60 @@
+import random
+
+import pytest
+
+from gates import AND, OR, NAND, NOR, XOR
+from tree import TreeBuilder, BatchEvaluator
+from tree.batch import pack_vectors, unpack_column
+
+
+GATES = [AND, OR, NAND, NOR, XOR]
+
+
+def _evaluar_uno_a_uno(builder, root, vectors):
+    leaves = builder.get_leaves()
+    outputs = []
+    for vector in vectors:
+        for leaf, v in zip(leaves, vector):
+            leaf.value = v
+        outputs.append(root.evaluate())
+    return outputs
+
+
+def test_pack_and_unpack_roundtrip():
+    vectors = [[1, 0, 1], [0, 0, 1], [1, 1, 0]]
+    columns = pack_vectors(vectors, 3)
+    assert columns == [0b101, 0b100, 0b011]
+    assert unpack_column(columns[0], 3) == [1, 0, 1]
+
+
+def test_batch_matches_nodo_evaluate_for_all_gate_mixes():
+    rng = random.Random(1234)
+    for num_levels in range(1, 5):
+        for _ in range(10):
+            gate_types = [rng.choice(GATES) for _ in range(num_levels)]
+            builder = TreeBuilder(num_levels=num_levels, gate_types=gate_types)
+            root = builder.build()
+            n = 2 ** num_levels
+            vectors = [[rng.randint(0, 1) for _ in range(n)] for _ in range(40)]
+
+            result = BatchEvaluator(builder).evaluate_vectors(vectors)
+            assert result.outputs() == _evaluar_uno_a_uno(builder, root, vectors)
+
+
+def test_batch_keeps_node_columns():
+    builder = TreeBuilder(num_levels=2, gate_types=[AND, OR])
+    root = builder.build()
+    vectors = [[1, 1, 0, 0], [0, 0, 0, 1]]
+    result = BatchEvaluator(builder).evaluate_vectors(vectors, keep_nodes=True)
+
+    # Nivel 2 (OR): vector 0 -> (1, 0), vector 1 -> (0, 1)
+    assert unpack_column(result.column(2, 0), 2) == [1, 0]
+    assert unpack_column(result.column(2, 1), 2) == [0, 1]
+    assert result.column(1, 0) == result.output
+    assert result.outputs() == [0, 0]
+
+
+def test_batch_rejects_wrong_column_count():
+    builder = TreeBuilder(num_levels=2, gate_types=[AND, OR])
+    with pytest.raises(ValueError):
+        BatchEvaluator(builder).evaluate([0, 0, 0], count=1)
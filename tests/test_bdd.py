@@ -0,0 +1,145 @@
+import itertools
+import random
+import time
+
+import pytest
+
+from gates import AND, OR, NAND, NOR, XOR, FlipFlop
+from main import evaluate_with_flipflop
+from tree import TreeBuilder
+from tree.bdd import BDD, FALSE, TRUE, compile_circuit
+
+
+GATES = [AND, OR, NAND, NOR, XOR]
+
+
+def _reference(builder, leaves):
+    root = builder.build()
+    for leaf, value in zip(builder.get_leaves(), leaves):
+        leaf.value = value
+    return root.evaluate()
+
+
+def test_manager_operations_are_canonical():
+    bdd = BDD(3)
+    a, b, c = bdd.var(0), bdd.var(1), bdd.var(2)
+    # De Morgan y distributividad producen exactamente el mismo nodo
+    assert bdd.not_(bdd.and_(a, b)) == bdd.or_(bdd.not_(a), bdd.not_(b))
+    assert bdd.and_(a, bdd.or_(b, c)) == bdd.or_(bdd.and_(a, b), bdd.and_(a, c))
+    assert bdd.xor(a, a) == FALSE and bdd.or_(a, bdd.not_(a)) == TRUE
+    f = bdd.or_(bdd.and_(a, b), c)
+    assert bdd.sat_count(f) == 5
+    assert bdd.support(bdd.and_(a, c)) == {0, 2}
+    assert bdd.restrict(f, {2: 0}) == bdd.and_(a, b)
+    assert bdd.evaluate(f, [1, 1, 0]) == 1 and bdd.evaluate(f, [1, 0, 0]) == 0
+    assert bdd.evaluate(f, bdd.pick(f) | {v: 0 for v in range(3) if v not in bdd.pick(f)}) == 1
+    assert bdd.pick(FALSE) is None
+    with pytest.raises(IndexError):
+        bdd.var(3)
+
+
+def test_cache_is_bounded():
+    bdd = BDD(16, cache_size=8)
+    f = FALSE
+    for i in range(16):
+        f = bdd.xor(f, bdd.var(i))
+    assert bdd.stats()["cache_size"] <= 8
+    assert bdd.sat_count(f) == 2 ** 15
+
+
+def test_bounded_cache_eviction_stays_fast():
+    # Con la caché llena cada entrada nueva desaloja la más antigua; desalojar no debe
+    # volverse más caro a medida que se acumulan
+    builder = TreeBuilder(12, [XOR, NAND, OR, AND, NOR, XOR, AND, OR, XOR, NAND, OR, AND])
+    timings = []
+    for cache_size in (1 << 30, 1 << 14):
+        manager = BDD(2 ** 12, cache_size=cache_size)
+        start = time.perf_counter()
+        circuit = compile_circuit(builder, manager=manager)
+        timings.append(time.perf_counter() - start)
+    assert manager.stats()["cache_size"] <= 1 << 14
+    assert manager.misses > 4 * (1 << 14)
+    assert timings[1] < 2 * timings[0] + 0.2
+    assert _reference(builder, circuit.pick(1)) == 1
+
+
+def test_compiled_circuit_matches_exhaustive_evaluation():
+    rng = random.Random(0)
+    for num_levels in range(1, 4):
+        for _ in range(10):
+            builder = TreeBuilder(num_levels, [rng.choice(GATES) for _ in range(num_levels)])
+            circuit = compile_circuit(builder)
+            ones = 0
+            depends = set()
+            for leaves in itertools.product((0, 1), repeat=2 ** num_levels):
+                out = _reference(builder, leaves)
+                assert circuit.evaluate(leaves) == out
+                ones += out
+                for i in range(len(leaves)):
+                    flipped = list(leaves)
+                    flipped[i] ^= 1
+                    if _reference(builder, flipped) != out:
+                        depends.add(i)
+            assert circuit.count(1) == ones
+            assert circuit.count(0) == 2 ** 2 ** num_levels - ones
+            assert circuit.is_satisfiable(1) == (ones > 0)
+            assert circuit.support() == (sorted(depends), [])
+            for value in (0, 1):
+                leaves = circuit.pick(value)
+                assert leaves is None or _reference(builder, leaves) == value
+
+
+def test_compiled_flipflops_match_evaluate_with_flipflop():
+    rng = random.Random(1)
+    for _ in range(40):
+        num_levels = rng.randint(1, 3)
+        builder = TreeBuilder(num_levels, [rng.choice(GATES) for _ in range(num_levels)])
+        root = builder.build()
+        ff_map = {}
+        for _ in range(rng.randint(1, 3)):
+            path = ''.join(rng.choice('LR') for _ in range(rng.randint(0, num_levels)))
+            ff = FlipFlop()
+            ff.value = rng.randint(0, 1)
+            ff_map[path] = (ff, rng.choice(['input', 'output']))
+        circuit = compile_circuit(builder, ff_map)
+        state = dict(circuit.state)
+        for _ in range(8):
+            leaves = [rng.randint(0, 1) for _ in range(2 ** num_levels)]
+            for leaf, value in zip(builder.get_leaves(), leaves):
+                leaf.value = value
+            out, state = circuit.step(leaves, state)
+            assert out == evaluate_with_flipflop(root, ff_map)
+            assert state == {path: ff_map[path][0].value for path in state}
+
+
+def test_count_with_shared_larger_manager():
+    # Las variables del administrador que el circuito no usa no se cuentan
+    circuit = compile_circuit(TreeBuilder(1, [AND]), manager=BDD(4))
+    assert circuit.count(1) == 1 and circuit.count(0) == 3
+    ff = FlipFlop()
+    circuit = compile_circuit(TreeBuilder(1, [OR]), {'L': (ff, 'input')}, manager=BDD(6))
+    assert circuit.count(1) == 3
+
+
+def test_large_tree_queries_are_fast():
+    builder = TreeBuilder(8, [XOR, NAND, OR, AND, NOR, XOR, AND, OR])
+    start = time.perf_counter()
+    circuit = compile_circuit(builder)
+    ones = circuit.count(1)
+    elapsed = time.perf_counter() - start
+    assert 0 < ones < 2 ** 256
+    assert circuit.size < 4 * 256
+    assert elapsed < 2.0
+    leaves = circuit.pick(1)
+    assert _reference(builder, leaves) == 1
+
+
+def test_invalid_inputs():
+    with pytest.raises(ValueError):
+        compile_circuit(TreeBuilder(1, [FlipFlop]))
+    with pytest.raises(ValueError):
+        compile_circuit(TreeBuilder(1, [AND]), {'LLL': (FlipFlop(), 'input')})
+    with pytest.raises(ValueError):
+        compile_circuit(TreeBuilder(2, [AND, AND]), manager=BDD(2))
+    with pytest.raises(ValueError):
+        compile_circuit(TreeBuilder(1, [AND])).evaluate([1])
@@ -0,0 +1,40 @@
+import json
+
+from benchmarks.run import compare_results, main, run_benchmarks, scenarios
+
+
+def test_scenarios_cover_levels_mixes_and_flipflop():
+    names = set(scenarios())
+    for level in range(1, 7):
+        assert f"build/L{level}" in names
+        assert f"evaluate/L{level}/MIX" in names
+        assert f"evaluate/L{level}/XOR/ff" in names
+        assert f"recursive/L{level}/ff" in names
+        assert f"levels/L{level}" in names
+        assert f"batch/L{level}" in names
+    assert "gate/NAND" in names
+    assert "sweep/L4" in names
+
+
+def test_run_benchmarks_produces_json_serializable_results():
+    result = run_benchmarks("evaluate/L2/AND", min_time=0.0, repeat=1)
+    assert set(result["results"]) == {"evaluate/L2/AND", "evaluate/L2/AND/ff"}
+    json.dumps(result)
+    assert all(r["ops_per_sec"] > 0 for r in result["results"].values())
+
+
+def test_compare_results_flags_regressions_over_threshold():
+    baseline = {"results": {"a": {"ops_per_sec": 100.0}, "b": {"ops_per_sec": 100.0}}}
+    current = {"results": {"a": {"ops_per_sec": 95.0}, "b": {"ops_per_sec": 80.0}, "c": {"ops_per_sec": 1.0}}}
+    regressions = compare_results(current, baseline, threshold=0.1)
+    assert [r["name"] for r in regressions] == ["b"]
+
+
+def test_main_returns_error_on_regression(tmp_path):
+    baseline = tmp_path / "base.json"
+    baseline.write_text(json.dumps({"results": {"gate/AND": {"ops_per_sec": 1e30}}}))
+    output = tmp_path / "out.json"
+    code = main(["--filter", "gate/AND", "--min-time", "0", "--repeat", "1",
+                 "--output", str(output), "--baseline", str(baseline)])
+    assert code == 1
+    assert "gate/AND" in json.loads(output.read_text())["results"]
@@ -0,0 +1,72 @@
+import random
+
+import pytest
+
+from gates import AND, OR, NAND, NOR, XOR, FlipFlop
+from main import evaluate_with_flipflop
+from tree import TreeBuilder
+from tree.cache import SubtreeCache
+
+
+GATES = [AND, OR, NAND, NOR, XOR]
+
+
+def test_cache_matches_evaluate_and_hits_on_repeated_halves():
+    builder = TreeBuilder(num_levels=3, gate_types=[XOR, NAND, OR])
+    root = builder.build()
+    leaves = builder.get_leaves()
+    cache = SubtreeCache()
+
+    # La mitad izquierda queda fija mientras la derecha cuenta
+    for pattern in range(16):
+        right = [int(c) for c in format(pattern, '04b')]
+        for leaf, v in zip(leaves, [1, 0, 1, 1] + right):
+            leaf.value = v
+        expected = root.evaluate()
+        assert cache.evaluate(builder) == expected
+
+    # El subárbol izquierdo (nivel 2, posición 0) solo falla la primera vez
+    assert cache.hits >= 15
+    assert cache.stats()["size"] == len(cache)
+
+
+def test_cache_random_sweep_matches_reference():
+    rng = random.Random(9)
+    gate_types = [rng.choice(GATES) for _ in range(4)]
+    builder = TreeBuilder(num_levels=4, gate_types=gate_types)
+    root = builder.build()
+    cache = SubtreeCache(maxsize=8)
+    for _ in range(200):
+        for leaf in builder.get_leaves():
+            leaf.value = rng.randint(0, 1)
+        assert cache.evaluate(builder) == root.evaluate()
+    assert len(cache) <= 8
+    assert cache.evictions > 0
+
+
+def test_cache_refuses_stateful_subtrees():
+    gate_types = [AND, OR, XOR]
+    builder = TreeBuilder(num_levels=3, gate_types=gate_types)
+    root = builder.build()
+    reference = TreeBuilder(num_levels=3, gate_types=gate_types)
+    ref_root = reference.build()
+
+    ff_map = {'LR': (FlipFlop(), 'input')}
+    ref_map = {'LR': (FlipFlop(), 'input')}
+    cache = SubtreeCache()
+    rng = random.Random(2)
+    for _ in range(30):
+        values = [rng.randint(0, 1) for _ in range(8)]
+        for leaf, ref_leaf, v in zip(builder.get_leaves(), reference.get_leaves(), values):
+            leaf.value = ref_leaf.value = v
+        assert cache.evaluate(builder, ff_map) == evaluate_with_flipflop(ref_root, ref_map)
+
+    # Ni el nodo del flip-flop ni sus ancestros se guardan
+    stored = {(level, index) for level, index, _ in cache._entries}
+    assert (3, 1) not in stored and (2, 0) not in stored and (1, 0) not in stored
+    assert (2, 1) in stored
+
+
+def test_cache_rejects_invalid_size():
+    with pytest.raises(ValueError):
+        SubtreeCache(maxsize=0)
@@ -0,0 +1,104 @@
+import random
+
+import pytest
+
+from gates import AND, OR, XOR, FlipFlop
+from main import main, parse_ff_spec
+from tree import TreeBuilder
+from tree.batch import BatchEvaluator
+from tree.sequential import SequentialSimulator
+from tree.serialization import save
+
+
+def _write_vectors(path, vectors, sep=''):
+    path.write_text(''.join(sep.join(str(v) for v in vector) + '\n' for vector in vectors))
+
+
+def _random_vectors(seed, num_inputs, count):
+    rng = random.Random(seed)
+    return [[rng.randint(0, 1) for _ in range(num_inputs)] for _ in range(count)]
+
+
+def test_parse_ff_spec():
+    path, (ff, position) = parse_ff_spec('rl:OUTPUT:1')
+    assert (path, position, ff.value) == ('RL', 'output', 1)
+    path, (ff, position) = parse_ff_spec(':input')
+    assert (path, position, ff.value) == ('', 'input', 0)
+
+
+def test_eval_text_output_matches_batch_evaluator(tmp_path, capsys):
+    vectors = _random_vectors(0, 8, 1000)
+    _write_vectors(tmp_path / "in.txt", vectors, sep=' ')
+    code = main(['eval', '--levels', '3', '--gates', 'AND', 'OR', 'XOR', '--chunk', '100',
+                 '-i', str(tmp_path / "in.txt"), '-o', str(tmp_path / "out.txt")])
+    assert code == 0
+    expected = BatchEvaluator(TreeBuilder(3, [AND, OR, XOR])).evaluate_vectors(vectors).outputs()
+    assert [int(line) for line in (tmp_path / "out.txt").read_text().split()] == expected
+    # El resumen de rendimiento va a stderr
+    assert "1000 vectores" in capsys.readouterr().err
+
+
+def test_eval_binary_output_with_flipflops_matches_simulator(tmp_path):
+    vectors = _random_vectors(1, 4, 203)
+    _write_vectors(tmp_path / "in.txt", vectors)
+    code = main(['eval', '--gates', 'XOR', '--levels', '2', '--ff', 'L:input:1', '--ff', ':output',
+                 '--format', 'binary', '--chunk', '64',
+                 '-i', str(tmp_path / "in.txt"), '-o', str(tmp_path / "out.bin")])
+    assert code == 0
+
+    first, second = FlipFlop(), FlipFlop()
+    first.value = 1
+    simulator = SequentialSimulator(TreeBuilder(2, [XOR, XOR]), {'L': (first, 'input'), '': (second, 'output')})
+    expected = simulator.run(vectors).output_values()
+    bits = int.from_bytes((tmp_path / "out.bin").read_bytes(), 'little')
+    assert [(bits >> k) & 1 for k in range(len(vectors))] == expected
+
+
+def test_eval_binary_output_with_blank_lines(tmp_path):
+    # 101 vectores (no múltiplo de 8) con líneas vacías intercaladas: los bloques intermedios
+    # deben seguir cayendo en bytes completos
+    vectors = _random_vectors(2, 4, 101)
+    lines = []
+    for k, vector in enumerate(vectors):
+        if k % 7 == 3:
+            lines.append('\n')
+        lines.append(''.join(map(str, vector)) + '\n')
+    (tmp_path / "in.txt").write_text(''.join(lines))
+    code = main(['eval', '--gates', 'AND', 'XOR', '--format', 'binary', '--chunk', '16',
+                 '-i', str(tmp_path / "in.txt"), '-o', str(tmp_path / "out.bin")])
+    assert code == 0
+    data = (tmp_path / "out.bin").read_bytes()
+    assert len(data) == (len(vectors) + 7) // 8
+    expected = BatchEvaluator(TreeBuilder(2, [AND, XOR])).evaluate_vectors(vectors).outputs()
+    bits = int.from_bytes(data, 'little')
+    assert [(bits >> k) & 1 for k in range(len(vectors))] == expected
+
+
+def test_eval_loads_saved_circuit(tmp_path):
+    builder = TreeBuilder(2, [OR, AND])
+    save(tmp_path / "c.bin", builder)
+    (tmp_path / "in.txt").write_text("0011\n1010\n")
+    main(['eval', '--circuit', str(tmp_path / "c.bin"),
+          '-i', str(tmp_path / "in.txt"), '-o', str(tmp_path / "out.txt")])
+    assert (tmp_path / "out.txt").read_text() == "1\n0\n"
+
+
+def test_eval_rejects_malformed_vector(tmp_path, capsys):
+    (tmp_path / "in.txt").write_text("01\n012\n")
+    code = main(['eval', '--gates', 'AND', '-i', str(tmp_path / "in.txt"), '-o', str(tmp_path / "o.txt")])
+    assert code == 1
+    assert "Línea 2: se esperan 2 valores 0/1, se recibió '012'" in capsys.readouterr().err
+
+
+def test_table_csv(tmp_path):
+    main(['table', '--gates', 'XOR', '-o', str(tmp_path / "t.csv")])
+    assert (tmp_path / "t.csv").read_text().splitlines() == [
+        "in0,in1,out", "0,0,0", "0,1,1", "1,0,1", "1,1,0"
+    ]
+
+
+def test_invalid_circuit_arguments_exit():
+    with pytest.raises(SystemExit):
+        main(['eval', '--levels', '3', '--gates', 'AND', 'OR'])
+    with pytest.raises(SystemExit):
+        main(['table', '--gates', 'AND', '--ff', 'L:input'])
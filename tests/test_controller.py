@@ -0,0 +1,28 @@
+import pytest
+
+from controller import CompuertaController
+from gates import AND, NAND, FlipFlop
+
+
+def test_controller_scalar_dispatch():
+    controller = CompuertaController()
+    assert controller.operar(NAND(), 1, 1) == 0
+    assert controller.operar(AND(), 1, 1) == 1
+
+
+def test_controller_batch_dispatch_with_mask():
+    controller = CompuertaController()
+    assert controller.operar(NAND(), 0b1100, 0b1010, mask=0b1111) == 0b0111
+    q, _ = controller.operar(FlipFlop(), 0b0001, 0b0100, mask=0b1111)
+    assert q == 0b0011
+
+
+def test_controller_batch_dispatch_with_numpy_arrays():
+    np = pytest.importorskip("numpy")
+    controller = CompuertaController()
+    a = np.array([True, True, False, False])
+    b = np.array([True, False, True, False])
+    assert controller.operar(NAND(), a, b).tolist() == [False, True, True, True]
+    packed = np.array([0b1100], dtype=np.uint8)
+    other = np.array([0b1010], dtype=np.uint8)
+    assert controller.operar(AND(), packed, other).tolist() == [0b1000]
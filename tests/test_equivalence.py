@@ -0,0 +1,84 @@
+import itertools
+import random
+import time
+
+import pytest
+
+from gates import AND, OR, NAND, NOR, XOR, FlipFlop
+from tree import TreeBuilder
+from tree.equivalence import check_equivalence
+
+
+GATES = [AND, OR, NAND, NOR, XOR]
+
+
+def _output(builder, leaves, inverted=()):
+    root = builder.build()
+    for i, (leaf, value) in enumerate(zip(builder.get_leaves(), leaves)):
+        leaf.value = value ^ (1 if i in inverted else 0)
+    return root.evaluate()
+
+
+def test_nand_nand_equals_or_of_ands():
+    # NAND(NAND(a, b), NAND(c, d)) = OR(AND(a, b), AND(c, d))
+    result = check_equivalence(TreeBuilder(2, [NAND, NAND]), TreeBuilder(2, [OR, AND]))
+    assert result.equivalent and result.method == 'bdd'
+    # De Morgan: NOR(a, b) = AND(~a, ~b)
+    assert check_equivalence(TreeBuilder(1, [NOR]), TreeBuilder(1, [AND]), invert_b=True)
+    assert check_equivalence(TreeBuilder(3, [XOR] * 3), TreeBuilder(3, [XOR] * 3), invert_a=[0, 5])
+
+
+def test_counterexample_distinguishes_circuits():
+    a, b = TreeBuilder(2, [AND, OR]), TreeBuilder(2, [OR, AND])
+    result = check_equivalence(a, b, seed=3)
+    assert not result.equivalent and result.method == 'simulation'
+    assert _output(a, result.counterexample) != _output(b, result.counterexample)
+    assert result.outputs == (_output(a, result.counterexample), _output(b, result.counterexample))
+
+
+def test_exact_check_finds_rare_differences():
+    # AND de 64 entradas contra el mismo AND con la hoja 0 invertida: solo difieren en los dos
+    # vectores con las hojas 1..63 en 1, que la simulación aleatoria no encuentra
+    a = TreeBuilder(6, [AND] * 6)
+    b = TreeBuilder(6, [AND] * 6)
+    result = check_equivalence(a, b, invert_b=[0], vectors=1024, seed=0)
+    assert not result.equivalent and result.method == 'bdd'
+    assert result.counterexample[1:] == [1] * 63
+    assert _output(a, result.counterexample) != _output(b, result.counterexample, {0})
+
+
+def test_matches_exhaustive_comparison():
+    rng = random.Random(0)
+    for _ in range(60):
+        num_levels = rng.randint(1, 3)
+        a = TreeBuilder(num_levels, [rng.choice(GATES) for _ in range(num_levels)])
+        b = TreeBuilder(num_levels, [rng.choice(GATES) for _ in range(num_levels)])
+        inverted = {i for i in range(2 ** num_levels) if rng.random() < 0.3}
+        expected = all(
+            _output(a, leaves) == _output(b, leaves, inverted)
+            for leaves in itertools.product((0, 1), repeat=2 ** num_levels)
+        )
+        result = check_equivalence(a, b, invert_b=inverted, vectors=rng.choice([0, 64]))
+        assert result.equivalent == expected
+        if not expected:
+            leaves = result.counterexample
+            assert _output(a, leaves) != _output(b, leaves, inverted)
+
+
+def test_six_levels_is_fast():
+    rng = random.Random(1)
+    start = time.perf_counter()
+    for _ in range(5):
+        a = TreeBuilder(6, [rng.choice(GATES) for _ in range(6)])
+        check_equivalence(a, TreeBuilder(6, list(a.gate_types)), invert_a=[1, 2], invert_b=[1, 2])
+        check_equivalence(a, TreeBuilder(6, [NAND] * 6))
+    assert time.perf_counter() - start < 1.0
+
+
+def test_invalid_inputs():
+    with pytest.raises(ValueError):
+        check_equivalence(TreeBuilder(1, [AND]), TreeBuilder(2, [AND, AND]))
+    with pytest.raises(ValueError):
+        check_equivalence(TreeBuilder(1, [FlipFlop]), TreeBuilder(1, [AND]))
+    with pytest.raises(IndexError):
+        check_equivalence(TreeBuilder(1, [AND]), TreeBuilder(1, [AND]), invert_a=[2])
@@ -0,0 +1,94 @@
+import itertools
+import random
+import time
+
+import pytest
+
+from gates import AND, OR, NAND, NOR, XOR, FlipFlop
+from tree import TreeBuilder
+from tree.batch import pack_vectors
+from tree.faults import FaultSimulator, all_faults, fault_name
+from tree.netlist import _TABLES, opcode_for
+
+
+GATES = [AND, OR, NAND, NOR, XOR]
+
+
+def _faulty_output(builder, leaves, fault):
+    # Evaluación de referencia por heap, forzando el valor del nodo con la falla
+    num_inputs = 2 ** builder.num_levels
+    values = [0] * num_inputs + list(leaves)
+    heap, stuck = fault
+    if heap >= num_inputs:
+        values[heap] = stuck
+    for h in range(num_inputs - 1, 0, -1):
+        table = _TABLES[opcode_for(builder.gate_types[h.bit_length() - 1])]
+        values[h] = stuck if h == heap else table[2 * values[2 * h] + values[2 * h + 1]]
+    return values[1]
+
+
+def test_detection_matches_serial_fault_simulation():
+    rng = random.Random(0)
+    for _ in range(30):
+        num_levels = rng.randint(1, 3)
+        builder = TreeBuilder(num_levels, [rng.choice(GATES) for _ in range(num_levels)])
+        num_inputs = 2 ** num_levels
+        vectors = [[rng.randint(0, 1) for _ in range(num_inputs)] for _ in range(rng.randint(1, 12))]
+        report = FaultSimulator(builder).run(vectors, chunk_size=rng.choice([1, 3, 64]))
+        # El flujo deja de leerse cuando ya se detectaron todas las fallas
+        assert report.vectors == len(vectors) or (not report.undetected and report.vectors < len(vectors))
+        assert report.total == len(all_faults(num_levels))
+        for fault in all_faults(num_levels):
+            first = next(
+                (k for k, v in enumerate(vectors)
+                 if _faulty_output(builder, v, fault) != _faulty_output(builder, v, (0, 0))),
+                None
+            )
+            if first is None:
+                assert fault in report.undetected
+            else:
+                assert report.detected[fault] == first
+
+
+def test_exhaustive_set_covers_every_fault():
+    builder = TreeBuilder(2, [OR, AND])
+    vectors = [list(v) for v in itertools.product((0, 1), repeat=4)]
+    report = FaultSimulator(builder).run(vectors)
+    # En un árbol sin XOR ni redundancias todas las fallas stuck-at son detectables
+    assert report.coverage == 1.0 and report.undetected == []
+    assert report.by_level() == {1: (2, 2), 2: (4, 4), 3: (8, 8)}
+    columns = pack_vectors(vectors, 4)
+    assert FaultSimulator(builder).run_columns(columns, 16).detected == report.detected
+
+
+def test_partial_test_set_and_report():
+    builder = TreeBuilder(1, [AND])
+    report = FaultSimulator(builder).run([[1, 1]])
+    # Con 11 solo se detectan las fallas stuck-at-0
+    assert sorted(report.detected) == [(1, 0), (2, 0), (3, 0)]
+    assert fault_name((3, 1)) in report.report()
+    assert report.to_dict()["coverage"] == 0.5
+    assert report.useful_vectors() == [0]
+    only = FaultSimulator(builder).run([[0, 1], [1, 1]], faults=[(2, 1)])
+    assert only.detected == {(2, 1): 0} and only.total == 1
+
+
+def test_six_levels_thousands_of_vectors():
+    rng = random.Random(1)
+    builder = TreeBuilder(6, [NAND, NOR, XOR, AND, OR, NAND])
+    vectors = [[rng.randint(0, 1) for _ in range(64)] for _ in range(5000)]
+    start = time.perf_counter()
+    report = FaultSimulator(builder).run(vectors, chunk_size=1024)
+    assert time.perf_counter() - start < 2.0
+    assert report.total == 2 * 127
+    assert report.coverage > 0.5
+
+
+def test_invalid_inputs():
+    simulator = FaultSimulator(TreeBuilder(1, [AND]))
+    with pytest.raises(ValueError):
+        simulator.run([[1, 1]], faults=[(4, 0)])
+    with pytest.raises(ValueError):
+        simulator.run([[1, 1, 1]])
+    with pytest.raises(ValueError):
+        FaultSimulator(TreeBuilder(1, [FlipFlop]))
@@ -67,3 +67,32 @@ def test_verify_formula_helper():
     stats = builder.get_statistics()
     gates_per_level = [stats['gates_per_level'].get(f"Nivel {i}", 0) for i in range(1, 4)]
     assert TreeBuilder.verify_formula(3, gates_per_level) is True
+
+
+def test_flipflop_batch_matches_sequential_operar():
+    s = [1, 0, 0, 0, 1, 1, 0, 0]
+    r = [0, 0, 1, 0, 1, 0, 0, 1]
+    ff = FlipFlop()
+    expected = [ff.operar(a, b)[0] for a, b in zip(s, r)]
+
+    batch = FlipFlop()
+    s_col = sum(v << t for t, v in enumerate(s))
+    r_col = sum(v << t for t, v in enumerate(r))
+    q, q_neg = batch.operar_batch(s_col, r_col, mask=0xFF)
+    assert [(q >> t) & 1 for t in range(8)] == expected
+    assert q_neg == q ^ 0xFF
+    assert batch.value == ff.value
+
+
+def test_flipflop_batch_requires_mask_for_ints():
+    with pytest.raises(ValueError):
+        FlipFlop().operar_batch(0b1, 0b0)
+
+
+def test_flipflop_batch_numpy_series():
+    np = pytest.importorskip("numpy")
+    ff = FlipFlop()
+    q, q_neg = ff.operar_batch(np.array([0, 1, 0, 0, 1]), np.array([0, 0, 0, 1, 1]))
+    assert q.tolist() == [0, 1, 1, 0, 1]
+    assert q_neg.tolist() == [1, 0, 0, 1, 0]
+    assert ff.value == 1
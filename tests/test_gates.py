@@ -1,6 +1,7 @@
 import pytest
 
 from gates import AND, OR, NAND, NOR, XOR
+from gates.base import Compuerta
 
 
 def test_and_gate():
@@ -41,3 +42,35 @@ def test_xor_gate():
     assert g.operar(0, 1) == 1
     assert g.operar(1, 0) == 1
     assert g.operar(1, 1) == 0
+
+
+@pytest.mark.parametrize("gate_class", [AND, OR, NAND, NOR, XOR])
+def test_gate_batch_matches_scalar(gate_class):
+    g = gate_class()
+    # Bit k de cada entero = combinación k de la tabla de verdad (A, B)
+    a, b, mask = 0b1100, 0b1010, 0b1111
+    out = g.operar_batch(a, b, mask)
+    for k in range(4):
+        assert (out >> k) & 1 == g.operar((a >> k) & 1, (b >> k) & 1)
+
+
+@pytest.mark.parametrize("gate_class", [AND, OR, NAND, NOR, XOR])
+def test_gate_batch_numpy_matches_scalar(gate_class):
+    np = pytest.importorskip("numpy")
+    g = gate_class()
+    a = np.array([True, True, False, False])
+    b = np.array([True, False, True, False])
+    out = g.operar_batch(a, b)
+    assert out.tolist() == [bool(g.operar(int(x), int(y))) for x, y in zip(a, b)]
+    # uint8 con mask=1: un valor 0/1 por elemento
+    out = g.operar_batch(a.astype(np.uint8), b.astype(np.uint8), mask=1)
+    assert out.tolist() == [g.operar(int(x), int(y)) for x, y in zip(a, b)]
+
+
+def test_base_operar_batch_raises_value_error():
+    class Passthrough(Compuerta):
+        def operar(self, A, B=None):
+            return A
+
+    with pytest.raises(ValueError):
+        Passthrough().operar_batch(0b1, 0b0, 0b1)
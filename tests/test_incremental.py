@@ -0,0 +1,90 @@
+import random
+
+import pytest
+
+from gates import AND, OR, NAND, NOR, XOR, FlipFlop
+from main import evaluate_with_flipflop
+from tree import TreeBuilder
+from tree.incremental import IncrementalEvaluator
+
+
+GATES = [AND, OR, NAND, NOR, XOR]
+
+
+def _circuito(gate_types, ff_path=None, ff_pos='input'):
+    builder = TreeBuilder(num_levels=len(gate_types), gate_types=gate_types)
+    root = builder.build()
+    ff_map = {}
+    if ff_path is not None:
+        ff_map[ff_path] = (FlipFlop(), ff_pos)
+    return builder, root, ff_map
+
+
+def test_single_toggle_only_touches_path():
+    builder, root, _ = _circuito([XOR, XOR, XOR, XOR])
+    evaluator = IncrementalEvaluator(builder)
+    evaluator.evaluate()
+
+    flipped = evaluator.set_leaf(5, 1)
+    # Con XOR en todos los niveles el cambio llega hasta la raíz: hoja + 4 compuertas
+    assert len(flipped) == 5
+    assert flipped[-1] is root
+    assert root.result == 1
+
+
+def test_propagation_stops_when_output_does_not_change():
+    builder, root, _ = _circuito([AND, AND])
+    evaluator = IncrementalEvaluator(builder)
+    evaluator.evaluate()
+
+    # AND(1, 0) sigue siendo 0: solo cambia la hoja
+    flipped = evaluator.set_leaf(0, 1)
+    assert flipped == [builder.get_leaves()[0]]
+
+
+def test_incremental_matches_full_evaluation_with_flipflops():
+    rng = random.Random(3)
+    for ff_path, ff_pos in [(None, 'input'), ('LR', 'input'), ('R', 'output'), ('LRR', 'input'), ('', 'output')]:
+        gate_types = [rng.choice(GATES) for _ in range(3)]
+        builder_a, root_a, ff_a = _circuito(gate_types, ff_path, ff_pos)
+        builder_b, root_b, ff_b = _circuito(gate_types, ff_path, ff_pos)
+
+        evaluator = IncrementalEvaluator(builder_a, ff_a)
+        evaluator.evaluate()
+        evaluate_with_flipflop(root_b, ff_b)
+
+        for _ in range(50):
+            changed = rng.sample(range(8), rng.randint(1, 3))
+            for i in changed:
+                v = rng.randint(0, 1)
+                builder_a.get_leaves()[i].value = v
+                builder_b.get_leaves()[i].value = v
+            evaluator.update(changed)
+            evaluate_with_flipflop(root_b, ff_b)
+            assert root_a.result == root_b.result
+
+
+def test_update_rejects_invalid_leaf():
+    builder, _, _ = _circuito([AND])
+    evaluator = IncrementalEvaluator(builder)
+    with pytest.raises(IndexError):
+        evaluator.update([2])
+
+
+def test_netlist_update_leaves_matches_full_evaluate():
+    rng = random.Random(11)
+    builder, _, _ = _circuito([NAND, XOR, NOR, OR])
+    netlist = builder.compile()
+    reference = builder.compile()
+    netlist.evaluate()
+
+    for _ in range(100):
+        changes = {rng.randrange(16): rng.randint(0, 1) for _ in range(2)}
+        flipped = netlist.update_leaves(changes)
+        leaves = reference.get_leaves()
+        for i, v in changes.items():
+            leaves[i] = v
+        reference.set_leaves(leaves)
+        reference.evaluate()
+        assert netlist.values == reference.values
+        assert all(h >= 1 for h in flipped)
@@ -0,0 +1,94 @@
+import io
+import json
+
+import main
+from gates import AND, XOR, FlipFlop
+from tree import Nodo, TreeBuilder, evaluation
+from tree.batch import BatchEvaluator
+from tree.instrumentation import Instrumentation, from_env, profile
+
+
+def _builder():
+    builder = TreeBuilder(2, [AND, XOR])
+    root = builder.build()
+    for leaf, value in zip(builder.get_leaves(), [1, 0, 1, 1]):
+        leaf.value = value
+    return builder, root
+
+
+def test_counts_gate_calls_per_type_and_level():
+    builder, root = _builder()
+    with Instrumentation(builder) as inst:
+        root.evaluate()
+        main.evaluate_with_flipflop(root, {})
+    data = inst.to_dict()
+    assert data["gate_calls"] == {"AND": 2, "XOR": 4}
+    assert {"gate": "XOR", "level": 2, "calls": 4} in data["gate_calls_by_level"]
+    json.loads(inst.to_json())
+
+
+def test_disabled_instrumentation_restores_originals():
+    original = AND.operar
+    builder, root = _builder()
+    inst = Instrumentation(builder)
+    with inst:
+        assert AND.operar is not original
+    assert AND.operar is original
+    root.evaluate()
+    assert sum(inst.gate_calls.values()) == 0
+
+
+def test_instrumentation_disables_truth_tables_through_public_hook():
+    builder, root = _builder()
+    main.evaluate_with_flipflop(root, {})
+    with Instrumentation(builder) as inst:
+        assert evaluation.use_truth_tables(False) is False
+        main.evaluate_with_flipflop(root, {})
+    assert inst.to_dict()["gate_calls"] == {"AND": 1, "XOR": 2}
+    # Al desactivarla se restauran las tablas y el plan vuelve a usarlas
+    assert evaluation.use_truth_tables(True) is True
+    main.evaluate_with_flipflop(root, {})
+    assert sum(inst.gate_calls.values()) == 3
+
+
+def test_records_flipflop_transitions_and_batch_calls():
+    builder, root = _builder()
+    ff_map = {'L': (FlipFlop(), 'output')}
+    with Instrumentation(builder, ff_map) as inst:
+        main.evaluate_with_flipflop(root, ff_map)
+        for leaf in builder.get_leaves():
+            leaf.value = 0
+        main.evaluate_with_flipflop(root, ff_map)
+        BatchEvaluator(builder).evaluate_vectors([[0, 1, 1, 1]])
+    assert inst.transitions["ff[L]"] == {"0->1": 1}
+    assert inst.batch_calls["AND"] == 1
+    assert "Transiciones de FlipFlop" in inst.report()
+
+
+def test_watch_and_phase_timers():
+    builder, root = _builder()
+    with Instrumentation(builder).watch(Nodo, 'is_leaf').watch(main, 'get_node_by_path') as inst:
+        with inst.phase("evaluar"):
+            root.evaluate()
+        main.get_node_by_path(root, 'LR')
+    assert inst.phases["evaluar"]["calls"] == 1
+    assert inst.phases["Nodo.is_leaf"]["calls"] > 0
+    assert inst.phases["main.get_node_by_path"]["calls"] == 1
+
+
+def test_profile_and_env_integration(tmp_path, capsys):
+    builder, root = _builder()
+    stream = io.StringIO()
+    with profile(stream=stream):
+        root.evaluate()
+    assert "evaluate" in stream.getvalue()
+
+    with from_env({}) as inst:
+        assert inst is None
+    with from_env({"AC_INSTRUMENT": "1", "AC_PROFILE": str(tmp_path / "p.prof")}) as inst:
+        root.evaluate()
+    assert (tmp_path / "p.prof").exists()
+    err = capsys.readouterr().err
+    assert "AND" in err
+    # Sin builder el reporte no tiene la sección por nivel
+    assert "Llamadas a operar por compuerta:" in err and "nivel" not in err
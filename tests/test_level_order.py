@@ -0,0 +1,132 @@
+import random
+
+from gates import AND, OR, NAND, NOR, XOR, FlipFlop
+from main import evaluate_with_flipflop, print_tree
+from tree import TreeBuilder
+from tree.evaluation import builder_levels, collect_levels, evaluate_gate, evaluate_leaf, evaluate_levels
+
+
+GATES = [AND, OR, NAND, NOR, XOR]
+
+
+def _evaluate_recursive(node, ff_map, path=""):
+    # Versión recursiva original de evaluate_with_flipflop, usada como referencia
+    ff_entry = ff_map.get(path)
+    if node.is_leaf():
+        return evaluate_leaf(node, ff_entry)
+    left_val = _evaluate_recursive(node.left, ff_map, path + 'L')
+    right_val = _evaluate_recursive(node.right, ff_map, path + 'R')
+    return evaluate_gate(node, left_val, right_val, ff_entry)
+
+
+def _random_circuit(rng, num_levels):
+    builder = TreeBuilder(num_levels, [rng.choice(GATES) for _ in range(num_levels)])
+    root = builder.build()
+    for leaf in builder.get_leaves():
+        leaf.value = rng.randint(0, 1)
+    return builder, root
+
+
+def _random_ff_map(rng, num_levels, count):
+    ff_map = {}
+    for _ in range(count):
+        depth = rng.randint(0, num_levels)
+        path = ''.join(rng.choice('LR') for _ in range(depth))
+        ff = FlipFlop()
+        ff.value = rng.randint(0, 1)
+        ff_map[path] = (ff, rng.choice(['input', 'output']))
+    return ff_map
+
+
+def _clone_ff_map(ff_map):
+    clone = {}
+    for path, (ff, position) in ff_map.items():
+        copy = FlipFlop()
+        copy.value = ff.value
+        clone[path] = (copy, position)
+    return clone
+
+
+def test_collect_levels_matches_builder_levels():
+    builder, root = _random_circuit(random.Random(0), 4)
+    assert collect_levels(root) == builder_levels(builder)
+
+
+def test_evaluate_levels_matches_recursive_evaluate():
+    rng = random.Random(1)
+    for num_levels in range(1, 7):
+        for _ in range(10):
+            builder, root = _random_circuit(rng, num_levels)
+            expected = root.evaluate()
+            expected_results = [node.result for level in builder_levels(builder) for node in level]
+            for node in (n for level in builder_levels(builder) for n in level):
+                node.result = None
+            assert evaluate_levels(builder_levels(builder)) == expected
+            assert [node.result for level in builder_levels(builder) for node in level] == expected_results
+
+
+def test_evaluate_with_flipflop_matches_recursive_version():
+    rng = random.Random(2)
+    for num_levels in range(1, 6):
+        for _ in range(15):
+            builder, root = _random_circuit(rng, num_levels)
+            ff_map = _random_ff_map(rng, num_levels, rng.randint(1, 3))
+            reference = _clone_ff_map(ff_map)
+            assert evaluate_with_flipflop(root, ff_map) == _evaluate_recursive(root, reference)
+            # El estado de los flip-flops evoluciona igual
+            assert [ff.value for ff, _ in ff_map.values()] == [ff.value for ff, _ in reference.values()]
+
+
+def test_evaluate_with_flipflop_follows_changes_between_calls():
+    # El plan guardado en la raíz se rearma cuando cambia el ff_map y lee las hojas cada vez
+    rng = random.Random(4)
+    builder, root = _random_circuit(rng, 3)
+    ff_map = {}
+    for step in range(20):
+        leaf = builder.get_leaves()[rng.randrange(8)]
+        leaf.value = bool(rng.randint(0, 1))
+        if step % 3 == 0:
+            ff_map.update(_random_ff_map(rng, 3, 1))
+        elif step % 3 == 1 and ff_map:
+            path = rng.choice(list(ff_map))
+            ff_map[path] = (FlipFlop(), 'output' if ff_map[path][1] == 'input' else 'input')
+        reference = _clone_ff_map(ff_map)
+        result = evaluate_with_flipflop(root, ff_map)
+        assert result == _evaluate_recursive(root, reference)
+        assert type(result) is int and type(leaf.result) is int
+
+
+def test_plan_is_declared_on_nodo_and_released_by_build():
+    builder, root = _random_circuit(random.Random(5), 2)
+    assert root._level_plan is None
+    evaluate_with_flipflop(root, {})
+    assert root._level_plan is not None
+    new_root = builder.build()
+    assert root._level_plan is None and new_root._level_plan is None
+    for leaf in builder.get_leaves():
+        leaf.value = 1
+    assert evaluate_with_flipflop(new_root, {}) == _evaluate_recursive(new_root, {})
+
+
+def test_evaluate_with_flipflop_on_subtree_uses_path_prefix():
+    rng = random.Random(3)
+    builder, root = _random_circuit(rng, 4)
+    ff_map = {'RL': (FlipFlop(), 'output'), 'RLR': (FlipFlop(), 'input'), 'L': (FlipFlop(), 'input')}
+    ff_map['RL'][0].value = 1
+    reference = _clone_ff_map(ff_map)
+    assert evaluate_with_flipflop(root.right, ff_map, 'R') == _evaluate_recursive(root.right, reference, 'R')
+    # El flip-flop fuera del subárbol no se tocó
+    assert ff_map['L'][0].value == 0
+
+
+def test_print_tree_keeps_preorder_output(capsys):
+    builder = TreeBuilder(2, [AND, OR])
+    root = builder.build()
+    root.evaluate()
+    print_tree(root)
+    lines = capsys.readouterr().out.splitlines()
+    assert len(lines) == 7
+    assert lines[0].startswith(" AND")
+    assert lines[1].startswith("  ├─  OR")
+    assert lines[2].startswith("  ├─   ├─  Hoja")
+    assert lines[4].startswith("  └─  OR")
@@ -0,0 +1,133 @@
+import random
+
+import pytest
+
+from gates import AND, OR, NAND, NOR, XOR, FlipFlop
+from main import evaluate_with_flipflop
+from tree import TreeBuilder, Netlist
+from tree.netlist import path_to_heap, heap_to_path, heap_level
+
+
+GATES = [AND, OR, NAND, NOR, XOR]
+
+
+def test_path_and_heap_conversion():
+    assert path_to_heap('') == 1
+    assert path_to_heap('L') == 2
+    assert path_to_heap('rl') == 6
+    assert heap_to_path(6) == 'RL'
+    assert heap_level(6) == 3
+    with pytest.raises(ValueError):
+        path_to_heap('X')
+
+
+def test_netlist_matches_nodo_evaluate():
+    rng = random.Random(7)
+    for num_levels in range(1, 6):
+        for _ in range(10):
+            gate_types = [rng.choice(GATES) for _ in range(num_levels)]
+            builder = TreeBuilder(num_levels=num_levels, gate_types=gate_types)
+            root = builder.build()
+            for leaf in builder.get_leaves():
+                leaf.value = rng.randint(0, 1)
+
+            netlist = builder.compile()
+            assert netlist.evaluate() == root.evaluate()
+
+
+def test_netlist_sync_tree_sets_results():
+    builder = TreeBuilder(num_levels=2, gate_types=[AND, OR])
+    root = builder.build()
+    for leaf, v in zip(builder.get_leaves(), [1, 1, 0, 0]):
+        leaf.value = v
+
+    netlist = builder.compile()
+    assert netlist.evaluate() == 0
+    netlist.sync_tree()
+    assert root.result == 0
+    assert root.left.result == 1
+    assert root.right.result == 0
+    assert netlist.level_values(2) == [1, 0]
+
+    # Una hoja con flip-flop en la entrada muestra Q, como evaluate_with_flipflop
+    builder = TreeBuilder(num_levels=1, gate_types=[AND])
+    root = builder.build()
+    for leaf, v in zip(builder.get_leaves(), [0, 1]):
+        leaf.value = v
+    ff = FlipFlop()
+    ff.value = 1
+    netlist = Netlist.from_builder(builder, {'L': (ff, 'input')})
+    assert netlist.evaluate() == 1
+    netlist.sync_tree()
+    synced = [leaf.result for leaf in builder.get_leaves()]
+    assert synced == [1, 1]
+    assert evaluate_with_flipflop(root, {'L': (ff, 'input')}) == root.result == 1
+    assert [leaf.result for leaf in builder.get_leaves()] == synced
+
+
+def test_netlist_without_build_uses_zero_leaves():
+    builder = TreeBuilder(num_levels=3, gate_types=[NOR, AND, AND])
+    netlist = builder.compile()
+    assert netlist.nodes is None
+    assert netlist.evaluate() == 1
+    netlist.set_leaves([1] * 8)
+    assert netlist.evaluate() == 0
+    with pytest.raises(ValueError):
+        netlist.sync_tree()
+
+
+def test_large_tree_compiles_without_nodo_objects():
+    # 16 niveles: 65536 hojas, sin llamar a build()
+    gate_types = [XOR] * 16
+    builder = TreeBuilder(num_levels=16, gate_types=gate_types)
+    netlist = builder.compile()
+    assert netlist.nodes is None
+    assert len(netlist.values) == 2 ** 17
+
+    leaves = [0] * netlist.num_inputs
+    leaves[12345] = 1
+    netlist.set_leaves(leaves)
+    assert netlist.evaluate() == 1
+
+
+def test_lazy_nodes_follow_buffer_and_evaluate_like_nodo():
+    builder = TreeBuilder(num_levels=8, gate_types=[AND, OR, NAND, NOR, XOR, AND, OR, XOR])
+    netlist = builder.compile()
+    rng = random.Random(21)
+    netlist.set_leaves([rng.randint(0, 1) for _ in range(netlist.num_inputs)])
+    expected = netlist.evaluate()
+
+    root = netlist.node(1)
+    assert root.is_internal()
+    assert root.result == expected
+    assert isinstance(root.gate, AND)
+
+    # El camino inspeccionado se materializa nodo por nodo hasta la hoja
+    path = netlist.path_nodes('RRLLRLRL')
+    assert len(path) == 9
+    assert path[-1].is_leaf()
+    assert path[-1].value == netlist.get_leaves()[0b11001010]
+
+    # Evaluar la vista con Nodo.evaluate escribe en el mismo buffer
+    path[-1].value ^= 1
+    reference = Netlist(8, netlist.opcodes)
+    reference.set_leaves(netlist.get_leaves())
+    assert root.evaluate() == reference.evaluate()
+    with pytest.raises(IndexError):
+        netlist.node(2 ** 9)
+
+
+def test_leaf_result_does_not_overwrite_leaf_input():
+    # Un flip-flop del ff_map en una hoja escribe Q en result sin cambiar la entrada
+    from gates import FlipFlop
+    from main import evaluate_with_flipflop
+
+    netlist = TreeBuilder(1, [AND]).compile()
+    netlist.set_leaves([0, 1])
+    ff = FlipFlop()
+    ff.value = 1
+    assert evaluate_with_flipflop(netlist.node(1), {'L': (ff, 'input')}) == 1
+    assert netlist.node(2).result == 1
+    assert netlist.get_leaves() == [0, 1]
+    assert netlist.evaluate() == 0
+    assert netlist.node(2).result == 0
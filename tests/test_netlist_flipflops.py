@@ -0,0 +1,104 @@
+import random
+
+import pytest
+
+from gates import AND, OR, NAND, NOR, XOR, FlipFlop
+from main import evaluate_with_flipflop
+from tree import Netlist, TreeBuilder
+from tree.netlist import FF_INPUT, FF_OUTPUT, path_to_heap
+
+
+GATES = [AND, OR, NAND, NOR, XOR]
+
+
+def _random_setup(rng, num_levels):
+    builder = TreeBuilder(num_levels, [rng.choice(GATES) for _ in range(num_levels)])
+    root = builder.build()
+    ff_map = {}
+    for _ in range(rng.randint(1, 4)):
+        path = ''.join(rng.choice('LR') for _ in range(rng.randint(0, num_levels)))
+        ff = FlipFlop()
+        ff.value = rng.randint(0, 1)
+        # Las hojas solo admiten flip-flop en la entrada
+        position = 'input' if len(path) == num_levels else rng.choice(['input', 'output'])
+        ff_map[path] = (ff, position)
+    return builder, root, ff_map
+
+
+def test_add_remove_and_lookup():
+    netlist = TreeBuilder(3, [AND, OR, XOR]).compile()
+    netlist.add_flipflop(path_to_heap('L'), 'input', 1)
+    netlist.add_flipflop(path_to_heap('RRR'), 'input')
+    netlist.add_flipflop(1, 'output')
+    assert netlist.ff_positions[2] == FF_INPUT and netlist.ff_positions[1] == FF_OUTPUT
+    assert netlist.flipflops() == [(1, 'output', 0), (2, 'input', 1), (15, 'input', 0)]
+    netlist.remove_flipflop(2)
+    assert not netlist.has_flipflop(2)
+    assert [heap for heap, _, _ in netlist.flipflops()] == [1, 15]
+    with pytest.raises(KeyError):
+        netlist.remove_flipflop(2)
+    with pytest.raises(ValueError):
+        netlist.add_flipflop(15, 'output')
+    with pytest.raises(IndexError):
+        netlist.add_flipflop(16)
+
+
+def test_evaluate_matches_evaluate_with_flipflop_over_time():
+    rng = random.Random(7)
+    for num_levels in range(1, 6):
+        for _ in range(10):
+            builder, root, ff_map = _random_setup(rng, num_levels)
+            netlist = Netlist.from_builder(builder, ff_map)
+            leaves = builder.get_leaves()
+            for _ in range(6):
+                values = [rng.randint(0, 1) for _ in leaves]
+                for leaf, value in zip(leaves, values):
+                    leaf.value = value
+                netlist.set_leaves(values)
+                assert netlist.evaluate() == evaluate_with_flipflop(root, ff_map)
+                for path, (ff, _) in ff_map.items():
+                    assert netlist.ff_state[path_to_heap(path)] == ff.value
+
+
+def test_from_builder_skips_leaf_output_flipflops():
+    # La consola permite un flip-flop en la salida de una hoja; ningún evaluador lo usa
+    builder = TreeBuilder(2, [OR, AND])
+    root = builder.build()
+    for leaf, value in zip(builder.get_leaves(), (1, 0, 0, 1)):
+        leaf.value = value
+    ff = FlipFlop()
+    ff.value = 1
+    ff_map = {'LR': (ff, 'output'), 'R': (FlipFlop(), 'input')}
+    netlist = Netlist.from_builder(builder, ff_map)
+    assert netlist.flipflops() == [(path_to_heap('R'), 'input', 0)]
+    assert netlist.evaluate() == evaluate_with_flipflop(root, ff_map)
+
+
+def test_update_leaves_with_flipflops_matches_full_evaluation():
+    rng = random.Random(8)
+    for num_levels in range(1, 6):
+        for _ in range(10):
+            builder, _, ff_map = _random_setup(rng, num_levels)
+            incremental = Netlist.from_builder(builder, ff_map)
+            full = Netlist.from_builder(builder, ff_map)
+            incremental.evaluate()
+            full.evaluate()
+            for _ in range(10):
+                changes = {rng.randrange(full.num_inputs): rng.randint(0, 1) for _ in range(2)}
+                before = bytes(incremental.values)
+                flipped = incremental.update_leaves(changes)
+                full.set_leaves([changes.get(i, v) for i, v in enumerate(full.get_leaves())])
+                full.evaluate()
+                assert incremental.values == full.values
+                assert incremental.ff_state == full.ff_state
+                assert sorted(flipped) == [h for h in range(1, len(before)) if before[h] != full.values[h]]
+
+
+def test_nodes_without_flipflops_use_fast_path():
+    netlist = TreeBuilder(4, [XOR] * 4).compile()
+    netlist.set_leaves([1] * 16)
+    netlist.add_flipflop(path_to_heap('LL'), 'output', 1)
+    # Solo cambia el nodo con flip-flop: XOR(1,1,1,1) = 0 pero su salida queda en 1
+    assert netlist.evaluate() == 1
+    netlist.remove_flipflop(path_to_heap('LL'))
+    assert netlist.evaluate() == 0
@@ -0,0 +1,75 @@
+import itertools
+import random
+
+import pytest
+
+from gates import AND, OR, NAND, NOR, XOR, FlipFlop
+from tree import BatchEvaluator, TreeBuilder
+from tree.optimize import optimize
+
+
+GATES = [AND, OR, NAND, NOR, XOR]
+
+
+def _reference(builder, leaves):
+    root = builder.build()
+    for leaf, value in zip(builder.get_leaves(), leaves):
+        leaf.value = value
+    return root.evaluate()
+
+
+def test_reduced_circuit_matches_original_for_all_inputs():
+    rng = random.Random(0)
+    for num_levels in range(1, 4):
+        for _ in range(15):
+            builder = TreeBuilder(num_levels, [rng.choice(GATES) for _ in range(num_levels)])
+            num_inputs = 2 ** num_levels
+            fixed = {i: rng.randint(0, 1) for i in rng.sample(range(num_inputs), rng.randint(0, num_inputs))}
+            reduced = optimize(builder, fixed)
+            for leaves in itertools.product((0, 1), repeat=num_inputs):
+                if any(leaves[i] != v for i, v in fixed.items()):
+                    continue
+                assert reduced.evaluate(leaves) == _reference(builder, leaves)
+
+
+def test_evaluate_batch_matches_batch_evaluator():
+    rng = random.Random(1)
+    builder = TreeBuilder(5, [NAND, NAND, XOR, NOR, OR])
+    fixed = {i: rng.randint(0, 1) for i in range(0, 32, 3)}
+    reduced = optimize(builder, fixed)
+    columns = [rng.getrandbits(500) for _ in range(32)]
+    for i, value in fixed.items():
+        columns[i] = (1 << 500) - 1 if value else 0
+    assert reduced.evaluate_batch(columns, 500) == BatchEvaluator(builder).evaluate(columns, 500).output
+
+
+def test_constant_propagation_and_cancellation_remove_gates():
+    # Una hoja en 0 bajo AND hace constante todo el circuito
+    builder = TreeBuilder(3, [AND, AND, AND])
+    reduced = optimize(builder, {5: 0})
+    assert reduced.gates == [] and reduced.gates_removed == 7
+    assert reduced.evaluate([1] * 8) == 0
+
+    # NAND sobre NAND sin constantes no se reduce, pero sí se eliminan las negaciones dobles
+    reduced = optimize(TreeBuilder(2, [NAND, NAND]))
+    assert reduced.gates_removed == 0
+    assert reduced.support == [0, 1, 2, 3]
+
+    # XOR de una hoja libre con una fijada en 1 es solo una negación
+    reduced = optimize(TreeBuilder(1, [XOR]), {1: 1})
+    assert reduced.gates_removed == 1
+    assert [reduced.evaluate([a, 1]) for a in (0, 1)] == [1, 0]
+
+
+def test_support_drops_irrelevant_leaves():
+    reduced = optimize(TreeBuilder(2, [OR, AND]), {0: 1, 1: 1})
+    # La mitad izquierda vale 1, así que el OR de la raíz es 1 sin importar el resto
+    assert reduced.support == []
+    assert reduced.evaluate([1, 1, 0, 0]) == 1
+
+
+def test_rejects_flipflop_levels_and_bad_indices():
+    with pytest.raises(ValueError):
+        optimize(TreeBuilder(1, [FlipFlop]))
+    with pytest.raises(IndexError):
+        optimize(TreeBuilder(1, [AND]), {2: 1})
@@ -0,0 +1,81 @@
+import io
+import itertools
+import pickle
+
+from gates import AND, OR, NAND, NOR, XOR, FlipFlop
+from main import evaluate_with_flipflop
+from tree import TreeBuilder, BatchEvaluator
+from tree.parallel import CircuitSpec, parallel_sweep
+from tree.truth_table import write_bitmap
+
+
+def test_circuit_spec_is_picklable_and_roundtrips():
+    builder = TreeBuilder(num_levels=3, gate_types=[AND, XOR, NOR])
+    ff = FlipFlop()
+    ff.value = 1
+    spec = CircuitSpec.from_builder(builder, {'LR': (ff, 'output')})
+
+    clone = pickle.loads(pickle.dumps(spec))
+    assert clone == spec
+    assert clone.builder().gate_types == [AND, XOR, NOR]
+    restored_ff, position = clone.ff_map()['LR']
+    assert position == 'output' and restored_ff.value == 1
+
+
+def test_parallel_count_and_bitmap_match_truth_table():
+    builder = TreeBuilder(num_levels=3, gate_types=[OR, NAND, XOR])
+    root = builder.build()
+    ones = 0
+    for bits in itertools.product([0, 1], repeat=8):
+        for leaf, v in zip(builder.get_leaves(), bits):
+            leaf.value = v
+        ones += root.evaluate()
+
+    result = parallel_sweep(builder, 'count', workers=2, chunk_bits=4)
+    assert result.rows == 256
+    assert result.ones == ones
+
+    expected = io.BytesIO()
+    write_bitmap(builder, expected)
+    result = parallel_sweep(builder, 'bitmap', workers=2, chunk_bits=4)
+    assert result.bitmap == expected.getvalue()
+
+
+def test_parallel_first_finds_lowest_row():
+    # AND de 16 entradas: solo la última fila (todo en 1) da salida 1
+    builder = TreeBuilder(num_levels=4, gate_types=[AND, AND, AND, AND])
+    result = parallel_sweep(builder, 'first', workers=2, shards=8, chunk_bits=8)
+    assert result.first == 2 ** 16 - 1
+    assert result.first_inputs() == [1] * 16
+
+    builder = TreeBuilder(num_levels=2, gate_types=[NOR, NOR])
+    result = parallel_sweep(builder, 'first', workers=2)
+    # NOR(NOR(a, b), NOR(c, d)) = (a or b) and (c or d)
+    assert result.first_inputs() == [0, 1, 0, 1]
+
+
+def test_batch_with_flipflops_matches_single_evaluation():
+    gate_types = [XOR, NAND, OR]
+    placements = [('', 'output', 1), ('LR', 'input', 1), ('RRL', 'input', 1), ('L', 'output', 0)]
+    builder = TreeBuilder(num_levels=3, gate_types=gate_types)
+    ff_map = {}
+    for path, pos, state in placements:
+        ff = FlipFlop()
+        ff.value = state
+        ff_map[path] = (ff, pos)
+
+    vectors = [list(bits) for bits in itertools.product([0, 1], repeat=8)]
+    outputs = BatchEvaluator(builder, ff_map).evaluate_vectors(vectors).outputs()
+
+    for vector, output in zip(vectors, outputs):
+        # Cada vector se evalúa con flip-flops nuevos en el mismo estado inicial
+        reference = TreeBuilder(num_levels=3, gate_types=gate_types)
+        root = reference.build()
+        for leaf, v in zip(reference.get_leaves(), vector):
+            leaf.value = v
+        fresh = {}
+        for path, pos, state in placements:
+            ff = FlipFlop()
+            ff.value = state
+            fresh[path] = (ff, pos)
+        assert evaluate_with_flipflop(root, fresh) == output
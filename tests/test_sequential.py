@@ -0,0 +1,93 @@
+import random
+
+import pytest
+
+from gates import AND, OR, NAND, NOR, XOR, FlipFlop
+from main import evaluate_with_flipflop
+from tree import TreeBuilder
+from tree.batch import pack_vectors
+from tree.sequential import SequentialSimulator, sr_scan
+
+
+GATES = [AND, OR, NAND, NOR, XOR]
+
+
+def test_sr_scan_matches_flipflop_operar():
+    rng = random.Random(4)
+    for _ in range(200):
+        count = rng.randint(1, 40)
+        s = [rng.randint(0, 1) for _ in range(count)]
+        r = [rng.randint(0, 1) for _ in range(count)]
+        ff = FlipFlop()
+        ff.value = initial = rng.randint(0, 1)
+        expected = [ff.operar(a, b)[0] for a, b in zip(s, r)]
+
+        s_col, r_col = pack_vectors([[a, b] for a, b in zip(s, r)], 2)
+        q, final = sr_scan(s_col, r_col, initial, count)
+        assert [(q >> t) & 1 for t in range(count)] == expected
+        assert final == ff.value
+
+
+def _ff_map(placements):
+    return {path: (FlipFlop(), pos) for path, pos in placements}
+
+
+def test_simulator_matches_evaluate_with_flipflop_per_cycle():
+    rng = random.Random(8)
+    placements = [('LL', 'input'), ('R', 'output'), ('RLR', 'input'), ('', 'output'), ('LRR', 'input')]
+    for _ in range(5):
+        gate_types = [rng.choice(GATES) for _ in range(3)]
+        chosen = rng.sample(placements, 3)
+
+        sim_builder = TreeBuilder(num_levels=3, gate_types=gate_types)
+        sim_map = _ff_map(chosen)
+        simulator = SequentialSimulator(sim_builder, sim_map)
+
+        ref_builder = TreeBuilder(num_levels=3, gate_types=gate_types)
+        ref_root = ref_builder.build()
+        ref_map = _ff_map(chosen)
+
+        vectors = [[rng.randint(0, 1) for _ in range(8)] for _ in range(100)]
+        expected_out = []
+        expected_ff = {path: [] for path, _ in chosen}
+        for vector in vectors:
+            for leaf, v in zip(ref_builder.get_leaves(), vector):
+                leaf.value = v
+            expected_out.append(evaluate_with_flipflop(ref_root, ref_map))
+            for path, _ in chosen:
+                expected_ff[path].append(ref_map[path][0].value)
+
+        wave = simulator.run(vectors, chunk_size=16)
+        assert wave.cycles == 100
+        assert wave.output_values() == expected_out
+        for path, _ in chosen:
+            assert wave.flipflop_values(path) == expected_ff[path]
+
+        simulator.sync_flipflops()
+        for path, _ in chosen:
+            assert sim_map[path][0].value == ref_map[path][0].value
+
+
+def test_snapshot_and_restore():
+    builder = TreeBuilder(num_levels=1, gate_types=[AND])
+    simulator = SequentialSimulator(builder, _ff_map([('', 'output')]))
+    snap = simulator.snapshot()
+
+    wave = simulator.run([[1, 1], [0, 0]])
+    assert wave.output_values() == [1, 1]
+    assert simulator.snapshot() == b'\x01'
+
+    simulator.restore(snap)
+    wave = simulator.run([[0, 0]])
+    assert wave.output_values() == [0]
+    with pytest.raises(ValueError):
+        simulator.restore(b'')
+
+
+def test_run_respects_cycle_limit():
+    builder = TreeBuilder(num_levels=2, gate_types=[OR, XOR])
+    simulator = SequentialSimulator(builder)
+    vectors = ([1, 0, 0, 0] for _ in range(1000))
+    wave = simulator.run(vectors, cycles=50, chunk_size=8)
+    assert wave.cycles == 50
+    assert wave.output_values() == [1] * 50
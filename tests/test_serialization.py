@@ -0,0 +1,166 @@
+import json
+import random
+
+import pytest
+
+from gates import AND, OR, NAND, NOR, XOR, FlipFlop
+from main import evaluate_with_flipflop
+from tree import TreeBuilder
+from tree.serialization import (
+    LeafBitmap, dumps, from_dict, load, load_json, loads_builder, loads_netlist,
+    pack_leaves, save, save_json, to_dict, unpack_leaves
+)
+
+
+def _circuit(seed=0, num_levels=3):
+    rng = random.Random(seed)
+    builder = TreeBuilder(num_levels, [rng.choice([AND, OR, NAND, NOR, XOR]) for _ in range(num_levels)])
+    builder.build()
+    for leaf in builder.get_leaves():
+        leaf.value = rng.randint(0, 1)
+    ff = FlipFlop()
+    ff.value = 1
+    ff_map = {'L': (ff, 'input'), 'RR': (FlipFlop(), 'output')}
+    return builder, ff_map
+
+
+def _same_circuit(builder, ff_map, other_builder, other_ff_map):
+    assert other_builder.gate_types == builder.gate_types
+    assert [l.value for l in other_builder.get_leaves()] == [l.value for l in builder.get_leaves()]
+    assert {p: (ff.value, pos) for p, (ff, pos) in other_ff_map.items()} == \
+        {p: (ff.value, pos) for p, (ff, pos) in ff_map.items()}
+
+
+def test_pack_unpack_leaves_roundtrip():
+    for count in (1, 2, 7, 8, 9, 64):
+        leaves = bytes(random.Random(count).randint(0, 1) for _ in range(count))
+        assert unpack_leaves(pack_leaves(leaves), count) == leaves
+    # Hoja i = bit i del primer byte
+    assert pack_leaves(b'\x01\x00\x00\x01') == b'\x09'
+
+
+def test_json_roundtrip_rebuilds_tree_and_flipflops(tmp_path):
+    builder, ff_map = _circuit()
+    data = to_dict(builder, ff_map)
+    json.dumps(data)
+    assert data["gates"] == [g.__name__ for g in builder.gate_types]
+    assert data["flipflops"][0] == {"path": "L", "position": "input", "state": 1}
+
+    new_builder, root, new_ff_map = from_dict(data)
+    _same_circuit(builder, ff_map, new_builder, new_ff_map)
+    assert root is new_builder._nodes_by_level[1][0]
+
+    save_json(tmp_path / "c.json", builder, ff_map)
+    new_builder, root, new_ff_map = load_json(tmp_path / "c.json")
+    _same_circuit(builder, ff_map, new_builder, new_ff_map)
+
+
+def test_binary_roundtrip_preserves_evaluation(tmp_path):
+    builder, ff_map = _circuit(seed=4, num_levels=4)
+    data = dumps(builder, ff_map)
+    assert data[:4] == b'ACLC'
+
+    new_builder, root, new_ff_map = loads_builder(data)
+    _same_circuit(builder, ff_map, new_builder, new_ff_map)
+    assert evaluate_with_flipflop(root, new_ff_map) == \
+        evaluate_with_flipflop(builder._nodes_by_level[1][0], ff_map)
+
+    save(tmp_path / "c.bin", builder, ff_map)
+    netlist, _ = load(tmp_path / "c.bin", as_netlist=True)
+    assert netlist.get_leaves() == [l.value for l in builder.get_leaves()]
+
+
+def test_large_netlist_roundtrip_and_mmap(tmp_path):
+    netlist = TreeBuilder(16, [XOR] * 16).compile()
+    rng = random.Random(9)
+    leaves = [rng.randint(0, 1) for _ in range(netlist.num_inputs)]
+    netlist.set_leaves(leaves)
+    save(tmp_path / "big.bin", netlist)
+
+    loaded, ff_map = load(tmp_path / "big.bin", as_netlist=True)
+    assert ff_map == {}
+    assert loaded.evaluate() == netlist.evaluate() == sum(leaves) % 2
+
+    with LeafBitmap(tmp_path / "big.bin") as bitmap:
+        assert len(bitmap) == netlist.num_inputs
+        assert [bitmap[i] for i in (0, 1, 12345, len(bitmap) - 1)] == \
+            [leaves[i] for i in (0, 1, 12345, len(leaves) - 1)]
+        assert list(bitmap.leaves()) == leaves
+
+
+def test_invalid_data_raises_value_error():
+    builder, ff_map = _circuit()
+    data = dumps(builder, ff_map)
+    with pytest.raises(ValueError):
+        loads_builder(b'XXXX' + data[4:])
+    with pytest.raises(ValueError):
+        loads_netlist(data[:-1])
+    bad = to_dict(builder)
+    bad["gates"][0] = "XNOR"
+    with pytest.raises(ValueError):
+        from_dict(bad)
+
+
+def test_malformed_json_raises_value_error(tmp_path):
+    builder, ff_map = _circuit(num_levels=2)
+    good = to_dict(builder, ff_map)
+    broken = []
+    for key in ("levels", "gates", "leaves"):
+        bad = json.loads(json.dumps(good))
+        del bad[key]
+        broken.append(bad)
+    for key in ("path", "position", "state"):
+        bad = json.loads(json.dumps(good))
+        del bad["flipflops"][0][key]
+        broken.append(bad)
+    for levels in ("2", 2.0, 0, None, True):
+        bad = json.loads(json.dumps(good))
+        bad["levels"] = levels
+        broken.append(bad)
+    bad = json.loads(json.dumps(good))
+    bad["gates"] = ["AND", ["OR"]]
+    broken.append(bad)
+    bad = json.loads(json.dumps(good))
+    bad["gates"] = ["AND"]
+    broken.append(bad)
+    broken.append([])
+    for data in broken:
+        with pytest.raises(ValueError):
+            from_dict(data)
+    (tmp_path / "bad.json").write_text(json.dumps(broken[0]))
+    with pytest.raises(ValueError):
+        load_json(tmp_path / "bad.json")
+
+
+def test_invalid_flipflops_raise_value_error():
+    builder, ff_map = _circuit(num_levels=2)
+    data = bytearray(dumps(builder, {'L': ff_map['L']}))
+    # Primer flip-flop: índice de heap (u32), posición (u8), estado (u8) después de los opcodes
+    start = 12 + builder.num_levels
+    for heap, state in ((0, 1), (2 ** 3, 1), (2, 2)):
+        bad = bytearray(data)
+        bad[start:start + 4] = heap.to_bytes(4, 'little')
+        bad[start + 5] = state
+        with pytest.raises(ValueError):
+            loads_builder(bytes(bad))
+        with pytest.raises(ValueError):
+            loads_netlist(bytes(bad))
+    for entry in ({"path": "LLL", "position": "input", "state": 0},
+                  {"path": "L", "position": "input", "state": 2},
+                  {"path": "L", "position": "input", "state": "1"}):
+        bad = to_dict(builder)
+        bad["flipflops"] = [entry]
+        with pytest.raises(ValueError):
+            from_dict(bad)
+
+
+def test_leaf_bitmap_close_releases_bitmap_view(tmp_path):
+    builder, _ = _circuit()
+    save(tmp_path / "c.bin", builder)
+    bitmap = LeafBitmap(tmp_path / "c.bin")
+    view = bitmap.bitmap()
+    assert bitmap.bitmap() is view
+    assert list(bitmap.leaves()) == [l.value for l in builder.get_leaves()]
+    bitmap.close()
+    with pytest.raises(ValueError):
+        view[0]
@@ -0,0 +1,50 @@
+import random
+
+from gates import AND, OR, NAND, NOR, XOR
+from tree import TreeBuilder
+from tree.evaluation import ShortCircuitStats, evaluate_short_circuit
+
+
+GATES = [AND, OR, NAND, NOR, XOR]
+
+
+def test_controlling_values():
+    assert AND.controlling_value == 0
+    assert NAND.controlling_value == 0
+    assert OR.controlling_value == 1
+    assert NOR.controlling_value == 1
+    assert XOR.controlling_value is None
+
+
+def test_short_circuit_matches_full_evaluation():
+    rng = random.Random(5)
+    for num_levels in range(1, 6):
+        for _ in range(20):
+            gate_types = [rng.choice(GATES) for _ in range(num_levels)]
+            builder = TreeBuilder(num_levels=num_levels, gate_types=gate_types)
+            root = builder.build()
+            for leaf in builder.get_leaves():
+                leaf.value = rng.randint(0, 1)
+            assert evaluate_short_circuit(root) == root.evaluate()
+
+
+def test_short_circuit_skips_right_subtree_and_counts():
+    builder = TreeBuilder(num_levels=3, gate_types=[AND, AND, AND])
+    root = builder.build()
+    # Hoja 0 en 0: el AND más bajo se corta y el 0 sube cortando cada nivel
+    stats = ShortCircuitStats()
+    assert evaluate_short_circuit(root, stats) == 0
+    assert stats.gates_evaluated == 3
+    assert stats.gates_skipped == 4
+    assert stats.leaves_skipped == 7
+    # Los nodos omitidos conservan su resultado anterior (None al no haberse evaluado nunca)
+    assert root.right.result is None
+
+
+def test_xor_never_skips():
+    builder = TreeBuilder(num_levels=2, gate_types=[XOR, XOR])
+    root = builder.build()
+    stats = ShortCircuitStats()
+    evaluate_short_circuit(root, stats)
+    assert stats.gates_skipped == 0
+    assert stats.gates_evaluated == 3
@@ -0,0 +1,90 @@
+import itertools
+import random
+
+import pytest
+
+from gates import AND, OR, NAND, NOR, XOR, FlipFlop
+from main import evaluate_with_flipflop, get_node_by_path
+from tree import TreeBuilder
+from tree.solver import iter_cubes, iter_solutions, solve
+
+
+GATES = [AND, OR, NAND, NOR, XOR]
+
+
+def _brute_force(builder, target, path, pinned, ff_map):
+    # Todas las asignaciones que producen target, evaluando cada una con el estado original
+    root = builder.build()
+    node = get_node_by_path(root, path)
+    states = {p: ff.value for p, (ff, _) in ff_map.items()}
+    relevant = {p[len(path):]: entry for p, entry in ff_map.items() if p.startswith(path)}
+    found = []
+    for leaves in itertools.product((0, 1), repeat=2 ** builder.num_levels):
+        if any(leaves[i] != v for i, v in pinned.items()):
+            continue
+        for leaf, value in zip(builder.get_leaves(), leaves):
+            leaf.value = value
+        for p, (ff, _) in ff_map.items():
+            ff.value = states[p]
+        if evaluate_with_flipflop(node, relevant) == target:
+            found.append(list(leaves))
+    for p, (ff, _) in ff_map.items():
+        ff.value = states[p]
+    return found
+
+
+def test_solutions_match_brute_force():
+    rng = random.Random(0)
+    for _ in range(150):
+        num_levels = rng.randint(1, 3)
+        builder = TreeBuilder(num_levels, [rng.choice(GATES) for _ in range(num_levels)])
+        num_inputs = 2 ** num_levels
+        pinned = {i: rng.randint(0, 1) for i in rng.sample(range(num_inputs), rng.randint(0, 3) % num_inputs)}
+        path = ''.join(rng.choice('LR') for _ in range(rng.randint(0, num_levels)))
+        ff_map = {}
+        for _ in range(rng.randint(0, 2)):
+            ff = FlipFlop()
+            ff.value = rng.randint(0, 1)
+            ff_path = ''.join(rng.choice('LR') for _ in range(rng.randint(0, num_levels)))
+            ff_map[ff_path] = (ff, rng.choice(['input', 'output']))
+        target = rng.randint(0, 1)
+
+        expected = _brute_force(builder, target, path, pinned, ff_map)
+        solutions = list(iter_solutions(builder, target, path, pinned, ff_map))
+        # Los cubos son disjuntos: no hay soluciones repetidas
+        assert len(solutions) == len(expected)
+        assert sorted(solutions) == sorted(expected)
+        one = solve(builder, target, path, pinned, ff_map)
+        assert (one is None) == (not expected)
+        assert one is None or one in expected
+
+
+def test_controlling_values_leave_leaves_free():
+    # Para que un AND de la raíz valga 0 basta con un 0 en la mitad izquierda
+    builder = TreeBuilder(2, [AND, OR])
+    cubes = list(iter_cubes(builder, 0))
+    assert cubes == [{0: 0, 1: 0}, {0: 0, 1: 1, 2: 0, 3: 0}, {0: 1, 2: 0, 3: 0}]
+    assert sum(2 ** (4 - len(cube)) for cube in cubes) == 16 - 9
+
+
+def test_large_tree_is_lazy():
+    # 2^12 hojas: una solución se encuentra sin recorrer el espacio de entradas
+    builder = TreeBuilder(12, [XOR, AND] * 6)
+    leaves = solve(builder, 1, pinned={0: 1, 4095: 0})
+    assert leaves is not None and leaves[0] == 1 and leaves[4095] == 0
+    # El nodo LLLLLLLLLLL es un AND sobre las hojas 0 y 1
+    assert list(iter_cubes(builder, 1, path='L' * 11)) == [{0: 1, 1: 1}]
+
+
+def test_unsatisfiable_and_invalid_arguments():
+    builder = TreeBuilder(1, [AND])
+    assert solve(builder, 1, pinned={0: 0}) is None
+    assert list(iter_solutions(TreeBuilder(1, [XOR]), 1, pinned={0: 1, 1: 1})) == []
+    with pytest.raises(ValueError):
+        solve(builder, 2)
+    with pytest.raises(ValueError):
+        solve(builder, 1, path='LLR')
+    with pytest.raises(IndexError):
+        solve(builder, 1, pinned={2: 0})
+    with pytest.raises(ValueError):
+        solve(TreeBuilder(1, [FlipFlop]), 1)
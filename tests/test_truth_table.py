@@ -0,0 +1,72 @@
+import io
+import itertools
+
+from gates import AND, OR, NAND, NOR, XOR
+from tree import TreeBuilder
+from tree.truth_table import iter_chunks, iter_rows, write_bitmap, write_csv
+
+
+def _referencia(builder, root):
+    n = 2 ** builder.num_levels
+    rows = {}
+    for bits in itertools.product([0, 1], repeat=n):
+        for leaf, v in zip(builder.get_leaves(), bits):
+            leaf.value = v
+        rows[bits] = root.evaluate()
+    return rows
+
+
+def test_binary_rows_match_reference():
+    builder = TreeBuilder(num_levels=3, gate_types=[XOR, NAND, OR])
+    root = builder.build()
+    expected = _referencia(builder, root)
+
+    rows = list(iter_rows(builder, 'binary'))
+    assert len(rows) == 256
+    assert [inputs for inputs, _ in rows] == list(itertools.product([0, 1], repeat=8))
+    assert dict(rows) == expected
+
+
+def test_gray_rows_change_one_leaf_and_match_reference():
+    builder = TreeBuilder(num_levels=2, gate_types=[NOR, AND])
+    root = builder.build()
+    expected = _referencia(builder, root)
+
+    rows = list(iter_rows(builder, 'gray'))
+    assert len(rows) == 16
+    for (a, _), (b, _) in zip(rows, rows[1:]):
+        assert sum(x != y for x, y in zip(a, b)) == 1
+    assert dict(rows) == expected
+
+
+def test_chunks_cover_all_rows():
+    builder = TreeBuilder(num_levels=3, gate_types=[AND, OR, XOR])
+    root = builder.build()
+    expected = _referencia(builder, root)
+
+    seen = 0
+    for base, count, outputs in iter_chunks(builder, chunk_bits=5):
+        assert count == 32
+        for k in range(count):
+            bits = tuple(int(c) for c in format(base + k, '08b'))
+            assert (outputs >> k) & 1 == expected[bits]
+        seen += count
+    assert seen == 256
+
+
+def test_write_csv_and_bitmap():
+    builder = TreeBuilder(num_levels=2, gate_types=[OR, AND])
+    root = builder.build()
+    expected = _referencia(builder, root)
+
+    out = io.StringIO()
+    assert write_csv(builder, out) == 16
+    lines = out.getvalue().splitlines()
+    assert lines[0] == "in0,in1,in2,in3,out"
+    assert lines[-1] == "1,1,1,1,1"
+
+    buf = io.BytesIO()
+    assert write_bitmap(builder, buf) == 2
+    bitmap = int.from_bytes(buf.getvalue(), 'little')
+    for row, bits in enumerate(itertools.product([0, 1], repeat=4)):
+        assert (bitmap >> row) & 1 == expected[bits]
@@ -2,5 +2,7 @@
 
 from tree.node import Nodo
 from tree.builder import TreeBuilder
+from tree.batch import BatchEvaluator, BatchResult
+from tree.netlist import Netlist
 
-__all__ = ['Nodo', 'TreeBuilder']
+__all__ = ['Nodo', 'TreeBuilder', 'BatchEvaluator', 'BatchResult', 'Netlist']
@@ -0,0 +1,231 @@
+#analytics.py
+#Este módulo calcula estadísticas exactas de las señales del circuito sin recorrer la tabla
+#de verdad: para cada nodo, cuántas combinaciones de sus hojas lo ponen en 1, la probabilidad
+#de que valga 1 (con entradas uniformes o con una probabilidad propia por hoja) y una
+#estimación de su actividad de conmutación.
+#
+#Como cada hoja alimenta una sola compuerta, los dos hijos de un nodo dependen de hojas
+#distintas y son independientes, así que basta combinar los resultados de los hijos con la
+#tabla de verdad de la compuerta, de las hojas hacia la raíz (programación dinámica):
+#    unos(nodo) = suma de tabla[a, b] * casos(izquierda = a) * casos(derecha = b)
+#    P(nodo = 1) = suma de tabla[a, b] * P(izquierda = a) * P(derecha = b)
+#Son O(compuertas) operaciones; las cuentas usan enteros de Python (precisión arbitraria) y
+#las probabilidades Fraction, así que los resultados son exactos para cualquier tamaño.
+#
+#La actividad de conmutación de un nodo es la probabilidad de que cambie de valor entre dos
+#vectores consecutivos independientes: 2 * p * (1 - p).
+#Si se indica un ff_map, cada Flip-Flop se considera con su estado almacenado actual, como en
+#el solver (tree.solver), es decir, las estadísticas describen el próximo ciclo.
+
+from fractions import Fraction
+from tree.builder import TreeBuilder
+from tree.evaluation import path_to_position
+from tree.netlist import _TABLES, heap_to_path, opcode_for
+from tree.solver import _flipflop_table
+from typing import Dict, List, Optional, Tuple
+
+
+class SignalStatistics:
+    """
+    Estadísticas de las señales de un circuito.
+
+    Attributes:
+        num_levels: Cantidad de niveles de compuertas
+        uniform: True si todas las hojas son equiprobables (hay cuentas exactas)
+        ones: Por nivel (ones[1] es la raíz, ones[num_levels + 1] las hojas), cantidad de
+              combinaciones de las hojas del subárbol de cada nodo que lo ponen en 1
+              (None si hay probabilidades por hoja)
+        probabilities: Por nivel, probabilidad de que cada nodo valga 1 (None si las
+                       entradas son uniformes; se calculan a partir de ones)
+    """
+
+    def __init__(self, num_levels: int, ones: Optional[List[List[int]]] = None,
+                 probabilities: Optional[List[List[Fraction]]] = None):
+        self.num_levels = num_levels
+        self.uniform = ones is not None
+        self.ones = ones
+        self.probabilities = probabilities
+
+    def _position(self, path: str) -> Tuple[int, int]:
+        level, index = path_to_position(path)
+        if level > self.num_levels + 1:
+            raise ValueError(f"La ruta {path!r} está fuera del árbol")
+        return level, index
+
+    def probability(self, path: str = '') -> Fraction:
+        """
+        Args:
+            path: Ruta L/R del nodo ('' es la raíz)
+        Raises:
+            ValueError: Si la ruta está fuera del árbol
+        Returns:
+            Probabilidad exacta de que el nodo valga 1
+        """
+        level, index = self._position(path)
+        if self.uniform:
+            return Fraction(self.ones[level][index], 2 ** 2 ** (self.num_levels + 1 - level))
+        return self.probabilities[level][index]
+
+    def count(self, path: str = '') -> int:
+        """
+        Args:
+            path: Ruta L/R del nodo ('' es la raíz)
+        Raises:
+            ValueError: Si la ruta está fuera del árbol o las hojas no son equiprobables
+        Returns:
+            Cantidad de combinaciones de todas las hojas del circuito que ponen el nodo en 1
+        """
+        if not self.uniform:
+            raise ValueError("Las cuentas solo están definidas con entradas uniformes")
+        level, index = self._position(path)
+        # Las hojas fuera del subárbol pueden tomar cualquier valor
+        return self.ones[level][index] << (2 ** self.num_levels - 2 ** (self.num_levels + 1 - level))
+
+    def activity(self, path: str = '') -> Fraction:
+        """
+        Args:
+            path: Ruta L/R del nodo ('' es la raíz)
+        Returns:
+            Probabilidad de que el nodo cambie entre dos vectores independientes, 2p(1 - p)
+        """
+        p = self.probability(path)
+        return 2 * p * (1 - p)
+
+    def total_activity(self) -> Fraction:
+        """Suma de la actividad de conmutación de todas las compuertas (sin las hojas)."""
+        total = Fraction(0)
+        for heap in range(1, 2 ** self.num_levels):
+            total += self.activity(heap_to_path(heap))
+        return total
+
+    def by_heap(self) -> Dict[int, Tuple[float, float]]:
+        """
+        Retorna las estadísticas de todos los nodos por índice de heap (como la netlist y la
+        interfaz), redondeadas a float para mostrarlas.
+
+        Returns:
+            Diccionario heap -> (probabilidad de 1, actividad de conmutación)
+        """
+        result = {}
+        for heap in range(1, 2 ** (self.num_levels + 1)):
+            path = heap_to_path(heap)
+            p = self.probability(path)
+            result[heap] = (float(p), float(2 * p * (1 - p)))
+        return result
+
+    def __repr__(self) -> str:
+        return f"SignalStatistics(niveles={self.num_levels}, P(raíz=1)={self.probability()})"
+
+
+def _node_tables(builder: TreeBuilder, ff_map: Optional[Dict[str, tuple]]):
+    # Tabla de cada nivel, tablas efectivas de los nodos con flip-flop y hojas forzadas a 1
+    level_tables = [_TABLES[opcode_for(gate_class)] for gate_class in builder.gate_types]
+    node_tables = {}
+    forced_leaves = set()
+    for path, (ff, position) in (ff_map or {}).items():
+        level, index = path_to_position(path)
+        if level > builder.num_levels + 1:
+            raise ValueError(f"Ruta de FlipFlop fuera del árbol: {path!r}")
+        state = 1 if ff.value else 0
+        if level == builder.num_levels + 1:
+            if position == 'input' and state:
+                forced_leaves.add(index)
+        else:
+            node_tables[(level, index)] = _flipflop_table(level_tables[level - 1], position, state)
+    return level_tables, node_tables, forced_leaves
+
+
+def signal_statistics(builder: TreeBuilder, biases: Optional[Dict[int, object]] = None,
+                      ff_map: Optional[Dict[str, tuple]] = None) -> SignalStatistics:
+    """
+    Calcula las estadísticas de todos los nodos en O(compuertas).
+
+    Args:
+        builder: TreeBuilder que describe el circuito (no requiere build())
+        biases: Diccionario índice de hoja -> probabilidad de que valga 1 (int, float,
+                Fraction o texto como '1/3'); las hojas ausentes valen 1/2
+        ff_map: Diccionario ruta -> (FlipFlop, posición) como el de la consola
+    Raises:
+        ValueError: Si alguna probabilidad está fuera de [0, 1], alguna ruta está fuera del
+                    árbol o algún nivel no es una compuerta combinacional
+        IndexError: Si alguna hoja de biases no existe
+    Returns:
+        SignalStatistics del circuito
+    """
+    num_levels = builder.num_levels
+    num_inputs = 2 ** num_levels
+    level_tables, node_tables, forced_leaves = _node_tables(builder, ff_map)
+
+    half = Fraction(1, 2)
+    leaf_p = None
+    if biases:
+        leaf_p = [half] * num_inputs
+        for index, value in biases.items():
+            if not 0 <= index < num_inputs:
+                raise IndexError(f"No existe la hoja {index}")
+            p = Fraction(value)
+            if not 0 <= p <= 1:
+                raise ValueError(f"Probabilidad fuera de [0, 1] para la hoja {index}: {value}")
+            leaf_p[index] = p
+        if all(p == half for p in leaf_p):
+            leaf_p = None
+
+    if leaf_p is None:
+        return SignalStatistics(
+            num_levels, ones=_count_ones(num_levels, level_tables, node_tables, forced_leaves)
+        )
+    for index in forced_leaves:
+        leaf_p[index] = Fraction(1)
+    return SignalStatistics(
+        num_levels, probabilities=_probabilities(num_levels, leaf_p, level_tables, node_tables)
+    )
+
+
+def _count_ones(num_levels: int, level_tables, node_tables, forced_leaves) -> List[List[int]]:
+    # ones[nivel][índice]; una hoja tiene 2 casos y vale 1 en uno (o en ambos si está forzada)
+    leaves = [2 if i in forced_leaves else 1 for i in range(2 ** num_levels)]
+    ones = [None] * (num_levels + 2)
+    ones[num_levels + 1] = leaves
+    current = leaves
+    cases = 2
+    for level in range(num_levels, 0, -1):
+        default = level_tables[level - 1]
+        result = []
+        for index in range(len(current) // 2):
+            table = node_tables.get((level, index), default)
+            l1, r1 = current[2 * index], current[2 * index + 1]
+            l0, r0 = cases - l1, cases - r1
+            result.append(
+                (l0 * r0 if table[0] else 0) + (l0 * r1 if table[1] else 0)
+                + (l1 * r0 if table[2] else 0) + (l1 * r1 if table[3] else 0)
+            )
+        ones[level] = result
+        current = result
+        cases *= cases
+    return ones
+
+
+def _probabilities(num_levels: int, leaf_p: List[Fraction], level_tables, node_tables) -> List[List[Fraction]]:
+    probabilities = [None] * (num_levels + 2)
+    probabilities[num_levels + 1] = leaf_p
+    current = leaf_p
+    for level in range(num_levels, 0, -1):
+        default = level_tables[level - 1]
+        result = []
+        for index in range(len(current) // 2):
+            table = node_tables.get((level, index), default)
+            l1, r1 = current[2 * index], current[2 * index + 1]
+            l0, r0 = 1 - l1, 1 - r1
+            p = Fraction(0)
+            if table[0]:
+                p += l0 * r0
+            if table[1]:
+                p += l0 * r1
+            if table[2]:
+                p += l1 * r0
+            if table[3]:
+                p += l1 * r1
+            result.append(p)
+        probabilities[level] = result
+        current = result
+    return probabilities
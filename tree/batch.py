@@ -0,0 +1,216 @@
+#batch.py
+#Este módulo implementa la evaluación por lotes (bit-paralela) de los circuitos construidos
+#con TreeBuilder. En lugar de recorrer el árbol una vez por cada vector de entrada, cada hoja
+#se representa como una "columna" empaquetada en un entero de Python: el bit k de la columna
+#es el valor de esa hoja en el vector k. Así cada compuerta se evalúa con una sola operación
+#bit a bit para todos los vectores del lote, nivel por nivel desde las hojas hasta la raíz.
+#El resultado coincide bit a bit con Nodo.evaluate sobre cada vector por separado.
+#Si se indican Flip-Flops (ff_map como el de la consola), cada vector se evalúa de forma
+#independiente partiendo del estado almacenado en cada FlipFlop, igual que una llamada a
+#evaluate_with_flipflop; el estado de los FlipFlop no se modifica.
+
+from gates.base import Compuerta
+from tree.builder import TreeBuilder
+from tree.evaluation import path_to_position
+from typing import Callable, Dict, List, Optional, Sequence, Tuple, Type
+
+
+_BIT_CHARS = bytes.maketrans(b'\x00\x01', b'01')
+
+
+def _bitwise_op(gate_class: Type[Compuerta]) -> Callable[[int, int, int], int]:
+    # Kernel vectorizado de la compuerta: operar_batch(A, B, mask) sobre columnas empaquetadas
+    gate = gate_class()
+    if gate.flip_flop or type(gate).operar_batch is Compuerta.operar_batch:
+        raise ValueError(
+            f"La compuerta {gate_class.__name__} no admite evaluación por lotes"
+        )
+    return gate.operar_batch
+
+
+def pack_vectors(vectors: Sequence[Sequence[int]], num_inputs: int) -> List[int]:
+    """
+    Empaqueta una lista de vectores de entrada en columnas, una por hoja.
+
+    Args:
+        vectors: Vectores de entrada, cada uno con num_inputs valores (0 o 1)
+        num_inputs: Cantidad de hojas del circuito
+    Raises:
+        ValueError: Si algún vector no tiene num_inputs valores
+    Returns:
+        Lista de num_inputs enteros; el bit k de la columna i es vectors[k][i]
+    """
+    for vector in vectors:
+        if len(vector) != num_inputs:
+            raise ValueError(
+                f"Se esperan vectores de {num_inputs} valores, "
+                f"se recibió uno de {len(vector)}"
+            )
+    if not vectors:
+        return [0] * num_inputs
+
+    columns = []
+    for column in zip(*vectors):
+        # El vector 0 debe quedar en el bit menos significativo
+        bits = bytes(int(v) for v in reversed(column)).translate(_BIT_CHARS)
+        columns.append(int(bits, 2))
+    return columns
+
+
+def unpack_column(column: int, count: int) -> List[int]:
+    """
+    Args:
+        column: Columna empaquetada
+        count: Cantidad de vectores representados en la columna
+    Returns:
+        Lista con el bit de cada vector, empezando por el vector 0
+    """
+    if count == 0:
+        return []
+    return [int(c) for c in reversed(format(column, f'0{count}b')[-count:])]
+
+
+class BatchResult:
+    """
+    Resultado de una evaluación por lotes.
+
+    Attributes:
+        output: Columna empaquetada con la salida de la raíz para cada vector
+        count: Cantidad de vectores evaluados
+        nodes: Columnas por nodo indexadas por (nivel, posición) si se pidieron,
+               con el mismo esquema de niveles que TreeBuilder (1 = raíz,
+               num_levels + 1 = hojas); None en caso contrario
+    """
+
+    def __init__(self, output: int, count: int, nodes: Optional[Dict[Tuple[int, int], int]] = None):
+        self.output = output
+        self.count = count
+        self.nodes = nodes
+
+    def outputs(self) -> List[int]:
+        """Retorna la salida de la raíz de cada vector como lista de 0/1."""
+        return unpack_column(self.output, self.count)
+
+    def column(self, level: int, index: int) -> int:
+        """
+        Args:
+            level: Nivel del nodo (1 = raíz)
+            index: Posición del nodo dentro del nivel, de izquierda a derecha
+        Raises:
+            ValueError: Si la evaluación no guardó las columnas por nodo
+        Returns:
+            Columna empaquetada del nodo
+        """
+        if self.nodes is None:
+            raise ValueError("La evaluación no guardó columnas por nodo (keep_nodes=False)")
+        return self.nodes[(level, index)]
+
+    def __repr__(self) -> str:
+        return f"BatchResult(count={self.count}, unos={bin(self.output).count('1')})"
+
+
+class BatchEvaluator:
+    """
+    Evaluador bit-paralelo para un circuito de TreeBuilder.
+    Solo depende de la cantidad de niveles, del tipo de compuerta de cada nivel y de
+    los Flip-Flops indicados, por lo que puede reutilizarse para cualquier cantidad de lotes.
+    """
+
+    def __init__(self, builder: TreeBuilder, ff_map: Optional[Dict[str, tuple]] = None):
+        """
+        Args:
+            builder: TreeBuilder que describe el circuito
+            ff_map: Diccionario ruta -> (FlipFlop, posición) como el de la consola;
+                    se usa el estado actual (FlipFlop.value) de cada uno
+        Raises:
+            ValueError: Si algún nivel usa una compuerta sin equivalente bit a bit
+        """
+        self.num_levels = builder.num_levels
+        self.num_inputs = 2 ** builder.num_levels
+        self._ops = [_bitwise_op(gate_class) for gate_class in builder.gate_types]
+        # Flip-flops por nivel: {nivel: {índice: (posición, estado)}}
+        self._ff_by_level: Dict[int, Dict[int, Tuple[str, int]]] = {}
+        for path, (ff, position) in (ff_map or {}).items():
+            level, index = path_to_position(path)
+            if level > self.num_levels + 1 or index >= 2 ** (level - 1):
+                raise ValueError(f"Ruta de FlipFlop fuera del árbol: {path!r}")
+            self._ff_by_level.setdefault(level, {})[index] = (position, int(ff.value))
+
+    def _apply_leaf_flipflops(self, current: List[int], mask: int):
+        # Q = S | (estado & ~R) con S = hoja y R = 0
+        for index, (position, state) in self._ff_by_level.get(self.num_levels + 1, {}).items():
+            if position == 'input' and state:
+                current[index] = mask
+
+    def _evaluate_level_with_flipflops(self, level_idx: int, children: List[int], mask: int) -> List[int]:
+        op = self._ops[level_idx]
+        flipflops = self._ff_by_level[level_idx + 1]
+        result = []
+        for index in range(len(children) // 2):
+            left, right = children[2 * index], children[2 * index + 1]
+            entry = flipflops.get(index)
+            if entry is not None and entry[0] == 'input':
+                # S = izquierda, R = derecha; la salida Q alimenta ambas entradas de la compuerta
+                q = left | ((mask if entry[1] else 0) & (right ^ mask))
+                left = right = q
+            out = op(left, right, mask)
+            if entry is not None and entry[0] == 'output':
+                out = out | (mask if entry[1] else 0)
+            result.append(out)
+        return result
+
+    def evaluate(self, columns: Sequence[int], count: int, keep_nodes: bool = False) -> BatchResult:
+        """
+        Evalúa un lote de vectores ya empaquetados en columnas.
+
+        Args:
+            columns: Una columna por hoja (ver pack_vectors)
+            count: Cantidad de vectores en el lote
+            keep_nodes: Si es True, guarda la columna de cada nodo en el resultado
+        Raises:
+            ValueError: Si la cantidad de columnas no coincide con la de hojas
+        Returns:
+            BatchResult con la columna de salida de la raíz
+        """
+        if len(columns) != self.num_inputs:
+            raise ValueError(
+                f"Se esperan {self.num_inputs} columnas, se recibieron {len(columns)}"
+            )
+        if count < 0:
+            raise ValueError("La cantidad de vectores no puede ser negativa")
+
+        mask = (1 << count) - 1
+        current = [column & mask for column in columns]
+        self._apply_leaf_flipflops(current, mask)
+        nodes = {} if keep_nodes else None
+        if keep_nodes:
+            for i, column in enumerate(current):
+                nodes[(self.num_levels + 1, i)] = column
+
+        for level_idx in range(self.num_levels - 1, -1, -1):
+            if level_idx + 1 in self._ff_by_level:
+                current = self._evaluate_level_with_flipflops(level_idx, current, mask)
+            else:
+                op = self._ops[level_idx]
+                current = [
+                    op(current[i], current[i + 1], mask)
+                    for i in range(0, len(current), 2)
+                ]
+            if keep_nodes:
+                for i, column in enumerate(current):
+                    nodes[(level_idx + 1, i)] = column
+
+        return BatchResult(current[0], count, nodes)
+
+    def evaluate_vectors(self, vectors: Sequence[Sequence[int]], keep_nodes: bool = False) -> BatchResult:
+        """
+        Empaqueta y evalúa una lista de vectores de entrada.
+
+        Args:
+            vectors: Vectores de entrada, uno por fila, con un valor por hoja
+            keep_nodes: Si es True, guarda la columna de cada nodo en el resultado
+        Returns:
+            BatchResult con la columna de salida de la raíz
+        """
+        columns = pack_vectors(vectors, self.num_inputs)
+        return self.evaluate(columns, len(vectors), keep_nodes=keep_nodes)
@@ -0,0 +1,562 @@
+#bdd.py
+#Este módulo implementa diagramas de decisión binaria reducidos y ordenados (ROBDD) para
+#responder preguntas sobre un circuito sin recorrer las 2^n combinaciones de entradas:
+#¿la salida puede valer 1?, ¿cuántas entradas dan 1?, ¿de qué hojas depende realmente?
+#
+#Un nodo del BDD es un entero: 0 y 1 son las terminales FALSO y VERDADERO, y cada nodo
+#interno guarda (variable, hijo bajo, hijo alto) en listas paralelas del administrador (BDD).
+#La tabla única (unique table) garantiza que cada función tenga un solo nodo (hash-consing),
+#así que dos funciones son iguales si y solo si sus nodos son el mismo entero.
+#Todas las operaciones se reducen a ITE (if-then-else), memorizado en una caché de tamaño
+#acotado; ITE se implementa con una pila explícita, sin recursión, para que los circuitos
+#con muchas hojas no choquen con el límite de recursión de Python.
+#
+#compile_circuit traduce un TreeBuilder (con el ff_map de la consola, si lo hay) a un BDD:
+#cada hoja es una variable y el estado almacenado de cada Flip-Flop es una variable extra.
+#El orden de las variables sigue el recorrido en orden del árbol (el estado de un flip-flop
+#se ubica junto al subárbol que alimenta), y como cada hoja alimenta una sola compuerta el
+#BDD resultante crece de forma lineal con la cantidad de hojas.
+#Con flip-flops el BDD describe un ciclo de reloj, con la misma semántica de
+#evaluate_with_flipflop: la salida y el próximo estado de cada flip-flop son funciones de las
+#hojas y del estado actual.
+
+from collections import OrderedDict
+from tree.builder import TreeBuilder
+from tree.evaluation import path_to_position
+from tree.netlist import OP_AND, OP_NAND, OP_NOR, OP_OR, _TABLES, opcode_for
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+
+FALSE = 0
+TRUE = 1
+
+# Marcas de la pila de ITE
+_EXPAND = 0
+_COMBINE = 1
+
+
+class BDD:
+    """
+    Administrador de ROBDD con una cantidad fija de variables (0 es la más alta del orden).
+
+    Attributes:
+        num_vars: Cantidad de variables
+        cache_size: Cantidad máxima de entradas de la caché de ITE
+        hits: Consultas de ITE resueltas desde la caché
+        misses: Consultas de ITE que requirieron expandir
+    """
+
+    def __init__(self, num_vars: int, cache_size: int = 1 << 18):
+        """
+        Args:
+            num_vars: Cantidad de variables
+            cache_size: Cantidad máxima de entradas de la caché de ITE (mayor que 0)
+        Raises:
+            ValueError: Si num_vars es negativo o cache_size no es positivo
+        """
+        if num_vars < 0:
+            raise ValueError("num_vars no puede ser negativo")
+        if cache_size <= 0:
+            raise ValueError("cache_size debe ser mayor que 0")
+        self.num_vars = num_vars
+        self.cache_size = cache_size
+        self.hits = 0
+        self.misses = 0
+        # Las terminales usan num_vars como variable, así quedan debajo de todas las demás
+        self._var: List[int] = [num_vars, num_vars]
+        self._low: List[int] = [FALSE, TRUE]
+        self._high: List[int] = [FALSE, TRUE]
+        self._unique: Dict[Tuple[int, int, int], int] = {}
+        self._cache: 'OrderedDict[Tuple[int, int, int], int]' = OrderedDict()
+
+    def __len__(self) -> int:
+        """Cantidad total de nodos creados (incluye las terminales)."""
+        return len(self._var)
+
+    def var(self, index: int) -> int:
+        """
+        Args:
+            index: Índice de la variable
+        Raises:
+            IndexError: Si la variable no existe
+        Returns:
+            Nodo de la función que vale la variable
+        """
+        if not 0 <= index < self.num_vars:
+            raise IndexError(f"No existe la variable {index}")
+        return self._mk(index, FALSE, TRUE)
+
+    def top_var(self, node: int) -> int:
+        """Variable del nodo (num_vars para las terminales)."""
+        return self._var[node]
+
+    def low(self, node: int) -> int:
+        """Hijo del nodo cuando su variable vale 0."""
+        return self._low[node]
+
+    def high(self, node: int) -> int:
+        """Hijo del nodo cuando su variable vale 1."""
+        return self._high[node]
+
+    def _mk(self, var: int, low: int, high: int) -> int:
+        # Regla de reducción: un nodo con ambos hijos iguales no aporta información
+        if low == high:
+            return low
+        key = (var, low, high)
+        node = self._unique.get(key)
+        if node is None:
+            node = len(self._var)
+            self._var.append(var)
+            self._low.append(low)
+            self._high.append(high)
+            self._unique[key] = node
+        return node
+
+    def ite(self, f: int, g: int, h: int) -> int:
+        """
+        Calcula if f then g else h.
+
+        Args:
+            f, g, h: Nodos del BDD
+        Returns:
+            Nodo resultante
+        """
+        var, low, high = self._var, self._low, self._high
+        cache = self._cache
+        results = []
+        stack = [(_EXPAND, f, g, h)]
+        while stack:
+            tag, f, g, h = stack.pop()
+            if tag == _COMBINE:
+                r_high = results.pop()
+                r_low = results.pop()
+                top, key = f, g
+                result = self._mk(top, r_low, r_high)
+                cache[key] = result
+                if len(cache) > self.cache_size:
+                    # Se descarta la entrada más antigua
+                    cache.popitem(last=False)
+                results.append(result)
+                continue
+
+            # Casos terminales
+            if f == TRUE or g == h:
+                results.append(g)
+                continue
+            if f == FALSE:
+                results.append(h)
+                continue
+            if g == TRUE and h == FALSE:
+                results.append(f)
+                continue
+
+            key = (f, g, h)
+            cached = cache.get(key)
+            if cached is not None:
+                self.hits += 1
+                results.append(cached)
+                continue
+            self.misses += 1
+
+            top = min(var[f], var[g], var[h])
+            f0, f1 = (low[f], high[f]) if var[f] == top else (f, f)
+            g0, g1 = (low[g], high[g]) if var[g] == top else (g, g)
+            h0, h1 = (low[h], high[h]) if var[h] == top else (h, h)
+            # La rama baja se procesa primero, así su resultado queda debajo en la pila
+            stack.append((_COMBINE, top, key, None))
+            stack.append((_EXPAND, f1, g1, h1))
+            stack.append((_EXPAND, f0, g0, h0))
+        return results[0]
+
+    def not_(self, f: int) -> int:
+        return self.ite(f, FALSE, TRUE)
+
+    def and_(self, f: int, g: int) -> int:
+        return self.ite(f, g, FALSE)
+
+    def or_(self, f: int, g: int) -> int:
+        return self.ite(f, TRUE, g)
+
+    def xor(self, f: int, g: int) -> int:
+        return self.ite(f, self.not_(g), g)
+
+    def apply(self, opcode: int, f: int, g: int) -> int:
+        """
+        Aplica la compuerta de opcode (ver tree.netlist) a dos funciones.
+
+        Args:
+            opcode: Opcode de la compuerta (OP_AND, OP_OR, OP_NAND, OP_NOR u OP_XOR)
+            f, g: Nodos de las entradas A y B
+        Returns:
+            Nodo de la salida de la compuerta
+        """
+        if opcode == OP_AND:
+            return self.and_(f, g)
+        if opcode == OP_OR:
+            return self.or_(f, g)
+        if opcode == OP_NAND:
+            return self.not_(self.and_(f, g))
+        if opcode == OP_NOR:
+            return self.not_(self.or_(f, g))
+        return self.xor(f, g)
+
+    def _reachable(self, f: int) -> List[int]:
+        # Los hijos siempre se crean antes que el padre, así que ordenar por número de nodo
+        # da un orden topológico (primero los hijos)
+        seen = set()
+        pending = [f]
+        while pending:
+            node = pending.pop()
+            if node in seen:
+                continue
+            seen.add(node)
+            if node > TRUE:
+                pending.append(self._low[node])
+                pending.append(self._high[node])
+        return sorted(seen)
+
+    def size(self, f: int) -> int:
+        """Cantidad de nodos alcanzables desde f (incluye las terminales)."""
+        return len(self._reachable(f))
+
+    def restrict(self, f: int, assignment: Dict[int, int]) -> int:
+        """
+        Fija el valor de algunas variables (cofactor).
+
+        Args:
+            f: Nodo del BDD
+            assignment: Diccionario variable -> valor (0 o 1)
+        Returns:
+            Nodo de la función restringida
+        """
+        if not assignment:
+            return f
+        var, low, high = self._var, self._low, self._high
+        result = {FALSE: FALSE, TRUE: TRUE}
+        for node in self._reachable(f):
+            if node <= TRUE:
+                continue
+            value = assignment.get(var[node])
+            if value is None:
+                result[node] = self._mk(var[node], result[low[node]], result[high[node]])
+            else:
+                result[node] = result[high[node]] if value else result[low[node]]
+        return result[f]
+
+    def flip(self, f: int, variables: Set[int]) -> int:
+        """
+        Reemplaza cada variable de variables por su negación (intercambia los hijos).
+
+        Args:
+            f: Nodo del BDD
+            variables: Variables a negar
+        Returns:
+            Nodo de la función con esas entradas invertidas
+        """
+        if not variables:
+            return f
+        var, low, high = self._var, self._low, self._high
+        result = {FALSE: FALSE, TRUE: TRUE}
+        for node in self._reachable(f):
+            if node <= TRUE:
+                continue
+            lo, hi = result[low[node]], result[high[node]]
+            if var[node] in variables:
+                lo, hi = hi, lo
+            result[node] = self._mk(var[node], lo, hi)
+        return result[f]
+
+    def evaluate(self, f: int, assignment) -> int:
+        """
+        Evalúa la función para una asignación completa recorriendo un solo camino.
+
+        Args:
+            f: Nodo del BDD
+            assignment: Secuencia o diccionario variable -> valor
+        Returns:
+            Valor de la función (0 o 1)
+        """
+        var, low, high = self._var, self._low, self._high
+        while f > TRUE:
+            f = high[f] if assignment[var[f]] else low[f]
+        return f
+
+    def sat_count(self, f: int) -> int:
+        """Cantidad de asignaciones de las num_vars variables que hacen verdadera a f."""
+        var, low, high = self._var, self._low, self._high
+        # count[n] = asignaciones de las variables desde var[n] en adelante
+        count = {FALSE: 0, TRUE: 1}
+        for node in self._reachable(f):
+            if node <= TRUE:
+                continue
+            v = var[node]
+            lo, hi = low[node], high[node]
+            count[node] = (count[lo] << (var[lo] - v - 1)) + (count[hi] << (var[hi] - v - 1))
+        return count[f] << var[f] if f != FALSE else 0
+
+    def support(self, f: int) -> Set[int]:
+        """Variables de las que f depende realmente."""
+        return {self._var[node] for node in self._reachable(f) if node > TRUE}
+
+    def pick(self, f: int) -> Optional[Dict[int, int]]:
+        """
+        Busca una asignación que haga verdadera a f.
+
+        Args:
+            f: Nodo del BDD
+        Returns:
+            Diccionario variable -> valor con las variables del camino elegido (las demás
+            pueden tomar cualquier valor) o None si f es insatisfacible
+        """
+        if f == FALSE:
+            return None
+        assignment = {}
+        while f > TRUE:
+            # En un BDD reducido todo nodo distinto de FALSO tiene un camino a VERDADERO
+            if self._low[f] != FALSE:
+                assignment[self._var[f]] = 0
+                f = self._low[f]
+            else:
+                assignment[self._var[f]] = 1
+                f = self._high[f]
+        return assignment
+
+    def stats(self) -> dict:
+        """Retorna el tamaño de las tablas y los contadores de la caché de ITE."""
+        total = self.hits + self.misses
+        return {
+            "nodes": len(self._var),
+            "cache_size": len(self._cache),
+            "cache_maxsize": self.cache_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
+
+    def __repr__(self) -> str:
+        return f"BDD(variables={self.num_vars}, nodos={len(self._var)})"
+
+
+class CircuitBDD:
+    """
+    Circuito compilado a BDD.
+
+    Attributes:
+        manager: Administrador BDD que contiene los nodos
+        output: Nodo de la salida de la raíz
+        num_inputs: Cantidad de hojas
+        leaf_vars: Variable de cada hoja
+        state_vars: Diccionario ruta -> variable del estado de cada flip-flop
+        next_state: Diccionario ruta -> nodo del estado del flip-flop después del ciclo
+        state: Diccionario ruta -> estado actual (tomado de FlipFlop.value al compilar)
+    """
+
+    def __init__(self, manager: BDD, output: int, num_inputs: int, leaf_vars: List[int],
+                 state_vars: Dict[str, int], next_state: Dict[str, int], state: Dict[str, int]):
+        self.manager = manager
+        self.output = output
+        self.num_inputs = num_inputs
+        self.leaf_vars = leaf_vars
+        self.state_vars = state_vars
+        self.next_state = next_state
+        self.state = state
+
+    @property
+    def size(self) -> int:
+        """Cantidad de nodos del BDD de la salida."""
+        return self.manager.size(self.output)
+
+    def _state_assignment(self, state: Optional[Dict[str, int]]) -> Dict[int, int]:
+        current = dict(self.state)
+        if state:
+            current.update({path.upper(): value for path, value in state.items()})
+        return {self.state_vars[path]: 1 if value else 0 for path, value in current.items()}
+
+    def _output_for(self, value: int, state: Optional[Dict[str, int]]) -> int:
+        f = self.manager.restrict(self.output, self._state_assignment(state))
+        return f if value else self.manager.not_(f)
+
+    def is_satisfiable(self, value: int = 1, state: Optional[Dict[str, int]] = None) -> bool:
+        """
+        Args:
+            value: Valor buscado en la salida
+            state: Estado de los flip-flops (por defecto, el estado actual)
+        Returns:
+            True si alguna combinación de hojas produce value en la salida
+        """
+        return self._output_for(value, state) != FALSE
+
+    def count(self, value: int = 1, state: Optional[Dict[str, int]] = None) -> int:
+        """
+        Args:
+            value: Valor buscado en la salida
+            state: Estado de los flip-flops (por defecto, el estado actual)
+        Returns:
+            Cantidad de combinaciones de hojas que producen value en la salida
+        """
+        f = self._output_for(value, state)
+        # La función restringida solo depende de las hojas; sat_count cuenta también las demás
+        # variables del administrador (estado y variables sobrantes si se comparte)
+        return self.manager.sat_count(f) >> (self.manager.num_vars - self.num_inputs)
+
+    def support(self) -> Tuple[List[int], List[str]]:
+        """
+        Returns:
+            Tupla (hojas, rutas de flip-flops) de las que la salida depende para algún estado
+        """
+        variables = self.manager.support(self.output)
+        leaves = [i for i, v in enumerate(self.leaf_vars) if v in variables]
+        paths = sorted(path for path, v in self.state_vars.items() if v in variables)
+        return leaves, paths
+
+    def _assignment(self, leaves: Sequence[int], state: Optional[Dict[str, int]]) -> Dict[int, int]:
+        if len(leaves) != self.num_inputs:
+            raise ValueError(f"Se esperan {self.num_inputs} hojas, se recibieron {len(leaves)}")
+        assignment = self._state_assignment(state)
+        for var, value in zip(self.leaf_vars, leaves):
+            assignment[var] = 1 if value else 0
+        return assignment
+
+    def evaluate(self, leaves: Sequence[int], state: Optional[Dict[str, int]] = None) -> int:
+        """
+        Args:
+            leaves: Valor de cada hoja
+            state: Estado de los flip-flops (por defecto, el estado actual)
+        Raises:
+            ValueError: Si la cantidad de hojas no coincide
+        Returns:
+            Salida de la raíz en ese ciclo
+        """
+        return self.manager.evaluate(self.output, self._assignment(leaves, state))
+
+    def step(self, leaves: Sequence[int], state: Optional[Dict[str, int]] = None) -> Tuple[int, Dict[str, int]]:
+        """
+        Args:
+            leaves: Valor de cada hoja
+            state: Estado de los flip-flops (por defecto, el estado actual)
+        Raises:
+            ValueError: Si la cantidad de hojas no coincide
+        Returns:
+            Tupla (salida de la raíz, próximo estado de cada flip-flop); self.state no cambia
+        """
+        assignment = self._assignment(leaves, state)
+        evaluate = self.manager.evaluate
+        next_state = {path: evaluate(node, assignment) for path, node in self.next_state.items()}
+        return evaluate(self.output, assignment), next_state
+
+    def pick(self, value: int = 1, state: Optional[Dict[str, int]] = None) -> Optional[List[int]]:
+        """
+        Args:
+            value: Valor buscado en la salida
+            state: Estado de los flip-flops (por defecto, el estado actual)
+        Returns:
+            Valores de las hojas que producen value (las hojas irrelevantes quedan en 0)
+            o None si no existe ninguna combinación
+        """
+        assignment = self.manager.pick(self._output_for(value, state))
+        if assignment is None:
+            return None
+        return [assignment.get(var, 0) for var in self.leaf_vars]
+
+    def __repr__(self) -> str:
+        return (
+            f"CircuitBDD(hojas={self.num_inputs}, flip_flops={len(self.state_vars)}, "
+            f"nodos={self.size})"
+        )
+
+
+def _variable_order(num_levels: int, ff_map: Dict[str, tuple]) -> Tuple[List[int], Dict[str, int]]:
+    # Clave de orden en el recorrido en orden del árbol: la hoja i va en 2i; el estado de un
+    # flip-flop de salida (o de entrada de una hoja) va justo después de su subárbol y el de un
+    # flip-flop de entrada de compuerta entre sus dos hijos; ante empates, el más profundo primero
+    keys = [((2 * i, 0), ('leaf', i)) for i in range(2 ** num_levels)]
+    for path, (_, position) in ff_map.items():
+        level, index = path_to_position(path)
+        span = 2 ** (num_levels + 1 - level)
+        first = index * span
+        if level == num_levels + 1 and position != 'input':
+            continue
+        if position == 'input' and level <= num_levels:
+            boundary = first + span // 2
+        else:
+            boundary = first + span
+        keys.append(((2 * boundary - 1, -level), ('ff', path)))
+    keys.sort()
+
+    leaf_vars = [0] * 2 ** num_levels
+    state_vars = {}
+    for var, (_, (kind, item)) in enumerate(keys):
+        if kind == 'leaf':
+            leaf_vars[item] = var
+        else:
+            state_vars[item] = var
+    return leaf_vars, state_vars
+
+
+def compile_circuit(builder: TreeBuilder, ff_map: Optional[Dict[str, tuple]] = None,
+                    manager: Optional[BDD] = None) -> CircuitBDD:
+    """
+    Compila el circuito de builder a BDD. Sin flip-flops la variable i es la hoja i, así
+    que dos circuitos con la misma cantidad de niveles pueden compartir un administrador.
+
+    Args:
+        builder: TreeBuilder que describe el circuito (no requiere build())
+        ff_map: Diccionario ruta -> (FlipFlop, posición) como el de la consola; un
+                flip-flop en la salida de una hoja se ignora, como en evaluate_with_flipflop
+        manager: Administrador BDD a reutilizar (se crea uno si es None)
+    Raises:
+        ValueError: Si algún nivel no es una compuerta combinacional, alguna ruta está fuera
+                    del árbol o el administrador no tiene suficientes variables
+    Returns:
+        CircuitBDD del circuito
+    """
+    num_levels = builder.num_levels
+    opcodes = [opcode_for(gate_class) for gate_class in builder.gate_types]
+    ff_map = {path.upper(): entry for path, entry in (ff_map or {}).items()}
+    ff_by_level: Dict[int, Dict[int, str]] = {}
+    for path in ff_map:
+        level, index = path_to_position(path)
+        if level > num_levels + 1:
+            raise ValueError(f"Ruta de FlipFlop fuera del árbol: {path!r}")
+        ff_by_level.setdefault(level, {})[index] = path
+
+    leaf_vars, state_vars = _variable_order(num_levels, ff_map)
+    num_vars = len(leaf_vars) + len(state_vars)
+    if manager is None:
+        manager = BDD(num_vars)
+    elif manager.num_vars < num_vars:
+        raise ValueError(f"El administrador tiene {manager.num_vars} variables, se necesitan {num_vars}")
+
+    next_state = {}
+    current = [manager.var(v) for v in leaf_vars]
+
+    # Flip-flops en la entrada de las hojas: S = hoja, R = 0
+    for index, path in ff_by_level.get(num_levels + 1, {}).items():
+        if ff_map[path][1] == 'input':
+            current[index] = manager.or_(current[index], manager.var(state_vars[path]))
+            next_state[path] = current[index]
+
+    for level_idx in range(num_levels - 1, -1, -1):
+        opcode = opcodes[level_idx]
+        flipflops = ff_by_level.get(level_idx + 1, {})
+        result = []
+        for index in range(len(current) // 2):
+            left, right = current[2 * index], current[2 * index + 1]
+            path = flipflops.get(index)
+            position = ff_map[path][1] if path is not None else None
+            if position == 'input':
+                # Q = S | (estado & ~R), con S = izquierda y R = derecha; Q alimenta ambas entradas
+                state = manager.var(state_vars[path])
+                q = manager.or_(left, manager.and_(state, manager.not_(right)))
+                next_state[path] = q
+                table = _TABLES[opcode]
+                out = manager.ite(q, TRUE if table[3] else FALSE, TRUE if table[0] else FALSE)
+            else:
+                out = manager.apply(opcode, left, right)
+            if position == 'output':
+                out = manager.or_(out, manager.var(state_vars[path]))
+                next_state[path] = out
+            result.append(out)
+        current = result
+
+    state = {path: 1 if ff_map[path][0].value else 0 for path in state_vars}
+    return CircuitBDD(manager, current[0], len(leaf_vars), leaf_vars, state_vars, next_state, state)
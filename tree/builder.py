@@ -1,11 +1,15 @@
 #Este módulo implementa la clase TreeBuilder, encargada de construir automáticamente 
 #el árbol binario perfecto que representa el circuito lógico del proyecto.
 #Su función es generar la estructura completa del circuito a partir de la cantidad de niveles 
-#de compuertas (máximo 6) y los tipos de compuertas definidos para cada nivel, 
+#de compuertas y los tipos de compuertas definidos para cada nivel, 
 #asegurando que todas las compuertas de un mismo nivel sean homogéneas 
 #y que se cumpla la fórmula teórica de cantidad de nodos por nivel.
 #Además, permite obtener estadísticas estructurales del árbol y verificar que
 #la construcción respete la relación matemática esperada. (TENGO SUEÑOOOOOOOOOOOOOOOOOOOOO)
+#El motor no limita la cantidad de niveles: build() crea un Nodo por elemento (adecuado para
+#los árboles que se muestran en pantalla), mientras que compile() genera directamente la
+#netlist basada en arreglos, que escala a 20+ niveles y crea Nodo solo bajo demanda.
+#El máximo de 6 niveles es una política de visualización de la consola y la interfaz.
 
 
 from tree.node import Nodo
@@ -17,14 +21,12 @@ class TreeBuilder:
     def __init__(self, num_levels: int, gate_types: List[Type[Compuerta]]):
         """
         Args:
-            num_levels: Cantidad de niveles de compuertas (máximo 6)
+            num_levels: Cantidad de niveles de compuertas (mínimo 1)
             gate_types: Lista de tipos de compuertas por nivel
                         Ejemplo: [AND, OR, NAND] para 3 niveles
         Raises:
-            ValueError: Si num_levels > 6 o len(gate_types) != num_levels
+            ValueError: Si num_levels < 1 o len(gate_types) != num_levels
         """
-        if num_levels > 6:
-            raise ValueError("Máximo 6 niveles de compuertas permitidos")
         if num_levels < 1:
             raise ValueError("Mínimo 1 nivel de compuertas")
         if len(gate_types) != num_levels:
@@ -38,6 +40,11 @@ class TreeBuilder:
         self._nodes_by_level = {}
 
     def build(self) -> Nodo:
+        # El árbol anterior se descarta: se libera el plan de evaluación guardado en su raíz
+        previous = self._nodes_by_level.get(1)
+        if previous:
+            previous[0]._level_plan = None
+
         total_leaves = 2 ** self.num_levels
         leaves = [Nodo(value=0) for _ in range(total_leaves)]
         # Guardar hojas en el nivel num_levels + 1 (las compuertas ocupan niveles 1..num_levels)
@@ -68,6 +75,19 @@ class TreeBuilder:
         root = current_level_nodes[0]
         return root
 
+    def compile(self):
+        """
+        Compila el circuito a una netlist plana basada en arreglos.
+        Si build() ya fue llamado, la netlist conserva el mapeo hacia los Nodo
+        y copia los valores actuales de las hojas. No requiere build(): para árboles
+        grandes es la forma recomendada de construir el circuito, y los Nodo se
+        obtienen bajo demanda con Netlist.node() o Netlist.path_nodes().
+        Returns:
+            Netlist equivalente al árbol
+        """
+        from tree.netlist import Netlist
+        return Netlist.from_builder(self)
+
     def get_statistics(self) -> dict:
         if not self._nodes_by_level:
             raise ValueError("Primero debe llamar a build()")
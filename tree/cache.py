@@ -0,0 +1,163 @@
+#cache.py
+#Este módulo implementa una caché opcional para la evaluación del árbol lógico.
+#Cada nodo interno depende únicamente de las hojas de su subárbol (un rango contiguo de hojas),
+#así que su salida puede memorizarse con la clave (nivel, posición, bits de su rango de hojas).
+#En barridos donde una parte de las entradas se mantiene fija (por ejemplo, la mitad izquierda
+#constante mientras la derecha cuenta), los subárboles repetidos se resuelven con una sola consulta.
+#Los subárboles con estado (que contienen algún Flip-Flop) nunca se guardan en la caché,
+#porque su salida depende también del estado almacenado y no solo de las hojas.
+#La caché tiene un tamaño máximo con desalojo LRU y contadores de aciertos y fallos.
+
+from collections import OrderedDict
+from gates.flipflop import FlipFlop
+from tree.builder import TreeBuilder
+from tree.evaluation import evaluate_gate, evaluate_leaf, ff_positions
+from tree.node import Nodo
+from typing import Dict, Optional, Set, Tuple
+
+_BIT_CHARS = bytes.maketrans(b'\x00\x01', b'01')
+
+
+class SubtreeCache:
+    """
+    Caché LRU de salidas de subárboles, asociada a un circuito.
+    Si se evalúa un circuito con otras compuertas por nivel, la caché se vacía.
+
+    Attributes:
+        maxsize: Cantidad máxima de entradas
+        hits: Consultas resueltas desde la caché
+        misses: Consultas que requirieron evaluar el subárbol
+        evictions: Entradas desalojadas por falta de espacio
+    """
+
+    def __init__(self, maxsize: int = 4096):
+        """
+        Args:
+            maxsize: Cantidad máxima de entradas (mayor que 0)
+        Raises:
+            ValueError: Si maxsize no es positivo
+        """
+        if maxsize <= 0:
+            raise ValueError("maxsize debe ser mayor que 0")
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: 'OrderedDict[Tuple[int, int, int], int]' = OrderedDict()
+        self._signature = None
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Tuple[int, int, int]) -> bool:
+        return key in self._entries
+
+    def get(self, key: Tuple[int, int, int]) -> Optional[int]:
+        """
+        Args:
+            key: Tupla (nivel, posición, bits del rango de hojas)
+        Returns:
+            Salida memorizada o None si no está en la caché
+        """
+        value = self._entries.get(key)
+        if value is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key: Tuple[int, int, int], value: int):
+        """
+        Guarda la salida de un subárbol, desalojando la entrada usada hace más tiempo
+        si la caché está llena.
+
+        Args:
+            key: Tupla (nivel, posición, bits del rango de hojas)
+            value: Salida del subárbol
+        """
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self):
+        """Vacía la caché y reinicia los contadores."""
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def stats(self) -> dict:
+        """Retorna los contadores de la caché."""
+        total = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
+
+    def evaluate(self, builder: TreeBuilder, ff_map: Optional[Dict[str, tuple]] = None) -> int:
+        """
+        Evalúa el árbol construido por builder usando la caché. Sin ff_map equivale a
+        Nodo.evaluate sobre la raíz; con ff_map equivale a evaluate_with_flipflop.
+        Los nodos internos de un subárbol resuelto desde la caché conservan su result anterior.
+
+        Args:
+            builder: TreeBuilder sobre el que ya se llamó build()
+            ff_map: Diccionario ruta -> (FlipFlop, posición) como el de la consola
+        Returns:
+            Salida de la raíz
+        """
+        leaves = builder.get_leaves()
+        signature = tuple(builder.gate_types)
+        if signature != self._signature:
+            self.clear()
+            self._signature = signature
+
+        ff = ff_positions(ff_map or {})
+        # Los subárboles con estado son los ancestros (inclusive) de cada flip-flop
+        stateful: Set[Tuple[int, int]] = set()
+        for level, index in ff:
+            while level >= 1:
+                stateful.add((level, index))
+                level, index = level - 1, index // 2
+        # Un nivel de compuertas con estado (p.ej. FlipFlop) vuelve con estado todo lo que está encima
+        stateful_level = max(
+            (level for level, gate_class in enumerate(builder.gate_types, start=1)
+             if issubclass(gate_class, FlipFlop)),
+            default=0
+        )
+
+        bits = int(bytes(int(leaf.value) for leaf in reversed(leaves)).translate(_BIT_CHARS), 2)
+        context = (builder.num_levels + 1, bits, ff, stateful, stateful_level)
+        return self._evaluate(builder._nodes_by_level[1][0], 1, 0, context)
+
+    def _evaluate(self, node: Nodo, level: int, index: int, context) -> int:
+        leaf_level, bits, ff, stateful, stateful_level = context
+        ff_entry = ff.get((level, index))
+        if level == leaf_level:
+            return evaluate_leaf(node, ff_entry)
+
+        cacheable = level > stateful_level and (level, index) not in stateful
+        if cacheable:
+            width = 2 ** (leaf_level - level)
+            key = (level, index, (bits >> (index * width)) & ((1 << width) - 1))
+            cached = self.get(key)
+            if cached is not None:
+                node.result = cached
+                return cached
+
+        left_val = self._evaluate(node.left, level + 1, 2 * index, context)
+        right_val = self._evaluate(node.right, level + 1, 2 * index + 1, context)
+        result = evaluate_gate(node, left_val, right_val, ff_entry)
+        if cacheable:
+            self.put(key, result)
+        return result
+
+    def __repr__(self) -> str:
+        return f"SubtreeCache(size={len(self._entries)}, hits={self.hits}, misses={self.misses})"
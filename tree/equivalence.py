@@ -0,0 +1,128 @@
+#equivalence.py
+#Este módulo verifica si dos configuraciones de compuertas por nivel (por ejemplo
+#[NAND, NAND] y [OR, AND] con algunas entradas invertidas) calculan la misma función.
+#Se hace en dos etapas:
+#  1. Simulación aleatoria bit-paralela (BatchEvaluator): se evalúan miles de vectores al
+#     azar con una operación por compuerta; si las salidas difieren en algún bit, ese vector
+#     es el contraejemplo. La mayoría de los pares distintos se descartan aquí.
+#  2. Verificación exacta con BDD (tree.bdd): ambos circuitos se compilan en el mismo
+#     administrador; son equivalentes si y solo si sus nodos de salida coinciden, y si no,
+#     cualquier asignación del XOR de ambas salidas es un contraejemplo.
+#Como los árboles de TreeBuilder producen BDD de tamaño lineal, ambas etapas escalan con la
+#cantidad de hojas y no con 2^hojas.
+
+import random
+from tree.batch import BatchEvaluator
+from tree.bdd import BDD, compile_circuit
+from tree.builder import TreeBuilder
+from typing import Iterable, List, Optional, Union
+
+Inversion = Union[bool, Iterable[int], None]
+
+
+class EquivalenceResult:
+    """
+    Resultado de una verificación de equivalencia.
+
+    Attributes:
+        equivalent: True si ambos circuitos calculan la misma función
+        counterexample: Valores de las hojas para los que las salidas difieren (None si son
+                        equivalentes)
+        method: 'simulation' si el contraejemplo salió de la simulación aleatoria o 'bdd'
+                si la respuesta es de la verificación exacta
+        outputs: Tupla (salida de a, salida de b) para el contraejemplo
+    """
+
+    def __init__(self, equivalent: bool, method: str, counterexample: Optional[List[int]] = None,
+                 outputs: Optional[tuple] = None):
+        self.equivalent = equivalent
+        self.method = method
+        self.counterexample = counterexample
+        self.outputs = outputs
+
+    def __bool__(self) -> bool:
+        return self.equivalent
+
+    def __repr__(self) -> str:
+        if self.equivalent:
+            return f"EquivalenceResult(equivalentes, método={self.method})"
+        return (
+            f"EquivalenceResult(distintos, método={self.method}, "
+            f"contraejemplo={''.join(map(str, self.counterexample))})"
+        )
+
+
+def _inverted_leaves(inverted: Inversion, num_inputs: int) -> set:
+    if inverted is True:
+        return set(range(num_inputs))
+    if not inverted:
+        return set()
+    leaves = set(inverted)
+    for index in leaves:
+        if not 0 <= index < num_inputs:
+            raise IndexError(f"No existe la hoja {index}")
+    return leaves
+
+
+def check_equivalence(a: TreeBuilder, b: TreeBuilder, invert_a: Inversion = None,
+                      invert_b: Inversion = None, vectors: int = 4096,
+                      seed: Optional[int] = None) -> EquivalenceResult:
+    """
+    Verifica si dos circuitos combinacionales calculan la misma función.
+
+    Args:
+        a: TreeBuilder del primer circuito (no requiere build())
+        b: TreeBuilder del segundo circuito
+        invert_a: Hojas de a que se invierten antes de entrar al circuito (True = todas)
+        invert_b: Hojas de b que se invierten antes de entrar al circuito (True = todas)
+        vectors: Cantidad de vectores aleatorios de la etapa de simulación (0 la omite)
+        seed: Semilla de los vectores aleatorios
+    Raises:
+        ValueError: Si los circuitos no tienen la misma cantidad de hojas o algún nivel
+                    no es una compuerta combinacional
+        IndexError: Si alguna hoja a invertir no existe
+    Returns:
+        EquivalenceResult
+    """
+    if a.num_levels != b.num_levels:
+        raise ValueError(
+            f"Los circuitos deben tener la misma cantidad de niveles ({a.num_levels} y {b.num_levels})"
+        )
+    num_inputs = 2 ** a.num_levels
+    inverted_a = _inverted_leaves(invert_a, num_inputs)
+    inverted_b = _inverted_leaves(invert_b, num_inputs)
+
+    if vectors > 0:
+        result = _simulate(a, b, inverted_a, inverted_b, num_inputs, vectors, seed)
+        if result is not None:
+            return result
+
+    manager = BDD(num_inputs)
+    out_a = manager.flip(compile_circuit(a, manager=manager).output, inverted_a)
+    out_b = manager.flip(compile_circuit(b, manager=manager).output, inverted_b)
+    if out_a == out_b:
+        return EquivalenceResult(True, 'bdd')
+    assignment = manager.pick(manager.xor(out_a, out_b))
+    counterexample = [assignment.get(i, 0) for i in range(num_inputs)]
+    return EquivalenceResult(
+        False, 'bdd', counterexample,
+        (manager.evaluate(out_a, counterexample), manager.evaluate(out_b, counterexample))
+    )
+
+
+def _simulate(a: TreeBuilder, b: TreeBuilder, inverted_a: set, inverted_b: set,
+              num_inputs: int, vectors: int, seed: Optional[int]) -> Optional[EquivalenceResult]:
+    # Busca un vector que distinga ambos circuitos; None si todos coinciden
+    rng = random.Random(seed)
+    mask = (1 << vectors) - 1
+    columns = [rng.getrandbits(vectors) for _ in range(num_inputs)]
+    columns_a = [c ^ mask if i in inverted_a else c for i, c in enumerate(columns)]
+    columns_b = [c ^ mask if i in inverted_b else c for i, c in enumerate(columns)]
+    out_a = BatchEvaluator(a).evaluate(columns_a, vectors).output
+    out_b = BatchEvaluator(b).evaluate(columns_b, vectors).output
+    diff = out_a ^ out_b
+    if not diff:
+        return None
+    k = (diff & -diff).bit_length() - 1
+    counterexample = [(c >> k) & 1 for c in columns]
+    return EquivalenceResult(False, 'simulation', counterexample, ((out_a >> k) & 1, (out_b >> k) & 1))
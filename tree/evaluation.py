@@ -0,0 +1,400 @@
+#evaluation.py
+#Este módulo reúne la lógica de evaluación de un nodo individual cuando puede tener un
+#Flip-Flop SR asociado en su entrada o en su salida. Los evaluadores del proyecto
+#(evaluate_with_flipflop en main.py, la evaluación incremental, etc.) comparten estas
+#funciones para que todos apliquen exactamente la misma semántica de flip-flops.
+#Un "ff_entry" es la tupla (FlipFlop, 'input' | 'output') que la consola guarda en ff_map
+#para cada ruta L/R.
+#También incluye modos alternativos de evaluación del árbol, como la evaluación con
+#cortocircuito basada en el valor controlante de cada compuerta, y la evaluación iterativa
+#por niveles (de las hojas hacia la raíz), que no usa recursión ni construye rutas L/R
+#y por eso sirve para árboles de cualquier profundidad. LevelPlan guarda esa evaluación ya
+#armada (pasos, tablas de verdad y flip-flops) para reutilizarla entre llamadas.
+
+from tree.node import Nodo
+from tree.netlist import OPCODES, _TABLES, path_to_heap
+from typing import Dict, List, Optional, Tuple
+
+# Tabla de verdad (ver tree.netlist) por clase exacta de compuerta combinacional
+_GATE_TABLES = {gate_class: _TABLES[opcode] for gate_class, opcode in OPCODES.items()}
+# Tablas en uso; queda vacío mientras las tablas están desactivadas (use_truth_tables)
+_TABLE_BY_CLASS = _GATE_TABLES
+
+
+def use_truth_tables(enabled: bool = True) -> bool:
+    """
+    Activa o desactiva las tablas de verdad de evaluate_levels y de los LevelPlan.
+    Desactivadas, cada compuerta se evalúa con operar (tree.instrumentation lo usa para
+    contar todas las llamadas); los planes existentes se rearman en su próxima evaluación.
+
+    Args:
+        enabled: True para usar las tablas
+    Returns:
+        Si las tablas estaban activadas antes de la llamada
+    """
+    global _TABLE_BY_CLASS
+    previous = _TABLE_BY_CLASS is _GATE_TABLES
+    if enabled != previous:
+        _TABLE_BY_CLASS = _GATE_TABLES if enabled else {}
+    return previous
+
+
+def evaluate_leaf(node: Nodo, ff_entry: Optional[tuple] = None) -> int:
+    """
+    Evalúa una hoja, procesando el flip-flop de su entrada si existe.
+
+    Args:
+        node: Nodo hoja
+        ff_entry: Tupla (FlipFlop, posición) o None
+    Returns:
+        Valor resultante de la hoja (también queda en node.result)
+    """
+    val = int(node.value)
+
+    # Si existe un flip-flop en la entrada de esta hoja, se procesa antes de devolver el valor
+    if ff_entry is not None and ff_entry[1] == 'input':
+        out = ff_entry[0].operar(val, 0)
+        val = out[0] if isinstance(out, tuple) else int(out)
+
+    node.result = val
+    return val
+
+
+def evaluate_gate(node: Nodo, left_val: int, right_val: int, ff_entry: Optional[tuple] = None) -> int:
+    """
+    Evalúa la compuerta de un nodo interno a partir de los valores de sus hijos,
+    procesando el flip-flop de su entrada o salida si existe.
+
+    Args:
+        node: Nodo interno
+        left_val: Valor del hijo izquierdo
+        right_val: Valor del hijo derecho
+        ff_entry: Tupla (FlipFlop, posición) o None
+    Returns:
+        Salida del nodo (también queda en node.result)
+    """
+    # Si hay un flip-flop en la entrada del nodo, procesa antes de la compuerta
+    if ff_entry is not None and ff_entry[1] == 'input':
+        out = ff_entry[0].operar(left_val, right_val)
+        if isinstance(out, tuple):
+            left_val = right_val = out[0]
+        else:
+            left_val = right_val = int(out)
+
+    # Se ejecuta la compuerta lógica asociada al nodo
+    gate_out = node.gate.operar(int(left_val), int(right_val))
+
+    # Si hay un flip-flop en la salida del nodo, se procesa después de la compuerta
+    if ff_entry is not None and ff_entry[1] == 'output':
+        out = ff_entry[0].operar(int(gate_out), 0)
+        gate_out = out[0] if isinstance(out, tuple) else int(out)
+
+    node.result = int(gate_out) if not isinstance(gate_out, tuple) else int(gate_out[0])
+    return node.result
+
+
+def path_to_position(path: str) -> Tuple[int, int]:
+    """
+    Convierte una ruta L/R a la posición (nivel, índice) usada por TreeBuilder.
+
+    Args:
+        path: Ruta desde la raíz ('' es la raíz)
+    Returns:
+        Tupla (nivel, índice dentro del nivel); la raíz es (1, 0)
+    """
+    heap = path_to_heap(path)
+    level = heap.bit_length()
+    return level, heap - 2 ** (level - 1)
+
+
+def ff_positions(ff_map: Dict[str, tuple]) -> Dict[Tuple[int, int], tuple]:
+    """
+    Args:
+        ff_map: Diccionario ruta -> (FlipFlop, posición) como el de la consola
+    Returns:
+        Diccionario (nivel, índice) -> (FlipFlop, posición)
+    """
+    return {path_to_position(path): entry for path, entry in ff_map.items()}
+
+
+def collect_levels(root: Nodo) -> List[List[Nodo]]:
+    """
+    Recorre el árbol en anchura sin recursión.
+
+    Args:
+        root: Raíz del árbol (o de un subárbol) perfecto
+    Returns:
+        Lista de niveles; el primero es [root] y el último son las hojas
+    """
+    levels = [[root]]
+    while levels[-1][0].left is not None:
+        levels.append([child for node in levels[-1] for child in (node.left, node.right)])
+    return levels
+
+
+def builder_levels(builder) -> List[List[Nodo]]:
+    """
+    Args:
+        builder: TreeBuilder sobre el que ya se llamó build()
+    Returns:
+        Los niveles guardados por el builder, de la raíz a las hojas
+    """
+    return [builder._nodes_by_level[level] for level in range(1, builder.num_levels + 2)]
+
+
+def _level_table(nodes: List[Nodo]) -> Optional[bytes]:
+    # Tabla de verdad del nivel si todas sus compuertas son del mismo tipo combinacional;
+    # None para compuertas con estado (FlipFlop) o desconocidas, que se evalúan con operar
+    gate_class = type(nodes[0].gate)
+    table = _TABLE_BY_CLASS.get(gate_class)
+    if table is not None:
+        for node in nodes:
+            if type(node.gate) is not gate_class:
+                return None
+    return table
+
+
+def evaluate_levels(
+    levels: List[List[Nodo]],
+    ff: Optional[Dict[Tuple[int, int], tuple]] = None
+) -> int:
+    """
+    Evalúa el árbol nivel por nivel desde las hojas hacia la raíz, sin recursión.
+    Da el mismo resultado que Nodo.evaluate (sin flip-flops) o que evaluate_with_flipflop,
+    y deja actualizado el result de todos los nodos.
+
+    Args:
+        levels: Niveles del árbol como los devuelve collect_levels o builder_levels
+        ff: Diccionario (nivel, índice) -> (FlipFlop, posición), con el nivel 1 en levels[0]
+    Returns:
+        Salida de la raíz
+    """
+    tables = [_level_table(nodes) for nodes in levels[:-1]]
+    return _run_levels(levels, tables, _group_by_level(ff) if ff else None)
+
+
+def _group_by_level(ff: Dict[Tuple[int, int], tuple]) -> Dict[int, Dict[int, tuple]]:
+    # Flip-flops agrupados por nivel: {nivel: {índice: ff_entry}}
+    ff_by_level: Dict[int, Dict[int, tuple]] = {}
+    for (level, index), entry in ff.items():
+        ff_by_level.setdefault(level, {})[index] = entry
+    return ff_by_level
+
+
+def _run_levels(levels: List[List[Nodo]], tables: List[Optional[bytes]],
+                ff_by_level: Optional[Dict[int, Dict[int, tuple]]]) -> int:
+    # Núcleo de evaluate_levels: tables[nivel - 1] es la tabla del nivel o None
+    leaf_level = len(levels)
+    flipflops = ff_by_level.get(leaf_level) if ff_by_level else None
+    if flipflops is None:
+        values = []
+        append = values.append
+        for node in levels[-1]:
+            node.result = value = int(node.value)
+            append(value)
+    else:
+        values = [evaluate_leaf(node, flipflops.get(i)) for i, node in enumerate(levels[-1])]
+
+    for level in range(leaf_level - 1, 0, -1):
+        nodes = levels[level - 1]
+        flipflops = ff_by_level.get(level) if ff_by_level else None
+        if flipflops is None:
+            table = tables[level - 1]
+            if table is not None:
+                # Compuertas combinacionales: la salida se lee de su tabla de verdad;
+                # zip sobre el mismo iterador recorre los valores de a pares (izquierdo, derecho)
+                pairs = iter(values)
+                current = []
+                append = current.append
+                for node, left_val, right_val in zip(nodes, pairs, pairs):
+                    node.result = result = table[(left_val << 1) | right_val]
+                    append(result)
+            else:
+                current = []
+                for i, node in enumerate(nodes):
+                    result = node.gate.operar(values[2 * i], values[2 * i + 1])
+                    if isinstance(result, tuple):
+                        result = result[0]
+                    node.result = result
+                    current.append(result)
+        else:
+            current = [
+                evaluate_gate(node, values[2 * i], values[2 * i + 1], flipflops.get(i))
+                for i, node in enumerate(nodes)
+            ]
+        values = current
+    return values[0]
+
+
+class LevelPlan:
+    """
+    Evaluación precompilada de un árbol: los nodos quedan en una lista plana de pasos, de las
+    hojas hacia la raíz, con la tabla de verdad de cada compuerta y el flip-flop del último
+    ff_map ya ubicados. Evaluar con el plan evita recorrer el árbol, interpretar las rutas y
+    armar las estructuras por nivel en cada llamada, que en árboles chicos es la mayor parte
+    del costo. Los pasos se rearman solo cuando cambia el ff_map.
+    El plan supone que la estructura y las compuertas del árbol no cambian después de build()
+    (ningún módulo del proyecto las modifica); para un árbol distinto se arma otro plan.
+    """
+
+    def __init__(self, root: Nodo):
+        self.root = root
+        self.levels = collect_levels(root)
+        self._source = None
+        # Copia del ff_map (y ruta) con el que se armaron los pasos; compararla con el ff_map
+        # recibido no crea objetos nuevos
+        self._ff_map = None
+        self._path = None
+        self._leaf_steps = None
+        self._gate_steps = None
+
+    def _compile(self, ff_by_level: Dict[int, Dict[int, tuple]]):
+        # Pasos (nodo, ff_entry) de las hojas y (nodo, izquierdo, derecho, tabla, ff_entry) de
+        # las compuertas; la tabla es None si la compuerta se evalúa con operar
+        levels = self.levels
+        leaf_ffs = ff_by_level.get(len(levels), {})
+        self._leaf_steps = [(node, leaf_ffs.get(i)) for i, node in enumerate(levels[-1])]
+        gate_steps = []
+        for level in range(len(levels) - 1, 0, -1):
+            nodes = levels[level - 1]
+            table = _level_table(nodes)
+            flipflops = ff_by_level.get(level, {})
+            for i, node in enumerate(nodes):
+                gate_steps.append((node, node.left, node.right, table, flipflops.get(i)))
+        self._gate_steps = gate_steps
+        self._source = _TABLE_BY_CLASS
+
+    def evaluate(self, ff_map: Optional[Dict[str, tuple]] = None, path: str = '') -> int:
+        """
+        Args:
+            ff_map: Diccionario ruta -> (FlipFlop, posición) como el de la consola
+            path: Ruta de la raíz del plan dentro del árbol completo; solo se aplican los
+                  flip-flops de ff_map que quedan dentro del subárbol
+        Returns:
+            Salida de la raíz del plan (como evaluate_with_flipflop)
+        """
+        ff_map = ff_map or {}
+        # También se recompila si use_truth_tables cambió las tablas en uso
+        if self._source is not _TABLE_BY_CLASS or path != self._path or ff_map != self._ff_map:
+            self._compile(_group_by_level({
+                path_to_position(ff_path[len(path):]): entry
+                for ff_path, entry in ff_map.items()
+                if ff_path.startswith(path)
+            }))
+            self._ff_map = dict(ff_map)
+            self._path = path
+
+        for node, entry in self._leaf_steps:
+            if entry is None:
+                node.result = int(node.value)
+            else:
+                evaluate_leaf(node, entry)
+        # Los pasos van de las hojas hacia la raíz, así que los hijos de cada compuerta ya
+        # tienen su result; leerlo del nodo evita armar listas de valores por nivel
+        for node, left, right, table, entry in self._gate_steps:
+            if entry is None:
+                if table is not None:
+                    node.result = table[(left.result << 1) | right.result]
+                else:
+                    result = node.gate.operar(left.result, right.result)
+                    node.result = result[0] if isinstance(result, tuple) else result
+            elif table is not None:
+                # Misma semántica que evaluate_gate, con la tabla en lugar de gate.operar:
+                # Q del flip-flop de entrada alimenta ambas entradas (índice 3 * Q)
+                ff, position = entry
+                if position == 'input':
+                    node.result = table[3 * ff.operar(left.result, right.result)[0]]
+                else:
+                    node.result = ff.operar(table[(left.result << 1) | right.result], 0)[0]
+            else:
+                evaluate_gate(node, left.result, right.result, entry)
+        return self.root.result
+
+
+def plan_for(root: Nodo) -> LevelPlan:
+    """
+    Retorna el LevelPlan del árbol con raíz root, creándolo la primera vez.
+    El plan queda guardado en root._level_plan, así que vive lo mismo que el árbol;
+    TreeBuilder.build lo libera al reemplazar el árbol por uno nuevo.
+    """
+    plan = root._level_plan
+    if plan is None:
+        plan = root._level_plan = LevelPlan(root)
+    return plan
+
+
+class ShortCircuitStats:
+    """
+    Contadores de la evaluación con cortocircuito.
+
+    Attributes:
+        gates_evaluated: Compuertas cuya salida se calculó
+        gates_skipped: Compuertas que no se evaluaron por estar en un subárbol omitido
+        leaves_skipped: Hojas que no se leyeron por estar en un subárbol omitido
+    """
+
+    def __init__(self):
+        self.gates_evaluated = 0
+        self.gates_skipped = 0
+        self.leaves_skipped = 0
+
+    @property
+    def skipped_fraction(self) -> float:
+        """Fracción de compuertas omitidas sobre el total visto."""
+        total = self.gates_evaluated + self.gates_skipped
+        return self.gates_skipped / total if total else 0.0
+
+    def __repr__(self) -> str:
+        return (
+            f"ShortCircuitStats(evaluadas={self.gates_evaluated}, "
+            f"omitidas={self.gates_skipped}, hojas_omitidas={self.leaves_skipped})"
+        )
+
+
+def evaluate_short_circuit(root: Nodo, stats: Optional[ShortCircuitStats] = None) -> int:
+    """
+    Evalúa el árbol usando el valor controlante de cada compuerta: si el hijo izquierdo
+    ya vale controlling_value (0 para AND/NAND, 1 para OR/NOR), el subárbol derecho no se
+    evalúa. XOR no tiene valor controlante y siempre evalúa ambos hijos.
+
+    El resultado de la raíz es idéntico al de Nodo.evaluate. Política de resultados:
+    los nodos de un subárbol omitido conservan el result de su evaluación anterior
+    (puede estar desactualizado o ser None); todos los demás nodos quedan actualizados.
+
+    Args:
+        root: Raíz del árbol (o de un subárbol)
+        stats: Contadores opcionales que se incrementan durante la evaluación
+    Returns:
+        Salida de la raíz
+    """
+    # Altura en niveles de compuertas, recorriendo el borde izquierdo del árbol perfecto
+    height = 0
+    node = root
+    while node.left is not None:
+        height += 1
+        node = node.left
+    return _evaluate_short_circuit(root, height, stats)
+
+
+def _evaluate_short_circuit(node: Nodo, height: int, stats: Optional[ShortCircuitStats]) -> int:
+    if height == 0:
+        node.result = node.value
+        return node.value
+
+    left_val = _evaluate_short_circuit(node.left, height - 1, stats)
+    controlling = node.gate.controlling_value
+    if controlling is not None and left_val == controlling:
+        if stats is not None:
+            stats.gates_evaluated += 1
+            # Subárbol perfecto omitido con height - 1 niveles de compuertas
+            stats.gates_skipped += 2 ** (height - 1) - 1
+            stats.leaves_skipped += 2 ** (height - 1)
+        node.result = node.gate.operar(controlling, controlling)
+        return node.result
+
+    right_val = _evaluate_short_circuit(node.right, height - 1, stats)
+    if stats is not None:
+        stats.gates_evaluated += 1
+    result = node.gate.operar(left_val, right_val)
+    node.result = result[0] if isinstance(result, tuple) else result
+    return node.result
@@ -0,0 +1,245 @@
+#faults.py
+#Este módulo implementa un simulador de fallas stuck-at (pegado a 0 / pegado a 1) para medir
+#la cobertura de un conjunto de vectores de prueba.
+#Una falla es la tupla (heap, valor): la salida del nodo con ese índice de heap (una compuerta
+#o una hoja) queda fija en valor sin importar sus entradas. Un vector detecta la falla si la
+#salida de la raíz del circuito con la falla difiere de la del circuito correcto.
+#
+#La simulación es paralela en patrones: un bloque de vectores se empaqueta en columnas (el bit k
+#es el vector k, como en BatchEvaluator) y el circuito correcto se evalúa una sola vez por bloque.
+#Como cada nodo alimenta una sola compuerta, el efecto de una falla viaja por un único camino
+#hasta la raíz (no hay caminos que se vuelvan a unir), así que no hace falta simular cada falla:
+#basta saber en qué vectores un cambio en el nodo llega a la raíz (su observabilidad):
+#    obs(raíz) = todos los vectores
+#    obs(hijo) = obs(padre) & (op(1, hermano) ^ op(0, hermano))
+#y la falla (h, v) se detecta en obs(h) & (valor correcto de h != v). Es decir, todas las fallas
+#de un bloque se resuelven con una operación bit a bit por nodo, lo mismo que simularlas en
+#paralelo pero sin volver a evaluar ningún camino.
+#Las fallas detectadas se descartan (fault dropping): los bloques siguientes solo calculan la
+#observabilidad de los caminos que todavía tienen fallas pendientes.
+
+from tree.batch import BatchEvaluator, _bitwise_op, pack_vectors
+from tree.builder import TreeBuilder
+from tree.netlist import heap_level, heap_to_path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+Fault = Tuple[int, int]
+
+
+def all_faults(num_levels: int) -> List[Fault]:
+    """
+    Args:
+        num_levels: Cantidad de niveles de compuertas
+    Returns:
+        Fallas stuck-at-0 y stuck-at-1 de todos los nodos (compuertas y hojas), por heap
+    """
+    return [(heap, value) for heap in range(1, 2 ** (num_levels + 1)) for value in (0, 1)]
+
+
+def fault_name(fault: Fault) -> str:
+    """Nombre legible de una falla, p.ej. 'LR/sa1' ('raiz/sa0' para la raíz)."""
+    heap, value = fault
+    return f"{heap_to_path(heap) or 'raiz'}/sa{value}"
+
+
+class CoverageReport:
+    """
+    Resultado de simular un conjunto de vectores de prueba.
+
+    Attributes:
+        num_levels: Cantidad de niveles de compuertas
+        vectors: Cantidad de vectores simulados
+        detected: Diccionario falla -> índice del primer vector que la detecta
+        undetected: Fallas que ningún vector detectó
+    """
+
+    def __init__(self, num_levels: int, vectors: int, detected: Dict[Fault, int], undetected: List[Fault]):
+        self.num_levels = num_levels
+        self.vectors = vectors
+        self.detected = detected
+        self.undetected = undetected
+
+    @property
+    def total(self) -> int:
+        return len(self.detected) + len(self.undetected)
+
+    @property
+    def coverage(self) -> float:
+        """Fracción de fallas detectadas (1.0 si no hay fallas)."""
+        return len(self.detected) / self.total if self.total else 1.0
+
+    def by_level(self) -> Dict[int, Tuple[int, int]]:
+        """
+        Returns:
+            Diccionario nivel (1 = raíz, num_levels + 1 = hojas) -> (detectadas, total)
+        """
+        result = {}
+        for faults, found in ((self.detected, 1), (self.undetected, 0)):
+            for heap, _ in faults:
+                level = heap_level(heap)
+                detected, total = result.get(level, (0, 0))
+                result[level] = (detected + found, total + 1)
+        return dict(sorted(result.items()))
+
+    def useful_vectors(self) -> List[int]:
+        """Índices de los vectores que fueron los primeros en detectar alguna falla."""
+        return sorted(set(self.detected.values()))
+
+    def to_dict(self) -> dict:
+        """Retorna el reporte como diccionario apto para JSON."""
+        return {
+            "vectors": self.vectors,
+            "faults": self.total,
+            "detected": len(self.detected),
+            "coverage": self.coverage,
+            "by_level": {
+                str(level): {"detected": d, "total": t} for level, (d, t) in self.by_level().items()
+            },
+            "undetected": [fault_name(fault) for fault in self.undetected],
+        }
+
+    def report(self) -> str:
+        """Retorna un reporte de texto de la cobertura."""
+        lines = [
+            f"Vectores simulados: {self.vectors:,}",
+            f"Fallas detectadas: {len(self.detected):,} de {self.total:,} ({self.coverage:.2%})",
+            "Cobertura por nivel:",
+        ]
+        for level, (detected, total) in self.by_level().items():
+            name = "hojas" if level == self.num_levels + 1 else f"nivel {level}"
+            lines.append(f"  {name:<10} {detected:>8,} / {total:<8,}")
+        if self.undetected:
+            lines.append("Fallas no detectadas:")
+            lines.extend(f"  {fault_name(fault)}" for fault in self.undetected)
+        return "\n".join(lines)
+
+    def __repr__(self) -> str:
+        return (
+            f"CoverageReport(vectores={self.vectors}, detectadas={len(self.detected)}, "
+            f"total={self.total}, cobertura={self.coverage:.2%})"
+        )
+
+
+class FaultSimulator:
+    """
+    Simulador de fallas stuck-at para un circuito combinacional de TreeBuilder.
+    Cada llamada a run / run_columns simula un conjunto de prueba independiente.
+    """
+
+    def __init__(self, builder: TreeBuilder):
+        """
+        Args:
+            builder: TreeBuilder que describe el circuito (no requiere build())
+        Raises:
+            ValueError: Si algún nivel usa una compuerta sin equivalente bit a bit (FlipFlop)
+        """
+        self.num_levels = builder.num_levels
+        self.num_inputs = 2 ** builder.num_levels
+        self._evaluator = BatchEvaluator(builder)
+        self._ops = [_bitwise_op(gate_class) for gate_class in builder.gate_types]
+
+    def _check_faults(self, faults: Optional[Iterable[Fault]]) -> List[Fault]:
+        if faults is None:
+            return all_faults(self.num_levels)
+        faults = list(dict.fromkeys(faults))
+        for heap, value in faults:
+            if not 1 <= heap < 2 * self.num_inputs or value not in (0, 1):
+                raise ValueError(f"Falla inválida: {(heap, value)!r}")
+        return faults
+
+    def _good_values(self, columns: Sequence[int], count: int) -> List[int]:
+        # Columna del circuito correcto por índice de heap (el índice 0 no se usa)
+        nodes = self._evaluator.evaluate(columns, count, keep_nodes=True).nodes
+        good = [0] * (2 * self.num_inputs)
+        for (level, index), column in nodes.items():
+            good[2 ** (level - 1) + index] = column
+        return good
+
+    def _detect(self, good: List[int], mask: int, pending: List[Fault],
+                offset: int, detected: Dict[Fault, int]) -> List[Fault]:
+        # Resuelve las fallas pendientes de un bloque; retorna las que siguen sin detectar
+        ops = self._ops
+        obs = {1: mask}
+
+        def observability(heap: int) -> int:
+            # Se sube hasta un ancestro ya calculado y se baja calculando cada nodo del camino
+            path = []
+            while heap not in obs:
+                path.append(heap)
+                heap >>= 1
+            for node in reversed(path):
+                parent_obs = obs[node >> 1]
+                if parent_obs:
+                    op = ops[heap_level(node) - 2]
+                    sibling = good[node ^ 1]
+                    parent_obs &= op(mask, sibling, mask) ^ op(0, sibling, mask)
+                obs[node] = parent_obs
+            return obs[path[0]] if path else obs[heap]
+
+        remaining = []
+        for fault in pending:
+            heap, value = fault
+            hits = observability(heap) & (good[heap] ^ (mask if value else 0))
+            if hits:
+                detected[fault] = offset + (hits & -hits).bit_length() - 1
+            else:
+                remaining.append(fault)
+        return remaining
+
+    def run_columns(self, columns: Sequence[int], count: int,
+                    faults: Optional[Iterable[Fault]] = None) -> CoverageReport:
+        """
+        Simula un bloque de vectores ya empaquetados (ver tree.batch.pack_vectors).
+
+        Args:
+            columns: Una columna por hoja; el bit k es el valor de la hoja en el vector k
+            count: Cantidad de vectores
+            faults: Fallas a simular (por defecto, all_faults)
+        Raises:
+            ValueError: Si la cantidad de columnas no coincide o alguna falla es inválida
+        Returns:
+            CoverageReport del conjunto
+        """
+        pending = self._check_faults(faults)
+        detected = {}
+        if count > 0 and pending:
+            good = self._good_values(columns, count)
+            pending = self._detect(good, (1 << count) - 1, pending, 0, detected)
+        elif len(columns) != self.num_inputs:
+            raise ValueError(
+                f"Se esperan {self.num_inputs} columnas, se recibieron {len(columns)}"
+            )
+        return CoverageReport(self.num_levels, count, detected, pending)
+
+    def run(self, vectors: Iterable[Sequence[int]], faults: Optional[Iterable[Fault]] = None,
+            chunk_size: int = 4096) -> CoverageReport:
+        """
+        Simula un flujo de vectores por bloques, descartando las fallas ya detectadas.
+        Si todas las fallas se detectan antes de terminar, el resto del flujo no se lee.
+
+        Args:
+            vectors: Vectores de prueba, cada uno con un valor por hoja
+            faults: Fallas a simular (por defecto, all_faults)
+            chunk_size: Vectores por bloque
+        Raises:
+            ValueError: Si algún vector no tiene un valor por hoja o alguna falla es inválida
+        Returns:
+            CoverageReport del conjunto
+        """
+        pending = self._check_faults(faults)
+        detected = {}
+        total = 0
+        iterator = iter(vectors)
+        while pending:
+            block = []
+            for vector in iterator:
+                block.append(vector)
+                if len(block) == chunk_size:
+                    break
+            if not block:
+                break
+            count = len(block)
+            good = self._good_values(pack_vectors(block, self.num_inputs), count)
+            pending = self._detect(good, (1 << count) - 1, pending, total, detected)
+            total += count
+        return CoverageReport(self.num_levels, total, detected, pending)
@@ -0,0 +1,120 @@
+#incremental.py
+#Este módulo implementa la reevaluación incremental del árbol lógico. Cuando cambian
+#unas pocas entradas (hojas), solo se recalculan los nodos del camino entre esas hojas y la raíz,
+#nivel por nivel, y la propagación se detiene en cuanto la salida de un nodo no cambia.
+#Así un cambio de una sola entrada cuesta O(niveles) en lugar de reevaluar las 2^n hojas
+#y 2^n - 1 compuertas. Se informa qué nodos cambiaron para que la interfaz repinte solo esos.
+#La semántica de los Flip-Flops es la misma de evaluate_with_flipflop; como un flip-flop SR
+#que recibe las mismas entradas no cambia de estado, omitir los nodos que no cambian es seguro.
+
+from tree.builder import TreeBuilder
+from tree.evaluation import evaluate_gate, evaluate_leaf, ff_positions
+from tree.node import Nodo
+from typing import Dict, Iterable, List, Optional
+
+
+class IncrementalEvaluator:
+    """
+    Evaluador que mantiene los resultados de todos los nodos y los actualiza
+    a partir de las hojas que cambiaron.
+    """
+
+    def __init__(self, builder: TreeBuilder, ff_map: Optional[Dict[str, tuple]] = None):
+        """
+        Args:
+            builder: TreeBuilder sobre el que ya se llamó build()
+            ff_map: Diccionario ruta -> (FlipFlop, posición) como el de la consola
+        Raises:
+            ValueError: Si build() no ha sido llamado aún
+        """
+        if not builder._nodes_by_level:
+            raise ValueError("Primero debe llamar a build()")
+        self.builder = builder
+        self.num_levels = builder.num_levels
+        self._levels = builder._nodes_by_level
+        self._ff = ff_positions(ff_map or {})
+        self._evaluated = False
+
+    @property
+    def root(self) -> Nodo:
+        return self._levels[1][0]
+
+    def _evaluate_node(self, level: int, index: int) -> int:
+        node = self._levels[level][index]
+        ff_entry = self._ff.get((level, index))
+        if level == self.num_levels + 1:
+            return evaluate_leaf(node, ff_entry)
+        children = self._levels[level + 1]
+        return evaluate_gate(
+            node,
+            children[2 * index].result,
+            children[2 * index + 1].result,
+            ff_entry
+        )
+
+    def evaluate(self) -> List[Nodo]:
+        """
+        Evalúa el árbol completo, de las hojas a la raíz.
+
+        Returns:
+            Lista de nodos cuyo resultado cambió respecto al que tenían
+        """
+        flipped = []
+        for level in range(self.num_levels + 1, 0, -1):
+            for index, node in enumerate(self._levels[level]):
+                previous = node.result
+                if self._evaluate_node(level, index) != previous:
+                    flipped.append(node)
+        self._evaluated = True
+        return flipped
+
+    def update(self, changed_leaves: Iterable[int]) -> List[Nodo]:
+        """
+        Reevalúa solo los caminos desde las hojas indicadas hasta la raíz.
+        Los valores nuevos deben estar ya asignados en node.value de cada hoja.
+        Si el árbol aún no fue evaluado por completo, se hace una evaluación completa.
+
+        Args:
+            changed_leaves: Índices (de izquierda a derecha) de las hojas modificadas
+        Raises:
+            IndexError: Si algún índice no corresponde a una hoja
+        Returns:
+            Lista de nodos cuyo resultado cambió, de las hojas hacia la raíz
+        """
+        changed = set(changed_leaves)
+        num_leaves = len(self._levels[self.num_levels + 1])
+        for index in changed:
+            if not 0 <= index < num_leaves:
+                raise IndexError(f"No existe la hoja {index}")
+
+        if not self._evaluated:
+            return self.evaluate()
+
+        flipped = []
+        dirty = changed
+        for level in range(self.num_levels + 1, 0, -1):
+            if not dirty:
+                break
+            parents = set()
+            nodes = self._levels[level]
+            for index in sorted(dirty):
+                node = nodes[index]
+                previous = node.result
+                if self._evaluate_node(level, index) != previous:
+                    flipped.append(node)
+                    parents.add(index // 2)
+            dirty = parents
+        return flipped
+
+    def set_leaf(self, index: int, value: int) -> List[Nodo]:
+        """
+        Asigna el valor de una hoja y propaga el cambio.
+
+        Args:
+            index: Índice de la hoja
+            value: Nuevo valor (0 o 1)
+        Returns:
+            Lista de nodos cuyo resultado cambió
+        """
+        self._levels[self.num_levels + 1][index].value = int(value)
+        return self.update([index])
@@ -0,0 +1,295 @@
+#instrumentation.py
+#Este módulo agrega instrumentación opcional para saber en qué se va el tiempo al evaluar:
+#  - cuántas veces se llama operar (y operar_batch) por tipo de compuerta y por nivel,
+#  - cuánto tarda cada fase de la evaluación (bloques "with inst.phase(...)" o funciones
+#    observadas con watch(), como Nodo.is_leaf o get_node_by_path),
+#  - las transiciones de estado de cada Flip-Flop.
+#Los contadores se exportan como diccionario, JSON o un reporte de texto.
+#No tiene costo cuando está desactivada: al activarla se reemplazan temporalmente los métodos
+#de las clases (monkey patching) y al desactivarla se restauran los originales, así que el
+#código normal no hace ninguna verificación extra.
+#Mientras está activa, evaluate_levels deja de usar las tablas de verdad para que cada
+#compuerta pase por operar y quede contada.
+#También integra cProfile: profile() es un context manager y, desde la línea de comandos,
+#main.py perfila toda la ejecución si se define la variable de entorno AC_PROFILE
+#(AC_PROFILE=1 imprime las funciones más costosas en stderr; AC_PROFILE=archivo guarda los
+#datos para pstats/snakeviz) y muestra el reporte de instrumentación si AC_INSTRUMENT=1.
+
+import cProfile
+import functools
+import io
+import json
+import os
+import pstats
+import sys
+import time
+from collections import Counter, defaultdict
+from contextlib import ExitStack, contextmanager
+from gates.base import Compuerta
+from gates.flipflop import FlipFlop
+from tree import evaluation
+from typing import Dict, Optional
+
+PROFILE_ENV = 'AC_PROFILE'
+INSTRUMENT_ENV = 'AC_INSTRUMENT'
+
+
+def _gate_classes():
+    # Todas las clases de compuerta con operar propio (incluye subclases definidas por el usuario)
+    pending = [Compuerta]
+    classes = []
+    while pending:
+        cls = pending.pop()
+        pending.extend(cls.__subclasses__())
+        if 'operar' in cls.__dict__ and cls is not Compuerta:
+            classes.append(cls)
+    return classes
+
+
+class Instrumentation:
+    """
+    Contadores de una sesión de instrumentación.
+
+    Attributes:
+        gate_calls: Counter de (compuerta, nivel) -> llamadas a operar; nivel None si la
+                    compuerta no pertenece al builder indicado (p.ej. un FlipFlop del ff_map)
+        batch_calls: Counter de compuerta -> llamadas a operar_batch
+        phases: Diccionario fase -> {"calls": llamadas, "seconds": tiempo acumulado}
+        transitions: Diccionario flip-flop -> Counter de transiciones ("0->1", "1->0")
+    """
+
+    def __init__(self, builder=None, ff_map: Optional[Dict[str, tuple]] = None):
+        """
+        Args:
+            builder: TreeBuilder construido, para asociar cada compuerta con su nivel
+            ff_map: Diccionario ruta -> (FlipFlop, posición), para nombrar los flip-flops por ruta
+        """
+        self.gate_calls = Counter()
+        self.batch_calls = Counter()
+        self.phases = defaultdict(lambda: {"calls": 0, "seconds": 0.0})
+        self.transitions = defaultdict(Counter)
+        self.enabled = False
+
+        self._levels = {}
+        if builder is not None and builder._nodes_by_level:
+            for level in range(1, builder.num_levels + 1):
+                for node in builder._nodes_by_level[level]:
+                    self._levels[id(node.gate)] = level
+        self._ff_names = {id(ff): f"ff[{path or 'raiz'}]" for path, (ff, _) in (ff_map or {}).items()}
+        self._watched = []
+        self._patches = []
+        self._tables_enabled = True
+
+    def watch(self, owner, name: str, label: Optional[str] = None):
+        """
+        Mide las llamadas y el tiempo de una función o método mientras la instrumentación
+        esté activa. Se reemplaza el atributo de owner, así que debe indicarse el objeto
+        donde se busca el nombre al llamar (p.ej. el módulo main para get_node_by_path).
+
+        Args:
+            owner: Clase o módulo que contiene la función
+            name: Nombre del atributo
+            label: Nombre de la fase en los resultados (por defecto, owner.name)
+        """
+        label = label or f"{getattr(owner, '__name__', owner)}.{name}"
+        self._watched.append((owner, name, label))
+        if self.enabled:
+            self._patch_watch(owner, name, label)
+        return self
+
+    @contextmanager
+    def phase(self, name: str):
+        """Mide el tiempo del bloque with y lo acumula en la fase indicada."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            entry = self.phases[name]
+            entry["calls"] += 1
+            entry["seconds"] += time.perf_counter() - start
+
+    def enable(self):
+        """Instala los contadores (reemplaza operar/operar_batch de cada compuerta)."""
+        if self.enabled:
+            return
+        self.enabled = True
+        for cls in _gate_classes():
+            self._patch(cls, 'operar', self._wrap_operar(cls.__dict__['operar']))
+            if 'operar_batch' in cls.__dict__:
+                self._patch(cls, 'operar_batch', self._wrap_batch(cls.__dict__['operar_batch']))
+        # Sin tablas, evaluate_levels evalúa cada compuerta con operar
+        self._tables_enabled = evaluation.use_truth_tables(False)
+        for owner, name, label in self._watched:
+            self._patch_watch(owner, name, label)
+
+    def disable(self):
+        """Restaura los métodos originales; los contadores se conservan."""
+        for owner, name, original in reversed(self._patches):
+            setattr(owner, name, original)
+        self._patches.clear()
+        if self.enabled:
+            evaluation.use_truth_tables(self._tables_enabled)
+        self.enabled = False
+
+    def __enter__(self) -> 'Instrumentation':
+        self.enable()
+        return self
+
+    def __exit__(self, *exc):
+        self.disable()
+
+    def reset(self):
+        """Reinicia todos los contadores."""
+        self.gate_calls.clear()
+        self.batch_calls.clear()
+        self.phases.clear()
+        self.transitions.clear()
+
+    def _patch(self, owner, name, replacement):
+        self._patches.append((owner, name, getattr(owner, name)))
+        setattr(owner, name, replacement)
+
+    def _patch_watch(self, owner, name, label):
+        original = getattr(owner, name)
+        phases = self.phases
+
+        @functools.wraps(original)
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return original(*args, **kwargs)
+            finally:
+                entry = phases[label]
+                entry["calls"] += 1
+                entry["seconds"] += time.perf_counter() - start
+
+        self._patch(owner, name, timed)
+
+    def _wrap_operar(self, original):
+        counts = self.gate_calls
+        levels = self._levels
+        transitions = self.transitions
+        ff_names = self._ff_names
+
+        @functools.wraps(original)
+        def operar(gate, A, B=None):
+            counts[(type(gate).__name__, levels.get(id(gate)))] += 1
+            if not isinstance(gate, FlipFlop):
+                return original(gate, A, B)
+            before = gate.value
+            result = original(gate, A, B)
+            if gate.value != before:
+                name = ff_names.get(id(gate))
+                if name is None:
+                    name = f"FlipFlop@{levels.get(id(gate))}"
+                transitions[name][f"{before}->{gate.value}"] += 1
+            return result
+
+        return operar
+
+    def _wrap_batch(self, original):
+        counts = self.batch_calls
+
+        @functools.wraps(original)
+        def operar_batch(gate, A, B=None, mask=None):
+            counts[type(gate).__name__] += 1
+            return original(gate, A, B, mask)
+
+        return operar_batch
+
+    def to_dict(self) -> dict:
+        """Retorna los contadores como diccionario apto para JSON."""
+        per_type = Counter()
+        for (name, _), calls in self.gate_calls.items():
+            per_type[name] += calls
+        return {
+            "gate_calls": dict(per_type),
+            "gate_calls_by_level": [
+                {"gate": name, "level": level, "calls": calls}
+                for (name, level), calls in sorted(
+                    self.gate_calls.items(), key=lambda item: (item[0][1] or 0, item[0][0])
+                )
+            ],
+            "batch_calls": dict(self.batch_calls),
+            "phases": {name: dict(entry) for name, entry in self.phases.items()},
+            "flipflop_transitions": {name: dict(c) for name, c in self.transitions.items()},
+        }
+
+    def to_json(self, **kwargs) -> str:
+        return json.dumps(self.to_dict(), **kwargs)
+
+    def report(self) -> str:
+        """Retorna un reporte de texto con los contadores."""
+        data = self.to_dict()
+        if self._levels:
+            lines = ["Llamadas a operar por compuerta y nivel:"]
+            for entry in data["gate_calls_by_level"]:
+                level = "-" if entry["level"] is None else entry["level"]
+                lines.append(f"  {entry['gate']:<10} nivel {level:<4} {entry['calls']:>12,}")
+        else:
+            # Sin builder (p.ej. con AC_INSTRUMENT, que se activa antes de armar el circuito)
+            # no se conoce el nivel de ninguna compuerta: solo se muestran los totales por tipo
+            lines = ["Llamadas a operar por compuerta:"]
+            for name, calls in sorted(data["gate_calls"].items()):
+                lines.append(f"  {name:<10} {calls:>12,}")
+        if data["batch_calls"]:
+            lines.append("Llamadas a operar_batch:")
+            for name, calls in sorted(data["batch_calls"].items()):
+                lines.append(f"  {name:<10} {calls:>12,}")
+        if data["phases"]:
+            lines.append("Fases:")
+            for name, entry in sorted(data["phases"].items(), key=lambda item: -item[1]["seconds"]):
+                lines.append(f"  {name:<32} {entry['calls']:>10,} llamadas {entry['seconds'] * 1000:>10.3f} ms")
+        if data["flipflop_transitions"]:
+            lines.append("Transiciones de FlipFlop:")
+            for name, counts in sorted(data["flipflop_transitions"].items()):
+                detail = ", ".join(f"{k}: {v}" for k, v in sorted(counts.items()))
+                lines.append(f"  {name:<16} {detail}")
+        return "\n".join(lines)
+
+
+@contextmanager
+def profile(dest: Optional[str] = None, sort: str = 'cumulative', limit: int = 25, stream=None):
+    """
+    Perfila el bloque with con cProfile.
+
+    Args:
+        dest: Archivo donde guardar los datos (formato pstats); si es None se imprime un resumen
+        sort: Criterio de orden del resumen
+        limit: Cantidad de funciones del resumen
+        stream: Dónde imprimir el resumen (por defecto, stderr)
+    """
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield profiler
+    finally:
+        profiler.disable()
+        if dest:
+            profiler.dump_stats(dest)
+        else:
+            output = io.StringIO()
+            pstats.Stats(profiler, stream=output).sort_stats(sort).print_stats(limit)
+            (stream or sys.stderr).write(output.getvalue())
+
+
+@contextmanager
+def from_env(environ=None):
+    """
+    Activa el perfilado y la instrumentación según las variables de entorno
+    AC_PROFILE y AC_INSTRUMENT (ver la cabecera del módulo). Sin ellas no hace nada.
+    """
+    environ = os.environ if environ is None else environ
+    profile_target = environ.get(PROFILE_ENV)
+    instrument = environ.get(INSTRUMENT_ENV, '') not in ('', '0')
+
+    with ExitStack() as stack:
+        if profile_target:
+            stack.enter_context(profile(None if profile_target == '1' else profile_target))
+        inst = None
+        if instrument:
+            inst = Instrumentation()
+            # Se registra antes de activar para que el reporte se imprima ya desactivada
+            stack.callback(lambda: print(inst.report(), file=sys.stderr))
+            stack.enter_context(inst)
+        yield inst
@@ -0,0 +1,545 @@
+#netlist.py
+#Este módulo "compila" el árbol binario perfecto construido por TreeBuilder a una netlist plana
+#basada en arreglos. En lugar de objetos Nodo enlazados, el circuito se guarda como:
+#  - un opcode por nivel (todas las compuertas de un nivel son homogéneas),
+#  - un bytearray con el valor de cada nodo en indexación de heap (raíz = 1, hijos de h = 2h y 2h+1,
+#    las hojas ocupan los índices 2^L .. 2^(L+1)-1 para L niveles de compuertas).
+#La evaluación recorre los niveles de abajo hacia arriba y calcula cada nivel completo con operaciones
+#sobre bytes (slices + tabla de traducción), sin despacho por objeto ni recursión.
+#Se mantiene un mapeo opcional hacia los Nodo originales para que print_tree y la GUI puedan
+#seguir mostrando los resultados. Para árboles grandes (sin build()) los Nodo se materializan
+#bajo demanda como vistas sobre el buffer (NetlistNodo), por ejemplo solo para el camino
+#que el usuario inspecciona; la memoria queda en unos pocos bytes por compuerta.
+#La netlist también admite cualquier cantidad de Flip-Flops SR, en la entrada o la salida de
+#cualquier nodo, direccionados por índice de heap (add_flipflop / remove_flipflop). La ubicación
+#y el estado se guardan en bytearrays paralelos a values, así que consultar si un nodo tiene
+#flip-flop es un acceso a un arreglo. Los niveles sin flip-flops se evalúan con el mismo camino
+#rápido de siempre; en los demás solo se corrigen los nodos que tienen flip-flop.
+
+from gates import AND, OR, NAND, NOR, XOR
+from gates.base import Compuerta
+from tree.node import Nodo
+from typing import Dict, List, Optional, Sequence, Tuple, Type
+
+
+# Opcodes de las compuertas combinacionales soportadas (un byte por nivel)
+OP_AND = 0
+OP_OR = 1
+OP_NAND = 2
+OP_NOR = 3
+OP_XOR = 4
+
+OPCODES = {
+    AND: OP_AND,
+    OR: OP_OR,
+    NAND: OP_NAND,
+    NOR: OP_NOR,
+    XOR: OP_XOR,
+}
+
+# Clase de compuerta asociada a cada opcode (inverso de OPCODES)
+GATE_BY_OPCODE = (AND, OR, NAND, NOR, XOR)
+
+# Ubicación de un flip-flop en un nodo (valor de Netlist.ff_positions)
+FF_NONE = 0
+FF_INPUT = 1
+FF_OUTPUT = 2
+
+_FF_CODES = {'input': FF_INPUT, 'output': FF_OUTPUT}
+_FF_NAMES = {FF_INPUT: 'input', FF_OUTPUT: 'output'}
+
+
+def _build_table(gate_class: Type[Compuerta]) -> bytes:
+    # El código 2*A + B (0..3) se traduce directamente a la salida de la compuerta
+    gate = gate_class()
+    table = bytearray(256)
+    for code in range(4):
+        table[code] = gate.operar(code >> 1, code & 1)
+    return bytes(table)
+
+
+_TABLES = tuple(_build_table(gate_class) for gate_class in GATE_BY_OPCODE)
+
+
+def opcode_for(gate_class: Type[Compuerta]) -> int:
+    """
+    Args:
+        gate_class: Clase de compuerta (AND, OR, NAND, NOR, XOR o subclase)
+    Raises:
+        ValueError: Si la compuerta no tiene opcode
+    Returns:
+        Opcode de la compuerta
+    """
+    for cls in gate_class.__mro__:
+        if cls in OPCODES:
+            return OPCODES[cls]
+    raise ValueError(f"La compuerta {gate_class.__name__} no tiene opcode de netlist")
+
+
+def path_to_heap(path: str) -> int:
+    """
+    Convierte una ruta L/R desde la raíz (como en get_node_by_path) a índice de heap.
+
+    Args:
+        path: Ruta con caracteres L (izquierda) y R (derecha); '' es la raíz
+    Raises:
+        ValueError: Si la ruta contiene caracteres distintos de L/R
+    Returns:
+        Índice de heap del nodo (la raíz es 1)
+    """
+    heap = 1
+    for ch in path.upper():
+        if ch == 'L':
+            heap = 2 * heap
+        elif ch == 'R':
+            heap = 2 * heap + 1
+        else:
+            raise ValueError(f"Ruta inválida: {path!r}")
+    return heap
+
+
+def heap_to_path(heap: int) -> str:
+    """
+    Args:
+        heap: Índice de heap (la raíz es 1)
+    Raises:
+        ValueError: Si el índice es menor que 1
+    Returns:
+        Ruta L/R desde la raíz hasta el nodo
+    """
+    if heap < 1:
+        raise ValueError("El índice de heap debe ser mayor o igual a 1")
+    bits = bin(heap)[3:]
+    return bits.replace('0', 'L').replace('1', 'R')
+
+
+def heap_level(heap: int) -> int:
+    """Retorna el nivel (1 = raíz) del nodo con índice de heap dado."""
+    return heap.bit_length()
+
+
+class Netlist:
+    """
+    Representación plana y basada en arreglos de un circuito de TreeBuilder.
+
+    Attributes:
+        num_levels: Cantidad de niveles de compuertas
+        opcodes: Opcode de cada nivel (opcodes[0] es el nivel 1, la raíz)
+        values: bytearray de tamaño 2^(num_levels+1) con el valor de cada nodo
+                por índice de heap (el índice 0 no se usa)
+        nodes: Lista opcional de Nodo por índice de heap, para volcar resultados
+        ff_positions: bytearray con la ubicación del flip-flop de cada nodo (FF_NONE,
+                      FF_INPUT o FF_OUTPUT) por índice de heap
+        ff_state: bytearray con el estado almacenado de cada flip-flop por índice de heap;
+                  después de evaluar es también la salida Q del flip-flop
+    """
+
+    def __init__(
+        self,
+        num_levels: int,
+        opcodes: Sequence[int],
+        values: Optional[bytearray] = None,
+        nodes: Optional[List[Optional[Nodo]]] = None
+    ):
+        """
+        Args:
+            num_levels: Cantidad de niveles de compuertas
+            opcodes: Opcode de cada nivel, empezando por la raíz
+            values: Buffer inicial de valores (se crea en 0 si es None)
+            nodes: Mapeo opcional de índice de heap a Nodo
+        Raises:
+            ValueError: Si las dimensiones no son consistentes
+        """
+        if num_levels < 1:
+            raise ValueError("Mínimo 1 nivel de compuertas")
+        if len(opcodes) != num_levels:
+            raise ValueError(
+                f"Se esperan {num_levels} opcodes, se recibieron {len(opcodes)}"
+            )
+        for op in opcodes:
+            if not 0 <= op < len(GATE_BY_OPCODE):
+                raise ValueError(f"Opcode desconocido: {op}")
+
+        size = 2 ** (num_levels + 1)
+        if values is None:
+            values = bytearray(size)
+        elif len(values) != size:
+            raise ValueError(f"El buffer de valores debe tener {size} bytes")
+
+        self.num_levels = num_levels
+        self.opcodes = bytes(opcodes)
+        self.values = values
+        self.nodes = nodes
+        self.ff_positions = bytearray(size)
+        self.ff_state = bytearray(size)
+        # Índices de heap con flip-flop, por nivel (1 = raíz, num_levels + 1 = hojas)
+        self._ff_by_level: Dict[int, set] = {}
+        # Resultados de hojas escritos por evaluadores externos a través de NetlistNodo (p.ej. la
+        # salida Q de un flip-flop del ff_map); se guardan aparte para no pisar la entrada
+        self._leaf_results: Dict[int, int] = {}
+
+    @classmethod
+    def from_builder(cls, builder, ff_map: Optional[Dict[str, tuple]] = None) -> 'Netlist':
+        """
+        Compila un TreeBuilder a netlist. Si el árbol ya fue construido con build(),
+        se copian los valores de las hojas y se guarda el mapeo hacia sus Nodo.
+
+        Args:
+            builder: TreeBuilder con num_levels y gate_types
+            ff_map: Diccionario ruta -> (FlipFlop, posición) como el de la consola;
+                    cada flip-flop se agrega con su estado almacenado (los de la salida
+                    de una hoja se omiten: no tienen efecto en ningún evaluador)
+        Returns:
+            Netlist equivalente
+        """
+        opcodes = [opcode_for(gate_class) for gate_class in builder.gate_types]
+        nodes = None
+        if builder._nodes_by_level:
+            nodes = [None]
+            for level in range(1, builder.num_levels + 2):
+                nodes.extend(builder._nodes_by_level[level])
+
+        netlist = cls(builder.num_levels, opcodes, nodes=nodes)
+        if nodes is not None:
+            netlist.load_leaves()
+        for path, (ff, position) in (ff_map or {}).items():
+            if position == 'output' and len(path) == builder.num_levels:
+                continue
+            netlist.add_flipflop(path_to_heap(path), position, ff.value)
+        return netlist
+
+    @property
+    def num_inputs(self) -> int:
+        return 2 ** self.num_levels
+
+    @property
+    def leaf_offset(self) -> int:
+        """Índice de heap de la primera hoja."""
+        return 2 ** self.num_levels
+
+    def gate_class(self, level: int) -> Type[Compuerta]:
+        """Retorna la clase de compuerta del nivel dado (1 = raíz)."""
+        return GATE_BY_OPCODE[self.opcodes[level - 1]]
+
+    def add_flipflop(self, heap: int, position: str = 'input', state: int = 0):
+        """
+        Coloca (o reemplaza) un Flip-Flop SR en un nodo, sin reconstruir la netlist.
+        En la entrada de una compuerta, S es el hijo izquierdo, R el derecho y Q alimenta
+        ambas entradas; en la entrada de una hoja, S es el valor de la hoja y R = 0;
+        en la salida de una compuerta, S es la salida y R = 0.
+
+        Args:
+            heap: Índice de heap del nodo
+            position: 'input' o 'output'
+            state: Estado almacenado inicial (0 o 1)
+        Raises:
+            IndexError: Si el índice no corresponde a un nodo del árbol
+            ValueError: Si la posición no es válida (las hojas solo admiten 'input')
+        """
+        if not 1 <= heap < len(self.values):
+            raise IndexError(f"No existe el nodo con índice de heap {heap}")
+        code = _FF_CODES.get(position)
+        if code is None:
+            raise ValueError(f"Posición de FlipFlop inválida: {position!r}")
+        level = heap.bit_length()
+        if level == self.num_levels + 1 and code == FF_OUTPUT:
+            raise ValueError("Las hojas solo admiten FlipFlop en la entrada")
+        self.ff_positions[heap] = code
+        self.ff_state[heap] = 1 if state else 0
+        self._ff_by_level.setdefault(level, set()).add(heap)
+
+    def remove_flipflop(self, heap: int):
+        """
+        Args:
+            heap: Índice de heap del nodo
+        Raises:
+            KeyError: Si el nodo no tiene flip-flop
+        """
+        if not 1 <= heap < len(self.values) or not self.ff_positions[heap]:
+            raise KeyError(f"El nodo {heap} no tiene FlipFlop")
+        self.ff_positions[heap] = FF_NONE
+        self.ff_state[heap] = 0
+        level = heap.bit_length()
+        self._ff_by_level[level].discard(heap)
+        if not self._ff_by_level[level]:
+            del self._ff_by_level[level]
+
+    def has_flipflop(self, heap: int) -> bool:
+        return self.ff_positions[heap] != FF_NONE
+
+    def flipflops(self) -> List[Tuple[int, str, int]]:
+        """Retorna (heap, posición, estado) de cada flip-flop, ordenados por heap."""
+        return [
+            (heap, _FF_NAMES[self.ff_positions[heap]], self.ff_state[heap])
+            for level in sorted(self._ff_by_level)
+            for heap in sorted(self._ff_by_level[level])
+        ]
+
+    def output(self, heap: int) -> int:
+        """
+        Retorna la señal que el nodo entrega a su padre: el valor del nodo o, para una
+        hoja con flip-flop en su entrada, la salida Q del flip-flop.
+        """
+        if self.ff_positions[heap] and heap >= self.leaf_offset:
+            return self.ff_state[heap]
+        return self.values[heap]
+
+    def set_leaves(self, leaf_values: Sequence[int]):
+        """
+        Args:
+            leaf_values: Un valor (0 o 1) por hoja, de izquierda a derecha
+        Raises:
+            ValueError: Si la cantidad de valores no coincide con la de hojas
+        """
+        if len(leaf_values) != self.num_inputs:
+            raise ValueError(
+                f"Se esperan {self.num_inputs} valores, se recibieron {len(leaf_values)}"
+            )
+        start = self.leaf_offset
+        self.values[start:start + self.num_inputs] = bytes(1 if v else 0 for v in leaf_values)
+        self._leaf_results.clear()
+
+    def get_leaves(self) -> List[int]:
+        """Retorna los valores actuales de las hojas, de izquierda a derecha."""
+        start = self.leaf_offset
+        return list(self.values[start:start + self.num_inputs])
+
+    def load_leaves(self):
+        """
+        Copia los valores de las hojas desde los Nodo mapeados.
+
+        Raises:
+            ValueError: Si la netlist no tiene mapeo hacia Nodo
+        """
+        if self.nodes is None:
+            raise ValueError("La netlist no tiene mapeo hacia Nodo")
+        start = self.leaf_offset
+        self.set_leaves([int(node.value) for node in self.nodes[start:start + self.num_inputs]])
+
+    def evaluate(self) -> int:
+        """
+        Evalúa todos los niveles de abajo hacia arriba, actualizando el estado de los flip-flops.
+
+        Returns:
+            Valor de la raíz
+        """
+        values = self.values
+        self._leaf_results.clear()
+        ff_by_level = self._ff_by_level
+        leaf_ffs = ff_by_level.get(self.num_levels + 1)
+        if leaf_ffs:
+            # Flip-flops en la entrada de las hojas: S = hoja, R = 0
+            state = self.ff_state
+            for heap in leaf_ffs:
+                state[heap] |= values[heap]
+
+        for level in range(self.num_levels, 0, -1):
+            start = 2 ** (level - 1)
+            count = start
+            # Los hijos del nivel ocupan [2*start, 4*start): izquierdos en pares, derechos en impares
+            if leaf_ffs and level == self.num_levels:
+                # Las hojas con flip-flop entregan Q en lugar de su valor
+                children = values[2 * start:4 * start]
+                for heap in leaf_ffs:
+                    children[heap - 2 * start] = self.ff_state[heap]
+                lefts = children[0::2]
+                rights = children[1::2]
+            else:
+                lefts = values[2 * start:4 * start:2]
+                rights = values[2 * start + 1:4 * start:2]
+            # Cada byte de lefts*2 + rights queda en 0..3, así que la suma no genera acarreos
+            codes = (
+                int.from_bytes(lefts, 'big') * 2 + int.from_bytes(rights, 'big')
+            ).to_bytes(count, 'big')
+            table = _TABLES[self.opcodes[level - 1]]
+            values[start:start + count] = codes.translate(table)
+            heaps = ff_by_level.get(level)
+            if heaps:
+                # Solo se corrigen los nodos del nivel que tienen flip-flop
+                for heap in heaps:
+                    values[heap] = self._evaluate_flipflop_node(heap, table)
+        return values[1]
+
+    def update_leaves(self, changes: Dict[int, int]) -> List[int]:
+        """
+        Asigna nuevos valores a algunas hojas y reevalúa solo los caminos hacia la raíz,
+        deteniéndose en los nodos cuya salida no cambia. Requiere que la netlist
+        haya sido evaluada antes con evaluate().
+
+        Args:
+            changes: Diccionario índice de hoja -> nuevo valor (0 o 1)
+        Raises:
+            IndexError: Si algún índice no corresponde a una hoja
+        Returns:
+            Índices de heap de los nodos (hojas incluidas) cuyo valor cambió
+        """
+        values = self.values
+        offset = self.leaf_offset
+        flipped = []
+        dirty = set()
+        positions = self.ff_positions
+        state = self.ff_state
+        for index, value in changes.items():
+            if not 0 <= index < self.num_inputs:
+                raise IndexError(f"No existe la hoja {index}")
+            heap = offset + index
+            value = 1 if value else 0
+            self._leaf_results.pop(heap, None)
+            if values[heap] != value:
+                values[heap] = value
+                flipped.append(heap)
+                if positions[heap]:
+                    # El padre solo cambia si cambia la salida Q del flip-flop
+                    q = value | state[heap]
+                    if q == state[heap]:
+                        continue
+                    state[heap] = q
+                dirty.add(heap >> 1)
+
+        leaf_ff = self.num_levels + 1 in self._ff_by_level
+        level = self.num_levels
+        while dirty:
+            table = _TABLES[self.opcodes[level - 1]]
+            has_ff = level in self._ff_by_level
+            parents = set()
+            for heap in sorted(dirty):
+                if has_ff and positions[heap]:
+                    new = self._evaluate_flipflop_node(heap, table)
+                else:
+                    left, right = 2 * heap, 2 * heap + 1
+                    if leaf_ff and level == self.num_levels:
+                        new = table[(self.output(left) << 1) | self.output(right)]
+                    else:
+                        new = table[(values[left] << 1) | values[right]]
+                if new != values[heap]:
+                    values[heap] = new
+                    flipped.append(heap)
+                    if heap > 1:
+                        parents.add(heap >> 1)
+            dirty = parents
+            level -= 1
+        return flipped
+
+    def _evaluate_flipflop_node(self, heap: int, table: bytes) -> int:
+        # Salida de una compuerta con flip-flop, actualizando su estado
+        state = self.ff_state
+        left = self.output(2 * heap)
+        right = self.output(2 * heap + 1)
+        if self.ff_positions[heap] == FF_INPUT:
+            q = left | (state[heap] & (right ^ 1))
+            state[heap] = q
+            return table[3 * q]
+        q = table[(left << 1) | right] | state[heap]
+        state[heap] = q
+        return q
+
+    def value(self, heap: int) -> int:
+        """Retorna el valor actual del nodo con índice de heap dado."""
+        return self.values[heap]
+
+    def level_values(self, level: int) -> List[int]:
+        """
+        Args:
+            level: Nivel (1 = raíz, num_levels + 1 = hojas)
+        Returns:
+            Valores de los nodos del nivel, de izquierda a derecha
+        """
+        start = 2 ** (level - 1)
+        return list(self.values[start:2 * start])
+
+    def node(self, heap: int) -> 'NetlistNodo':
+        """
+        Materializa bajo demanda una vista Nodo sobre la netlist. La vista lee y escribe
+        directamente en el buffer de valores y crea sus hijos solo cuando se accede a ellos.
+
+        Args:
+            heap: Índice de heap del nodo (la raíz es 1)
+        Raises:
+            IndexError: Si el índice no corresponde a un nodo del árbol
+        Returns:
+            NetlistNodo del índice indicado
+        """
+        if not 1 <= heap < len(self.values):
+            raise IndexError(f"No existe el nodo con índice de heap {heap}")
+        return NetlistNodo(self, heap)
+
+    def path_nodes(self, path: str) -> List['NetlistNodo']:
+        """
+        Args:
+            path: Ruta L/R desde la raíz, como en get_node_by_path
+        Returns:
+            Lista de vistas Nodo desde la raíz hasta el nodo de la ruta (inclusive)
+        """
+        target = path_to_heap(path)
+        return [self.node(target >> shift) for shift in range(len(path), -1, -1)]
+
+    def sync_tree(self):
+        """
+        Vuelca los valores de la netlist en el atributo result de los Nodo mapeados,
+        para que print_tree y la interfaz muestren la última evaluación.
+
+        Raises:
+            ValueError: Si la netlist no tiene mapeo hacia Nodo
+        """
+        if self.nodes is None:
+            raise ValueError("La netlist no tiene mapeo hacia Nodo")
+        values = self.values
+        leaf_offset = self.leaf_offset
+        for heap in range(1, leaf_offset):
+            self.nodes[heap].result = values[heap]
+        # Una hoja con flip-flop en su entrada muestra la salida Q, como NetlistNodo.result
+        for heap in range(leaf_offset, len(self.nodes)):
+            self.nodes[heap].result = self.output(heap)
+
+    def __repr__(self) -> str:
+        gates = ", ".join(GATE_BY_OPCODE[op].__name__ for op in self.opcodes)
+        return f"Netlist(niveles={self.num_levels}, compuertas=[{gates}])"
+
+
+class NetlistNodo(Nodo):
+    """
+    Vista de un nodo de la netlist con la misma interfaz que Nodo. Se crea bajo demanda
+    y no guarda valores propios: value y result se leen y escriben en el buffer de la netlist.
+    En una hoja, result se guarda aparte de value, porque un evaluador externo puede escribir
+    allí la salida de un flip-flop sin que eso cambie la entrada.
+    """
+
+    def __init__(self, netlist: Netlist, heap: int):
+        self.netlist = netlist
+        self.heap = heap
+        level = heap.bit_length()
+        self._is_gate = level <= netlist.num_levels
+        self.gate = netlist.gate_class(level)() if self._is_gate else None
+        self._level_plan = None
+
+    @property
+    def left(self) -> Optional['NetlistNodo']:
+        return NetlistNodo(self.netlist, 2 * self.heap) if self._is_gate else None
+
+    @property
+    def right(self) -> Optional['NetlistNodo']:
+        return NetlistNodo(self.netlist, 2 * self.heap + 1) if self._is_gate else None
+
+    @property
+    def value(self) -> Optional[int]:
+        return None if self._is_gate else self.netlist.values[self.heap]
+
+    @value.setter
+    def value(self, value: int):
+        if self._is_gate:
+            raise ValueError("Solo las hojas tienen valor de entrada")
+        self.netlist.values[self.heap] = 1 if value else 0
+        self.netlist._leaf_results.pop(self.heap, None)
+
+    @property
+    def result(self) -> int:
+        if self._is_gate:
+            return self.netlist.values[self.heap]
+        return self.netlist._leaf_results.get(self.heap, self.netlist.output(self.heap))
+
+    @result.setter
+    def result(self, value: int):
+        if self._is_gate:
+            self.netlist.values[self.heap] = int(value)
+        else:
+            self.netlist._leaf_results[self.heap] = int(value)
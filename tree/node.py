@@ -28,6 +28,8 @@ class Nodo:
         self.right = right
         self.value = value
         self.result = None
+        # Plan de evaluación del árbol cuando este nodo es la raíz (tree.evaluation.plan_for)
+        self._level_plan = None
 
     def is_leaf(self) -> bool:
         return (
@@ -0,0 +1,225 @@
+#optimize.py
+#Este módulo implementa una pasada de simplificación del circuito antes de evaluarlo.
+#El árbol se traduce a un grafo de compuertas AND y XOR con aristas que pueden estar negadas
+#(un "literal" es 2*id + negado), de modo que NAND, NOR y OR se expresan con negaciones gratuitas:
+#  - propagación de constantes: las hojas fijadas se vuelven constantes y subárboles completos
+#    pueden colapsar (AND con 0, OR con 1, XOR con constante = identidad o negación),
+#  - eliminación de doble negación (NAND sobre NAND, NOR sobre NOR, negar dos veces un literal),
+#  - idempotencia y complementos: AND(x, x) = x, AND(x, ~x) = 0, XOR(x, x) = 0, XOR(x, ~x) = 1,
+#  - hashing estructural: dos compuertas con las mismas entradas se comparten.
+#El resultado (ReducedCircuit) evalúa vectores sueltos o lotes bit-paralelos (como BatchEvaluator)
+#y su salida coincide siempre con la del árbol original para cualquier valor de las hojas libres.
+
+from gates.flipflop import FlipFlop
+from tree.builder import TreeBuilder
+from tree.netlist import OP_AND, OP_NAND, OP_NOR, OP_OR, opcode_for
+from typing import Dict, List, Optional, Sequence, Tuple
+
+# Operaciones del grafo reducido
+_AND = '&'
+_XOR = '^'
+
+# Literales constantes (nodo 0 = falso)
+FALSE = 0
+TRUE = 1
+
+
+class _GraphBuilder:
+    # Construye el grafo aplicando las reglas de simplificación en cada compuerta creada
+
+    def __init__(self):
+        self.nodes: List[Tuple[str, int, int]] = [('const', 0, 0)]
+        self.inputs: Dict[int, int] = {}
+        self._table: Dict[Tuple[str, int, int], int] = {}
+
+    def input(self, leaf: int) -> int:
+        self.nodes.append(('in', leaf, 0))
+        node = len(self.nodes) - 1
+        self.inputs[node] = leaf
+        return 2 * node
+
+    def _node(self, op: str, a: int, b: int) -> int:
+        key = (op, a, b)
+        node = self._table.get(key)
+        if node is None:
+            self.nodes.append(key)
+            node = len(self.nodes) - 1
+            self._table[key] = node
+        return 2 * node
+
+    def make_and(self, a: int, b: int) -> int:
+        if a > b:
+            a, b = b, a
+        if a == FALSE:
+            return FALSE
+        if a == TRUE or a == b:
+            return b
+        if a == b ^ 1:
+            return FALSE
+        return self._node(_AND, a, b)
+
+    def make_xor(self, a: int, b: int) -> int:
+        # La negación de las entradas pasa a la salida: XOR(~a, b) = ~XOR(a, b)
+        negated = (a ^ b) & 1
+        a &= ~1
+        b &= ~1
+        if a > b:
+            a, b = b, a
+        if a == FALSE:
+            return b ^ negated
+        if a == b:
+            return negated
+        return self._node(_XOR, a, b) ^ negated
+
+    def make_gate(self, opcode: int, a: int, b: int) -> int:
+        if opcode == OP_AND:
+            return self.make_and(a, b)
+        if opcode == OP_NAND:
+            return self.make_and(a, b) ^ 1
+        if opcode == OP_OR:
+            return self.make_and(a ^ 1, b ^ 1) ^ 1
+        if opcode == OP_NOR:
+            return self.make_and(a ^ 1, b ^ 1)
+        return self.make_xor(a, b)
+
+
+class ReducedCircuit:
+    """
+    Circuito simplificado equivalente a un árbol de TreeBuilder con algunas hojas fijadas.
+
+    Attributes:
+        num_inputs: Cantidad de hojas del circuito original
+        fixed: Diccionario índice de hoja -> valor de las hojas fijadas
+        gates: Lista de compuertas (operación, literal a, literal b) en orden topológico;
+               la compuerta k produce el nodo num_free + 1 + k
+        output: Literal de la salida (2*nodo + negado)
+        support: Hojas libres de las que realmente depende la salida, en orden
+        original_gates: Compuertas del árbol original
+    """
+
+    def __init__(self, num_inputs: int, fixed: Dict[int, int], inputs: List[int],
+                 gates: List[Tuple[str, int, int]], output: int, original_gates: int):
+        self.num_inputs = num_inputs
+        self.fixed = fixed
+        self._inputs = inputs
+        self.gates = gates
+        self.output = output
+        self.original_gates = original_gates
+        self.support = list(inputs)
+
+    @property
+    def gates_removed(self) -> int:
+        """Cantidad de compuertas eliminadas respecto al árbol original."""
+        return self.original_gates - len(self.gates)
+
+    def evaluate(self, leaves: Sequence[int]) -> int:
+        """
+        Args:
+            leaves: Un valor por hoja del circuito original (las hojas fijadas se ignoran)
+        Returns:
+            Salida del circuito
+        """
+        return self._run([1 if leaves[leaf] else 0 for leaf in self._inputs], 1)
+
+    def evaluate_batch(self, columns: Sequence[int], count: int) -> int:
+        """
+        Evalúa un lote de vectores empaquetados, como BatchEvaluator.evaluate.
+
+        Args:
+            columns: Una columna por hoja del circuito original (ver tree.batch.pack_vectors)
+            count: Cantidad de vectores del lote
+        Raises:
+            ValueError: Si la cantidad de columnas no coincide con la de hojas
+        Returns:
+            Columna de salida (el bit k es la salida del vector k)
+        """
+        if len(columns) != self.num_inputs:
+            raise ValueError(
+                f"Se esperan {self.num_inputs} columnas, se recibieron {len(columns)}"
+            )
+        mask = (1 << count) - 1
+        return self._run([columns[leaf] & mask for leaf in self._inputs], mask)
+
+    def _run(self, inputs: List[int], mask: int) -> int:
+        # values[n] es el valor del nodo n; un literal negado se obtiene con XOR contra mask
+        values = [0]
+        values.extend(inputs)
+        for op, a, b in self.gates:
+            left = values[a >> 1] ^ (mask if a & 1 else 0)
+            right = values[b >> 1] ^ (mask if b & 1 else 0)
+            values.append(left & right if op == _AND else left ^ right)
+        return values[self.output >> 1] ^ (mask if self.output & 1 else 0)
+
+    def __repr__(self) -> str:
+        return (
+            f"ReducedCircuit(compuertas={len(self.gates)}, eliminadas={self.gates_removed}, "
+            f"entradas_libres={len(self._inputs)})"
+        )
+
+
+def optimize(builder: TreeBuilder, fixed: Optional[Dict[int, int]] = None) -> ReducedCircuit:
+    """
+    Simplifica el circuito de builder con las hojas de fixed fijadas a constantes.
+
+    Args:
+        builder: TreeBuilder que describe el circuito (no requiere build())
+        fixed: Diccionario índice de hoja -> valor (0 o 1) de las hojas constantes
+    Raises:
+        ValueError: Si algún nivel es un FlipFlop (solo se simplifica lógica combinacional)
+        IndexError: Si algún índice de fixed no corresponde a una hoja
+    Returns:
+        ReducedCircuit equivalente
+    """
+    if any(issubclass(gate_class, FlipFlop) for gate_class in builder.gate_types):
+        raise ValueError("Solo se pueden simplificar circuitos combinacionales (sin FlipFlop)")
+    num_inputs = 2 ** builder.num_levels
+    fixed = {index: 1 if value else 0 for index, value in (fixed or {}).items()}
+    for index in fixed:
+        if not 0 <= index < num_inputs:
+            raise IndexError(f"No existe la hoja {index}")
+
+    graph = _GraphBuilder()
+    current = [
+        (TRUE if fixed[i] else FALSE) if i in fixed else graph.input(i)
+        for i in range(num_inputs)
+    ]
+    for level_idx in range(builder.num_levels - 1, -1, -1):
+        opcode = opcode_for(builder.gate_types[level_idx])
+        current = [
+            graph.make_gate(opcode, current[i], current[i + 1])
+            for i in range(0, len(current), 2)
+        ]
+    return _compact(graph, current[0], num_inputs, fixed)
+
+
+def _compact(graph: _GraphBuilder, output: int, num_inputs: int, fixed: Dict[int, int]) -> ReducedCircuit:
+    # Conserva solo los nodos alcanzables desde la salida y los renumera:
+    # 0 = constante, 1..k = hojas libres del soporte, luego las compuertas en orden topológico
+    nodes = graph.nodes
+    reachable = set()
+    pending = [output >> 1]
+    while pending:
+        node = pending.pop()
+        if node in reachable:
+            continue
+        reachable.add(node)
+        op, a, b = nodes[node]
+        if op in (_AND, _XOR):
+            pending.append(a >> 1)
+            pending.append(b >> 1)
+
+    input_nodes = sorted((n for n in reachable if n in graph.inputs), key=graph.inputs.get)
+    renumber = {0: 0}
+    for n in input_nodes:
+        renumber[n] = len(renumber)
+    gates = []
+    # Los nodos se crearon después de sus entradas, así que el orden de creación es topológico
+    for n in sorted(reachable):
+        op, a, b = nodes[n]
+        if op in (_AND, _XOR):
+            renumber[n] = len(renumber)
+            gates.append((op, 2 * renumber[a >> 1] | (a & 1), 2 * renumber[b >> 1] | (b & 1)))
+    output = 2 * renumber[output >> 1] | (output & 1)
+    return ReducedCircuit(
+        num_inputs, fixed, [graph.inputs[n] for n in input_nodes], gates, output, num_inputs - 1
+    )
@@ -0,0 +1,225 @@
+#parallel.py
+#Este módulo reparte un barrido exhaustivo de la tabla de verdad entre varios procesos.
+#El espacio de entradas (filas 0 .. 2^n - 1, ver truth_table) se divide en rangos alineados
+#("shards") y cada proceso evalúa el suyo por bloques con el evaluador bit-paralelo.
+#Al proceso solo se le envía una descripción compacta y serializable del circuito (CircuitSpec):
+#el opcode de cada nivel y los Flip-Flops con su posición y estado almacenado.
+#Resultados soportados:
+#  - 'count':  cantidad de filas cuya salida es 1
+#  - 'first':  primera fila (en orden binario) cuya salida es 1; en cuanto un shard la
+#              encuentra, los shards posteriores se cancelan o abandonan su trabajo
+#  - 'bitmap': bitmap completo de salidas, igual al de truth_table.write_bitmap
+
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from gates import FlipFlop
+from tree.builder import TreeBuilder
+from tree.netlist import GATE_BY_OPCODE, opcode_for
+from tree.truth_table import iter_chunks
+from typing import Dict, List, Optional, Tuple
+
+MODES = ('count', 'first', 'bitmap')
+
+# Mejor fila encontrada en modo 'first', compartida entre procesos (ver _init_worker)
+_best_row = None
+
+
+class CircuitSpec:
+    """
+    Descripción compacta y serializable de un circuito de TreeBuilder.
+
+    Attributes:
+        opcodes: Opcode de cada nivel (ver tree.netlist), empezando por la raíz
+        flipflops: Tupla de (ruta, posición, estado) por cada FlipFlop
+    """
+
+    def __init__(self, opcodes: bytes, flipflops: Tuple[Tuple[str, str, int], ...] = ()):
+        self.opcodes = bytes(opcodes)
+        self.flipflops = tuple(flipflops)
+
+    @classmethod
+    def from_builder(cls, builder: TreeBuilder, ff_map: Optional[Dict[str, tuple]] = None) -> 'CircuitSpec':
+        """
+        Args:
+            builder: TreeBuilder que describe el circuito
+            ff_map: Diccionario ruta -> (FlipFlop, posición) como el de la consola
+        Returns:
+            CircuitSpec equivalente
+        """
+        opcodes = bytes(opcode_for(gate_class) for gate_class in builder.gate_types)
+        flipflops = tuple(
+            (path, position, int(ff.value))
+            for path, (ff, position) in sorted((ff_map or {}).items())
+        )
+        return cls(opcodes, flipflops)
+
+    @property
+    def num_levels(self) -> int:
+        return len(self.opcodes)
+
+    @property
+    def num_inputs(self) -> int:
+        return 2 ** len(self.opcodes)
+
+    def builder(self) -> TreeBuilder:
+        """Retorna un TreeBuilder (sin construir) con las compuertas de cada nivel."""
+        return TreeBuilder(self.num_levels, [GATE_BY_OPCODE[op] for op in self.opcodes])
+
+    def ff_map(self) -> Dict[str, tuple]:
+        """Retorna un ff_map con FlipFlop nuevos inicializados con el estado guardado."""
+        ff_map = {}
+        for path, position, state in self.flipflops:
+            ff = FlipFlop()
+            ff.value = state
+            ff_map[path] = (ff, position)
+        return ff_map
+
+    def __eq__(self, other) -> bool:
+        return (
+            isinstance(other, CircuitSpec)
+            and self.opcodes == other.opcodes
+            and self.flipflops == other.flipflops
+        )
+
+    def __repr__(self) -> str:
+        gates = ", ".join(GATE_BY_OPCODE[op].__name__ for op in self.opcodes)
+        return f"CircuitSpec([{gates}], flipflops={len(self.flipflops)})"
+
+
+class SweepResult:
+    """
+    Resultado combinado de un barrido.
+
+    Attributes:
+        mode: Modo del barrido ('count', 'first' o 'bitmap')
+        rows: Cantidad total de filas del espacio de entradas
+        ones: Cantidad de filas con salida 1 (modo 'count')
+        first: Primera fila con salida 1 o None (modo 'first')
+        bitmap: Bitmap de salidas (modo 'bitmap')
+    """
+
+    def __init__(self, mode: str, rows: int, ones: Optional[int] = None,
+                 first: Optional[int] = None, bitmap: Optional[bytes] = None):
+        self.mode = mode
+        self.rows = rows
+        self.ones = ones
+        self.first = first
+        self.bitmap = bitmap
+
+    def first_inputs(self) -> Optional[List[int]]:
+        """Retorna los valores de las hojas de la primera fila encontrada, o None."""
+        if self.first is None:
+            return None
+        num_inputs = self.rows.bit_length() - 1
+        return [int(c) for c in format(self.first, f'0{num_inputs}b')]
+
+    def __repr__(self) -> str:
+        return f"SweepResult(mode={self.mode!r}, rows={self.rows}, ones={self.ones}, first={self.first})"
+
+
+def _init_worker(best_row):
+    global _best_row
+    _best_row = best_row
+
+
+def _sweep_shard(spec: CircuitSpec, start: int, stop: int, mode: str, chunk_bits: int):
+    builder = spec.builder()
+    ff_map = spec.ff_map()
+    if mode == 'count':
+        return sum(
+            bin(outputs).count('1')
+            for _, _, outputs in iter_chunks(builder, chunk_bits, start, stop, ff_map)
+        )
+    if mode == 'bitmap':
+        return b''.join(
+            outputs.to_bytes(max(1, count // 8), 'little')
+            for _, count, outputs in iter_chunks(builder, chunk_bits, start, stop, ff_map)
+        )
+
+    # Modo 'first': se abandona el shard si otro ya encontró una fila anterior
+    for base, _, outputs in iter_chunks(builder, chunk_bits, start, stop, ff_map):
+        if _best_row is not None and _best_row.value < base:
+            return None
+        if outputs:
+            row = base + (outputs & -outputs).bit_length() - 1
+            if _best_row is not None:
+                with _best_row.get_lock():
+                    if row < _best_row.value:
+                        _best_row.value = row
+            return row
+    return None
+
+
+def _shard_ranges(num_inputs: int, chunk_bits: int, shards: int) -> List[Tuple[int, int]]:
+    total = 2 ** num_inputs
+    # Tamaño de shard potencia de dos, nunca menor que un bloque
+    shard_bits = max(chunk_bits, num_inputs - max(0, (shards - 1).bit_length()))
+    shard_bits = min(shard_bits, num_inputs)
+    size = 2 ** shard_bits
+    return [(start, start + size) for start in range(0, total, size)]
+
+
+def parallel_sweep(
+    builder: TreeBuilder,
+    mode: str = 'count',
+    ff_map: Optional[Dict[str, tuple]] = None,
+    workers: Optional[int] = None,
+    shards: Optional[int] = None,
+    chunk_bits: int = 16
+) -> SweepResult:
+    """
+    Barre todo el espacio de entradas del circuito repartiéndolo entre procesos.
+    Cada fila se evalúa partiendo del estado almacenado en los FlipFlop (ver BatchEvaluator).
+
+    Args:
+        builder: TreeBuilder que describe el circuito
+        mode: 'count', 'first' o 'bitmap'
+        ff_map: Diccionario ruta -> (FlipFlop, posición) como el de la consola
+        workers: Cantidad de procesos (por defecto, os.cpu_count())
+        shards: Cantidad de rangos en que se divide el espacio (por defecto, 4 por proceso)
+        chunk_bits: Cada bloque evaluado cubre 2^chunk_bits filas
+    Raises:
+        ValueError: Si el modo no es válido
+    Returns:
+        SweepResult con el resultado combinado
+    """
+    if mode not in MODES:
+        raise ValueError(f"Modo desconocido: {mode!r} (use {', '.join(MODES)})")
+
+    spec = CircuitSpec.from_builder(builder, ff_map)
+    workers = workers or os.cpu_count() or 1
+    shards = shards or 4 * workers
+    # Con bloques de al menos 8 filas el bitmap de cada shard ocupa bytes completos
+    chunk_bits = min(max(chunk_bits, 3), spec.num_inputs)
+    ranges = _shard_ranges(spec.num_inputs, chunk_bits, shards)
+    rows = 2 ** spec.num_inputs
+
+    context = multiprocessing.get_context()
+    best_row = context.Value('q', rows) if mode == 'first' else None
+    executor = ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=context,
+        initializer=_init_worker,
+        initargs=(best_row,)
+    )
+    with executor:
+        futures = [
+            executor.submit(_sweep_shard, spec, start, stop, mode, chunk_bits)
+            for start, stop in ranges
+        ]
+
+        if mode == 'count':
+            return SweepResult(mode, rows, ones=sum(f.result() for f in futures))
+        if mode == 'bitmap':
+            return SweepResult(mode, rows, bitmap=b''.join(f.result() for f in futures))
+
+        # Los shards se revisan en orden: el primero con resultado es la respuesta,
+        # y los posteriores que aún no empezaron se cancelan
+        first = None
+        for future in futures:
+            if first is not None:
+                future.cancel()
+                continue
+            first = future.result()
+        return SweepResult(mode, rows, first=first)
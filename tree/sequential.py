@@ -0,0 +1,206 @@
+#sequential.py
+#Este módulo implementa la simulación secuencial (por ciclos de reloj) de circuitos con
+#cualquier cantidad de Flip-Flops SR, ubicados en la entrada o salida de nodos como en el ff_map
+#de la consola. En cada ciclo se aplica un vector de entrada, cada flip-flop actualiza su estado
+#y se registra la salida de la raíz; el estado se conserva de un ciclo al siguiente.
+#
+#Para simular millones de ciclos la evaluación es bit-paralela en el tiempo: el bit t de cada
+#columna es el valor de la señal en el ciclo t. La lógica combinacional se evalúa con una operación
+#bit a bit por compuerta para todo un bloque de ciclos, y cada flip-flop se resuelve con sr_scan
+#(la rutina de FlipFlop.operar_batch), que calcula la secuencia Q_t = S_t | (Q_{t-1} & ~R_t)
+#completa con aritmética de enteros.
+#Como la entrada de un flip-flop solo depende de su subárbol, basta procesar los niveles de abajo
+#hacia arriba. El resultado coincide ciclo a ciclo con llamar a evaluate_with_flipflop por vector.
+
+from gates.flipflop import sr_scan
+from tree.batch import _bitwise_op, pack_vectors, unpack_column
+from tree.builder import TreeBuilder
+from tree.evaluation import path_to_position
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+
+class Waveform:
+    """
+    Formas de onda de una simulación.
+
+    Attributes:
+        cycles: Cantidad de ciclos simulados
+        output: Columna empaquetada con la salida de la raíz en cada ciclo
+        flipflops: Columna empaquetada de Q por ruta de cada flip-flop
+    """
+
+    def __init__(self, cycles: int, output: int, flipflops: Dict[str, int]):
+        self.cycles = cycles
+        self.output = output
+        self.flipflops = flipflops
+
+    def output_values(self) -> List[int]:
+        """Retorna la salida de la raíz de cada ciclo como lista de 0/1."""
+        return unpack_column(self.output, self.cycles)
+
+    def flipflop_values(self, path: str) -> List[int]:
+        """
+        Args:
+            path: Ruta L/R del flip-flop
+        Returns:
+            Estado Q del flip-flop en cada ciclo
+        """
+        return unpack_column(self.flipflops[path.upper()], self.cycles)
+
+    def __repr__(self) -> str:
+        return f"Waveform(ciclos={self.cycles}, flipflops={len(self.flipflops)})"
+
+
+class SequentialSimulator:
+    """
+    Simulador por ciclos de un circuito de TreeBuilder con Flip-Flops SR.
+    El estado de todos los flip-flops se guarda en un bytearray (uno por flip-flop).
+    """
+
+    def __init__(self, builder: TreeBuilder, ff_map: Optional[Dict[str, tuple]] = None):
+        """
+        Args:
+            builder: TreeBuilder que describe el circuito
+            ff_map: Diccionario ruta -> (FlipFlop, posición) como el de la consola;
+                    el estado inicial se toma de FlipFlop.value
+        Raises:
+            ValueError: Si alguna ruta está fuera del árbol
+        """
+        self.num_levels = builder.num_levels
+        self.num_inputs = 2 ** builder.num_levels
+        self._ops = [_bitwise_op(gate_class) for gate_class in builder.gate_types]
+
+        ff_map = {path.upper(): entry for path, entry in (ff_map or {}).items()}
+        self.paths = sorted(ff_map)
+        self._flipflops = [ff_map[path][0] for path in self.paths]
+        self.state = bytearray(int(ff.value) for ff in self._flipflops)
+
+        # Flip-flops por nivel: {nivel: {índice: (posición, slot de estado)}}
+        self._ff_by_level: Dict[int, Dict[int, Tuple[str, int]]] = {}
+        for slot, path in enumerate(self.paths):
+            level, index = path_to_position(path)
+            if level > self.num_levels + 1 or index >= 2 ** (level - 1):
+                raise ValueError(f"Ruta de FlipFlop fuera del árbol: {path!r}")
+            self._ff_by_level.setdefault(level, {})[index] = (ff_map[path][1], slot)
+
+    def snapshot(self) -> bytes:
+        """Retorna una copia inmutable del estado de todos los flip-flops."""
+        return bytes(self.state)
+
+    def restore(self, snapshot: bytes):
+        """
+        Args:
+            snapshot: Estado devuelto por snapshot()
+        Raises:
+            ValueError: Si el snapshot no corresponde a este circuito
+        """
+        if len(snapshot) != len(self.state):
+            raise ValueError(
+                f"El snapshot tiene {len(snapshot)} estados, se esperan {len(self.state)}"
+            )
+        self.state[:] = snapshot
+
+    def sync_flipflops(self):
+        """Copia el estado actual a los objetos FlipFlop del ff_map original."""
+        for ff, state in zip(self._flipflops, self.state):
+            ff.value = state
+
+    def step_columns(self, columns: Sequence[int], count: int) -> Tuple[int, List[int]]:
+        """
+        Simula un bloque de ciclos con las entradas ya empaquetadas y avanza el estado.
+
+        Args:
+            columns: Una columna por hoja; el bit t es el valor de la hoja en el ciclo t
+            count: Cantidad de ciclos del bloque
+        Raises:
+            ValueError: Si la cantidad de columnas no coincide con la de hojas
+        Returns:
+            Tupla (columna de salida de la raíz, columna de Q de cada flip-flop en el orden de paths)
+        """
+        if len(columns) != self.num_inputs:
+            raise ValueError(
+                f"Se esperan {self.num_inputs} columnas, se recibieron {len(columns)}"
+            )
+        mask = (1 << count) - 1
+        state = self.state
+        waves = [0] * len(state)
+        current = [column & mask for column in columns]
+
+        # Flip-flops en la entrada de las hojas: S = hoja, R = 0
+        for index, (position, slot) in self._ff_by_level.get(self.num_levels + 1, {}).items():
+            if position == 'input':
+                current[index], state[slot] = sr_scan(current[index], 0, state[slot], count)
+                waves[slot] = current[index]
+
+        for level_idx in range(self.num_levels - 1, -1, -1):
+            op = self._ops[level_idx]
+            flipflops = self._ff_by_level.get(level_idx + 1)
+            if flipflops is None:
+                current = [
+                    op(current[i], current[i + 1], mask)
+                    for i in range(0, len(current), 2)
+                ]
+                continue
+
+            result = []
+            for index in range(len(current) // 2):
+                left, right = current[2 * index], current[2 * index + 1]
+                entry = flipflops.get(index)
+                if entry is not None and entry[0] == 'input':
+                    # S = izquierda, R = derecha; Q alimenta ambas entradas de la compuerta
+                    q, state[entry[1]] = sr_scan(left, right, state[entry[1]], count)
+                    waves[entry[1]] = left = right = q
+                out = op(left, right, mask)
+                if entry is not None and entry[0] == 'output':
+                    out, state[entry[1]] = sr_scan(out, 0, state[entry[1]], count)
+                    waves[entry[1]] = out
+                result.append(out)
+            current = result
+
+        return current[0], waves
+
+    def run(self, vectors: Iterable[Sequence[int]], cycles: Optional[int] = None,
+            chunk_size: int = 4096) -> Waveform:
+        """
+        Simula un ciclo por cada vector de entrada, procesando el flujo por bloques.
+
+        Args:
+            vectors: Flujo de vectores de entrada (uno por ciclo)
+            cycles: Cantidad máxima de ciclos (None = hasta agotar el flujo)
+            chunk_size: Ciclos por bloque (se redondea a múltiplo de 8)
+        Returns:
+            Waveform con la salida de la raíz y el estado de cada flip-flop por ciclo
+        """
+        chunk_size = max(8, chunk_size - chunk_size % 8)
+        output_parts = []
+        ff_parts = [[] for _ in self.paths]
+        total = 0
+        iterator = iter(vectors)
+
+        while cycles is None or total < cycles:
+            limit = chunk_size if cycles is None else min(chunk_size, cycles - total)
+            block = []
+            for vector in iterator:
+                block.append(vector)
+                if len(block) == limit:
+                    break
+            if not block:
+                break
+
+            count = len(block)
+            out, waves = self.step_columns(pack_vectors(block, self.num_inputs), count)
+            # Todos los bloques salvo el último tienen un múltiplo de 8 ciclos
+            nbytes = (count + 7) // 8
+            output_parts.append(out.to_bytes(nbytes, 'little'))
+            for parts, wave in zip(ff_parts, waves):
+                parts.append(wave.to_bytes(nbytes, 'little'))
+            total += count
+            if count < limit:
+                break
+
+        output = int.from_bytes(b''.join(output_parts), 'little')
+        flipflops = {
+            path: int.from_bytes(b''.join(parts), 'little')
+            for path, parts in zip(self.paths, ff_parts)
+        }
+        return Waveform(total, output, flipflops)
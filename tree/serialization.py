@@ -0,0 +1,376 @@
+#serialization.py
+#Este módulo permite guardar y cargar circuitos completos: la compuerta de cada nivel,
+#los valores de las hojas y los Flip-Flops SR (ruta, posición y estado almacenado en
+#FlipFlop.value), que hasta ahora solo existían dentro de una sesión de la consola.
+#Hay dos formatos:
+#  - JSON, legible por personas (to_dict / from_dict, save_json / load_json)
+#  - binario compacto (dumps / loads_builder / loads_netlist, save / load), con esta estructura
+#    (enteros little-endian):
+#        cabecera   "ACLC", versión (u8), niveles (u8), reservado (u16), cantidad de flip-flops (u32)
+#        opcodes    un byte por nivel, empezando por la raíz (ver tree.netlist)
+#        flip-flops por cada uno: índice de heap (u32), posición (u8: 0 = input, 1 = output), estado (u8)
+#        hojas      bitmap empaquetado; el bit i (bit 0 = menos significativo del primer byte)
+#                   es el valor de la hoja i
+#El bitmap de hojas va al final para poder leerlo con mmap sin cargar el archivo (LeafBitmap).
+#loads_netlist reconstruye directamente la Netlist sin crear Nodo, así un circuito de 20
+#niveles se carga en milisegundos; loads_builder reconstruye el árbol de Nodo con build().
+
+import json
+import mmap
+import struct
+from gates.flipflop import FlipFlop
+from tree.builder import TreeBuilder
+from tree.netlist import GATE_BY_OPCODE, Netlist, heap_to_path, opcode_for, path_to_heap
+from tree.node import Nodo
+from typing import Dict, List, Tuple, Union
+
+MAGIC = b'ACLC'
+VERSION = 1
+
+_HEADER = struct.Struct('<4sBBHI')
+_FLIPFLOP = struct.Struct('<IBB')
+_POSITIONS = ('input', 'output')
+
+_TO_CHARS = bytes.maketrans(b'\x00\x01', b'01')
+_FROM_CHARS = bytes.maketrans(b'01', b'\x00\x01')
+
+
+def _circuit_parts(circuit: Union[TreeBuilder, Netlist]) -> Tuple[int, bytes, bytes]:
+    # (niveles, opcodes, un byte 0/1 por hoja) de un TreeBuilder o de una Netlist
+    if isinstance(circuit, Netlist):
+        start = circuit.leaf_offset
+        return circuit.num_levels, circuit.opcodes, bytes(circuit.values[start:start + circuit.num_inputs])
+
+    opcodes = bytes(opcode_for(gate_class) for gate_class in circuit.gate_types)
+    if circuit._nodes_by_level:
+        leaves = bytes(1 if leaf.value else 0 for leaf in circuit.get_leaves())
+    else:
+        leaves = bytes(2 ** circuit.num_levels)
+    return circuit.num_levels, opcodes, leaves
+
+
+def _flipflop_table(ff_map: Dict[str, tuple]) -> List[Tuple[int, str, int]]:
+    # Lista de (heap, posición, estado) ordenada por heap
+    table = []
+    for path, (ff, position) in ff_map.items():
+        if position not in _POSITIONS:
+            raise ValueError(f"Posición de FlipFlop inválida: {position!r}")
+        table.append((path_to_heap(path), position, 1 if ff.value else 0))
+    return sorted(table)
+
+
+def _check_flipflops(table: List[Tuple[int, str, int]], num_levels: int) -> List[Tuple[int, str, int]]:
+    # Valida la tabla leída de un archivo (nodo dentro del árbol, posición y estado 0/1)
+    # y la retorna con los estados como int
+    for heap, position, state in table:
+        if not 1 <= heap < 2 ** (num_levels + 1):
+            raise ValueError(f"FlipFlop fuera del árbol: índice de heap {heap}")
+        if position not in _POSITIONS:
+            raise ValueError(f"Posición de FlipFlop inválida: {position!r}")
+        if state not in (0, 1):
+            raise ValueError(f"Estado de FlipFlop inválido: {state!r}")
+    return [(heap, position, int(state)) for heap, position, state in table]
+
+
+def _make_ff_map(table: List[Tuple[int, str, int]]) -> Dict[str, tuple]:
+    ff_map = {}
+    for heap, position, state in table:
+        ff = FlipFlop()
+        ff.value = state
+        ff_map[heap_to_path(heap)] = (ff, position)
+    return ff_map
+
+
+def pack_leaves(leaves: bytes) -> bytes:
+    """
+    Args:
+        leaves: Un byte 0/1 por hoja
+    Returns:
+        Bitmap empaquetado (bit i = hoja i, little-endian)
+    """
+    if not leaves:
+        return b''
+    bits = int(leaves[::-1].translate(_TO_CHARS), 2)
+    return bits.to_bytes((len(leaves) + 7) // 8, 'little')
+
+
+def unpack_leaves(bitmap: bytes, count: int) -> bytes:
+    """
+    Args:
+        bitmap: Bitmap empaquetado como el de pack_leaves
+        count: Cantidad de hojas
+    Returns:
+        Un byte 0/1 por hoja
+    """
+    bits = int.from_bytes(bitmap[:(count + 7) // 8], 'little')
+    return format(bits, f'0{count}b')[-count:][::-1].encode('ascii').translate(_FROM_CHARS)
+
+
+def to_dict(circuit: Union[TreeBuilder, Netlist], ff_map: Dict[str, tuple] = None) -> dict:
+    """
+    Args:
+        circuit: TreeBuilder (construido o no) o Netlist
+        ff_map: Diccionario ruta -> (FlipFlop, posición) como el de la consola
+    Raises:
+        ValueError: Si algún nivel no tiene una compuerta serializable
+    Returns:
+        Diccionario apto para JSON
+    """
+    num_levels, opcodes, leaves = _circuit_parts(circuit)
+    return {
+        "version": VERSION,
+        "levels": num_levels,
+        "gates": [GATE_BY_OPCODE[op].__name__ for op in opcodes],
+        "leaves": leaves.translate(_TO_CHARS).decode('ascii'),
+        "flipflops": [
+            {"path": heap_to_path(heap), "position": position, "state": state}
+            for heap, position, state in _flipflop_table(ff_map or {})
+        ],
+    }
+
+
+def _field(data: dict, key: str, kind, where: str = "circuito"):
+    # Valor de una clave obligatoria del formato JSON, con el tipo esperado
+    value = data.get(key) if isinstance(data, dict) else None
+    if value is None or not isinstance(value, kind) or (kind is int and isinstance(value, bool)):
+        raise ValueError(f"Falta el campo {key!r} o no es válido ({where})")
+    return value
+
+
+def _parse_dict(data: dict) -> Tuple[int, bytes, bytes, List[Tuple[int, str, int]]]:
+    if not isinstance(data, dict) or data.get("version") != VERSION:
+        version = data.get("version") if isinstance(data, dict) else None
+        raise ValueError(f"Versión de circuito no soportada: {version!r}")
+    names = {gate_class.__name__: op for op, gate_class in enumerate(GATE_BY_OPCODE)}
+    num_levels = _field(data, "levels", int)
+    if num_levels < 1:
+        raise ValueError("Mínimo 1 nivel de compuertas")
+    gates = _field(data, "gates", list)
+    if len(gates) != num_levels:
+        raise ValueError(f"Se esperan {num_levels} compuertas, se recibieron {len(gates)}")
+    opcodes = bytearray()
+    for name in gates:
+        op = names.get(name.upper()) if isinstance(name, str) else None
+        if op is None:
+            raise ValueError(f"Compuerta desconocida: {name!r}")
+        opcodes.append(op)
+    leaves = _field(data, "leaves", str).encode('ascii', 'replace')
+    if len(leaves) != 2 ** num_levels or leaves.strip(b'01'):
+        raise ValueError(f"Se esperan {2 ** num_levels} hojas con valores 0/1")
+    table = []
+    for entry in _field(data, "flipflops", list) if "flipflops" in data else []:
+        table.append((
+            path_to_heap(_field(entry, "path", str, "flip-flop")),
+            _field(entry, "position", str, "flip-flop"),
+            _field(entry, "state", object, "flip-flop"),
+        ))
+    table = sorted(_check_flipflops(table, num_levels))
+    return num_levels, bytes(opcodes), leaves.translate(_FROM_CHARS), table
+
+
+def dumps(circuit: Union[TreeBuilder, Netlist], ff_map: Dict[str, tuple] = None) -> bytes:
+    """
+    Args:
+        circuit: TreeBuilder (construido o no) o Netlist
+        ff_map: Diccionario ruta -> (FlipFlop, posición) como el de la consola
+    Raises:
+        ValueError: Si algún nivel no tiene una compuerta serializable
+    Returns:
+        Circuito en formato binario
+    """
+    num_levels, opcodes, leaves = _circuit_parts(circuit)
+    table = _flipflop_table(ff_map or {})
+    parts = [_HEADER.pack(MAGIC, VERSION, num_levels, 0, len(table)), opcodes]
+    parts.extend(
+        _FLIPFLOP.pack(heap, _POSITIONS.index(position), state)
+        for heap, position, state in table
+    )
+    parts.append(pack_leaves(leaves))
+    return b''.join(parts)
+
+
+def _parse_header(data: bytes) -> Tuple[int, int, int]:
+    # Retorna (niveles, cantidad de flip-flops, offset del bitmap de hojas)
+    if len(data) < _HEADER.size:
+        raise ValueError("Archivo de circuito truncado")
+    magic, version, num_levels, _, ff_count = _HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise ValueError("No es un archivo de circuito (cabecera inválida)")
+    if version != VERSION:
+        raise ValueError(f"Versión de circuito no soportada: {version}")
+    if num_levels < 1:
+        raise ValueError("Mínimo 1 nivel de compuertas")
+    offset = _HEADER.size + num_levels + ff_count * _FLIPFLOP.size
+    if len(data) < offset + (2 ** num_levels + 7) // 8:
+        raise ValueError("Archivo de circuito truncado")
+    return num_levels, ff_count, offset
+
+
+def _parse_binary(data: bytes) -> Tuple[int, bytes, bytes, List[Tuple[int, str, int]]]:
+    num_levels, ff_count, offset = _parse_header(data)
+    opcodes = bytes(data[_HEADER.size:_HEADER.size + num_levels])
+    for op in opcodes:
+        if op >= len(GATE_BY_OPCODE):
+            raise ValueError(f"Opcode desconocido: {op}")
+    table = []
+    position_offset = _HEADER.size + num_levels
+    for i in range(ff_count):
+        heap, position, state = _FLIPFLOP.unpack_from(data, position_offset + i * _FLIPFLOP.size)
+        if position >= len(_POSITIONS):
+            raise ValueError(f"Posición de FlipFlop inválida: {position}")
+        table.append((heap, _POSITIONS[position], state))
+    table = _check_flipflops(table, num_levels)
+    return num_levels, opcodes, unpack_leaves(data[offset:], 2 ** num_levels), table
+
+
+def _to_builder(num_levels: int, opcodes: bytes, leaves: bytes,
+                table: List[Tuple[int, str, int]]) -> Tuple[TreeBuilder, Nodo, Dict[str, tuple]]:
+    builder = TreeBuilder(num_levels, [GATE_BY_OPCODE[op] for op in opcodes])
+    root = builder.build()
+    for leaf, value in zip(builder.get_leaves(), leaves):
+        leaf.value = value
+    return builder, root, _make_ff_map(table)
+
+
+def _to_netlist(num_levels: int, opcodes: bytes, leaves: bytes,
+                table: List[Tuple[int, str, int]]) -> Tuple[Netlist, Dict[str, tuple]]:
+    netlist = Netlist(num_levels, opcodes)
+    start = netlist.leaf_offset
+    netlist.values[start:start + netlist.num_inputs] = leaves
+    return netlist, _make_ff_map(table)
+
+
+def from_dict(data: dict) -> Tuple[TreeBuilder, Nodo, Dict[str, tuple]]:
+    """
+    Args:
+        data: Diccionario generado por to_dict
+    Raises:
+        ValueError: Si el diccionario no describe un circuito válido
+    Returns:
+        Tupla (builder, raíz, ff_map) con el árbol construido y las hojas asignadas
+    """
+    return _to_builder(*_parse_dict(data))
+
+
+def loads_builder(data: bytes) -> Tuple[TreeBuilder, Nodo, Dict[str, tuple]]:
+    """
+    Args:
+        data: Circuito en formato binario (bytes, bytearray, memoryview o mmap)
+    Raises:
+        ValueError: Si los datos no son un circuito válido
+    Returns:
+        Tupla (builder, raíz, ff_map) con el árbol construido y las hojas asignadas
+    """
+    return _to_builder(*_parse_binary(data))
+
+
+def loads_netlist(data: bytes) -> Tuple[Netlist, Dict[str, tuple]]:
+    """
+    Carga el circuito directamente como Netlist, sin crear Nodo (recomendado para árboles grandes).
+
+    Args:
+        data: Circuito en formato binario (bytes, bytearray, memoryview o mmap)
+    Raises:
+        ValueError: Si los datos no son un circuito válido
+    Returns:
+        Tupla (netlist sin evaluar, ff_map)
+    """
+    return _to_netlist(*_parse_binary(data))
+
+
+def save_json(dest: str, circuit: Union[TreeBuilder, Netlist], ff_map: Dict[str, tuple] = None):
+    """Guarda el circuito como JSON en la ruta dest."""
+    with open(dest, 'w') as f:
+        json.dump(to_dict(circuit, ff_map), f, indent=2)
+
+
+def load_json(source: str) -> Tuple[TreeBuilder, Nodo, Dict[str, tuple]]:
+    """Carga un circuito JSON y retorna (builder, raíz, ff_map)."""
+    with open(source) as f:
+        return from_dict(json.load(f))
+
+
+def save(dest: str, circuit: Union[TreeBuilder, Netlist], ff_map: Dict[str, tuple] = None):
+    """Guarda el circuito en formato binario en la ruta dest."""
+    with open(dest, 'wb') as f:
+        f.write(dumps(circuit, ff_map))
+
+
+def load(source: str, as_netlist: bool = False):
+    """
+    Args:
+        source: Ruta del archivo binario
+        as_netlist: True para obtener (netlist, ff_map) en lugar de (builder, raíz, ff_map)
+    Returns:
+        El resultado de loads_netlist o de loads_builder
+    """
+    with open(source, 'rb') as f:
+        data = f.read()
+    return loads_netlist(data) if as_netlist else loads_builder(data)
+
+
+class LeafBitmap:
+    """
+    Acceso de solo lectura, mediante mmap, al bitmap de hojas de un archivo binario.
+    Solo se leen del disco las páginas de las hojas consultadas.
+
+    Attributes:
+        num_levels: Cantidad de niveles de compuertas del circuito
+        offset: Posición del bitmap dentro del archivo
+    """
+
+    def __init__(self, source: str):
+        """
+        Args:
+            source: Ruta del archivo binario
+        Raises:
+            ValueError: Si el archivo no es un circuito válido
+        """
+        with open(source, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._view = None
+        try:
+            self.num_levels, _, self.offset = _parse_header(self._mmap)
+        except ValueError:
+            self._mmap.close()
+            raise
+
+    def __len__(self) -> int:
+        return 2 ** self.num_levels
+
+    def __getitem__(self, index: int) -> int:
+        if not 0 <= index < len(self):
+            raise IndexError(f"No existe la hoja {index}")
+        return (self._mmap[self.offset + index // 8] >> (index % 8)) & 1
+
+    def bitmap(self) -> memoryview:
+        """
+        Retorna una vista (sin copia) del bitmap empaquetado. Todas las llamadas retornan
+        la misma vista, que close() libera; después de close() ya no se puede leer.
+        """
+        if self._view is None:
+            self._view = memoryview(self._mmap)[self.offset:self.offset + (len(self) + 7) // 8]
+        return self._view
+
+    def leaves(self) -> bytes:
+        """Retorna un byte 0/1 por hoja."""
+        return unpack_leaves(self.bitmap(), len(self))
+
+    def close(self):
+        """
+        Libera la vista de bitmap() y cierra el mmap.
+
+        Raises:
+            BufferError: Si sigue viva alguna vista creada a partir de la de bitmap()
+                         (por ejemplo un slice); hay que liberarla antes con release()
+        """
+        if self._view is not None:
+            self._view.release()
+            self._view = None
+        self._mmap.close()
+
+    def __enter__(self) -> 'LeafBitmap':
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
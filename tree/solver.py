@@ -0,0 +1,211 @@
+#solver.py
+#Este módulo resuelve el problema inverso: dado un valor deseado en la raíz (o en cualquier
+#nodo, direccionado con una ruta L/R como en get_node_by_path) y algunas hojas fijadas,
+#encuentra los valores de las hojas que lo producen, sin probar las 2^n combinaciones.
+#
+#El valor requerido se propaga de arriba hacia abajo: para que una compuerta valga v se
+#eligen valores para sus hijos a partir de su tabla de verdad, usando el valor controlante
+#cuando existe (un 0 en una entrada de AND basta para obtener 0, así que la otra entrada
+#queda libre). Las alternativas de cada compuerta son disjuntas (p.ej. para AND = 0:
+#"izquierda 0, derecha libre" o "izquierda 1, derecha 0"), de modo que las soluciones se
+#entregan como cubos disjuntos: diccionarios hoja -> valor donde las hojas ausentes pueden
+#tomar cualquier valor.
+#
+#Antes de buscar se calcula de abajo hacia arriba qué valores puede tomar cada nodo con las
+#hojas fijadas. Como cada hoja alimenta una sola compuerta, los subárboles son independientes
+#y ese cálculo es exacto: la búsqueda nunca entra en una rama sin soluciones, así que no hay
+#retrocesos inútiles y cada solución cuesta un tiempo proporcional a la profundidad del árbol.
+#Las soluciones se generan de forma perezosa (generadores), así que pedir una sola es barato.
+#
+#Si se indica un ff_map, cada Flip-Flop se considera con su estado almacenado actual y con la
+#misma semántica de evaluate_with_flipflop (el solver no modifica el estado).
+
+import itertools
+from tree.builder import TreeBuilder
+from tree.evaluation import path_to_position
+from tree.netlist import _TABLES, opcode_for
+from typing import Dict, Iterator, List, Optional, Tuple
+
+# Bits de los valores posibles de un nodo
+_CAN_0 = 1
+_CAN_1 = 2
+
+
+def _flipflop_table(table: bytes, position: str, state: int) -> bytes:
+    # Tabla efectiva (índice 2*A + B) de una compuerta con un flip-flop de estado conocido
+    if position == 'input':
+        # Q = S | (estado & ~R) con S = A y R = B; Q alimenta ambas entradas de la compuerta
+        return bytes(table[3 * ((code >> 1) | (state & ~code & 1))] for code in range(4))
+    return bytes(table[code] | state for code in range(4))
+
+
+class _Search:
+    # Estado de una búsqueda: tablas por nodo, hojas fijadas y valores posibles por nodo
+
+    def __init__(self, builder: TreeBuilder, path: str, pinned: Optional[Dict[int, int]],
+                 ff_map: Optional[Dict[str, tuple]]):
+        num_levels = builder.num_levels
+        self.leaf_level = num_levels + 1
+        self.num_inputs = 2 ** num_levels
+        self.level_tables = [_TABLES[opcode_for(gate_class)] for gate_class in builder.gate_types]
+
+        self.pinned = {index: 1 if value else 0 for index, value in (pinned or {}).items()}
+        for index in self.pinned:
+            if not 0 <= index < self.num_inputs:
+                raise IndexError(f"No existe la hoja {index}")
+
+        self.node_tables: Dict[Tuple[int, int], bytes] = {}
+        # Hojas con flip-flop de entrada en estado 1: valen 1 sin importar la entrada
+        self.forced_leaves = set()
+        for ff_path, (ff, position) in (ff_map or {}).items():
+            level, index = path_to_position(ff_path)
+            if level > self.leaf_level:
+                raise ValueError(f"Ruta de FlipFlop fuera del árbol: {ff_path!r}")
+            state = 1 if ff.value else 0
+            if level == self.leaf_level:
+                if position == 'input' and state:
+                    self.forced_leaves.add(index)
+            else:
+                table = self.level_tables[level - 1]
+                self.node_tables[(level, index)] = _flipflop_table(table, position, state)
+
+        self.root = path_to_position(path)
+        if self.root[0] > self.leaf_level:
+            raise ValueError(f"La ruta {path!r} está fuera del árbol")
+        self.possible = self._possible_values()
+
+    def table(self, level: int, index: int) -> bytes:
+        return self.node_tables.get((level, index)) or self.level_tables[level - 1]
+
+    def _leaf_possible(self, index: int) -> int:
+        if index in self.forced_leaves:
+            return _CAN_1
+        if index in self.pinned:
+            return _CAN_1 if self.pinned[index] else _CAN_0
+        return _CAN_0 | _CAN_1
+
+    def _possible_values(self) -> Dict[Tuple[int, int], int]:
+        # Valores que puede tomar cada nodo del subárbol objetivo, de las hojas hacia arriba
+        root_level, root_index = self.root
+        span = 2 ** (self.leaf_level - root_level)
+        first = root_index * span
+        possible = {
+            (self.leaf_level, i): self._leaf_possible(i) for i in range(first, first + span)
+        }
+        for level in range(self.leaf_level - 1, root_level - 1, -1):
+            span //= 2
+            first //= 2
+            for index in range(first, first + span):
+                table = self.table(level, index)
+                left = possible[(level + 1, 2 * index)]
+                right = possible[(level + 1, 2 * index + 1)]
+                mask = 0
+                for a in (0, 1):
+                    if left >> a & 1:
+                        for b in (0, 1):
+                            if right >> b & 1:
+                                mask |= _CAN_1 if table[2 * a + b] else _CAN_0
+                possible[(level, index)] = mask
+        return possible
+
+    def options(self, level: int, index: int, value: int) -> List[Tuple[int, Optional[int]]]:
+        # Alternativas disjuntas (valor izquierdo, valor derecho o None = libre) para obtener value
+        table = self.table(level, index)
+        left = self.possible[(level + 1, 2 * index)]
+        right = self.possible[(level + 1, 2 * index + 1)]
+        rights = [b for b in (0, 1) if right >> b & 1]
+        result = []
+        for a in (0, 1):
+            if not left >> a & 1:
+                continue
+            matching = [b for b in rights if table[2 * a + b] == value]
+            if len(matching) == len(rights):
+                # Valor controlante: la entrada derecha no influye
+                result.append((a, None))
+            else:
+                result.extend((a, b) for b in matching)
+        return result
+
+    def cubes(self, level: int, index: int, value: int) -> Iterator[Dict[int, int]]:
+        if level == self.leaf_level:
+            # Las hojas fijadas o forzadas por un flip-flop no se eligen
+            if index in self.pinned or index in self.forced_leaves:
+                yield {}
+            else:
+                yield {index: value}
+            return
+        for a, b in self.options(level, index, value):
+            for left in self.cubes(level + 1, 2 * index, a):
+                if b is None:
+                    yield left
+                    continue
+                for right in self.cubes(level + 1, 2 * index + 1, b):
+                    cube = dict(left)
+                    cube.update(right)
+                    yield cube
+
+
+def iter_cubes(builder: TreeBuilder, target: int = 1, path: str = '',
+               pinned: Optional[Dict[int, int]] = None,
+               ff_map: Optional[Dict[str, tuple]] = None) -> Iterator[Dict[int, int]]:
+    """
+    Genera las soluciones como cubos disjuntos.
+
+    Args:
+        builder: TreeBuilder que describe el circuito (no requiere build())
+        target: Valor deseado en el nodo (0 o 1)
+        path: Ruta L/R del nodo objetivo ('' es la raíz)
+        pinned: Diccionario índice de hoja -> valor de las hojas fijadas
+        ff_map: Diccionario ruta -> (FlipFlop, posición) como el de la consola
+    Raises:
+        ValueError: Si target no es 0 o 1, la ruta está fuera del árbol o algún nivel no es
+                    una compuerta combinacional
+        IndexError: Si alguna hoja fijada no existe
+    Returns:
+        Generador de diccionarios hoja -> valor; incluyen siempre las hojas fijadas y las
+        hojas ausentes pueden tomar cualquier valor. Ningún par de cubos comparte soluciones.
+    """
+    if target not in (0, 1):
+        raise ValueError("El valor objetivo debe ser 0 o 1")
+    search = _Search(builder, path, pinned, ff_map)
+    level, index = search.root
+    if not search.possible[(level, index)] >> target & 1:
+        return
+    for cube in search.cubes(level, index, target):
+        cube.update(search.pinned)
+        yield cube
+
+
+def iter_solutions(builder: TreeBuilder, target: int = 1, path: str = '',
+                   pinned: Optional[Dict[int, int]] = None,
+                   ff_map: Optional[Dict[str, tuple]] = None) -> Iterator[List[int]]:
+    """
+    Genera todas las asignaciones completas de las hojas que producen target en el nodo,
+    expandiendo cada cubo (mismos argumentos que iter_cubes).
+
+    Returns:
+        Generador de listas con el valor de cada hoja, sin repetidos
+    """
+    num_inputs = 2 ** builder.num_levels
+    for cube in iter_cubes(builder, target, path, pinned, ff_map):
+        free = [i for i in range(num_inputs) if i not in cube]
+        leaves = [cube.get(i, 0) for i in range(num_inputs)]
+        for values in itertools.product((0, 1), repeat=len(free)):
+            for i, value in zip(free, values):
+                leaves[i] = value
+            yield list(leaves)
+
+
+def solve(builder: TreeBuilder, target: int = 1, path: str = '',
+          pinned: Optional[Dict[int, int]] = None,
+          ff_map: Optional[Dict[str, tuple]] = None) -> Optional[List[int]]:
+    """
+    Busca una sola asignación (mismos argumentos que iter_cubes).
+
+    Returns:
+        Lista con el valor de cada hoja (las hojas libres quedan en 0) o None si ninguna
+        asignación produce target
+    """
+    for cube in iter_cubes(builder, target, path, pinned, ff_map):
+        return [cube.get(i, 0) for i in range(2 ** builder.num_levels)]
+    return None
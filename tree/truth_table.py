@@ -0,0 +1,169 @@
+#truth_table.py
+#Este módulo genera la tabla de verdad completa de un circuito de TreeBuilder sin
+#guardarla en memoria: las filas (o bloques empaquetados de salidas) se producen con generadores.
+#Convención: en la fila r, la hoja i vale el bit (n-1-i) de r, es decir, la hoja 0 es el bit
+#más significativo, como en una tabla de verdad escrita a mano.
+#  - Orden binario: las salidas se calculan por bloques alineados de 2^k filas con el evaluador
+#    bit-paralelo; las columnas de las hojas de un bloque son patrones periódicos fijos.
+#  - Orden Gray: filas consecutivas difieren en una sola hoja, así que cada fila se obtiene
+#    con una reevaluación incremental de la netlist (O(niveles) por fila).
+#Las salidas pueden escribirse a CSV o a un bitmap binario compacto (1 bit por fila).
+
+import csv
+from tree.batch import BatchEvaluator
+from tree.builder import TreeBuilder
+from tree.netlist import Netlist, opcode_for
+from typing import Dict, Iterator, List, Optional, Tuple
+
+
+def _periodic_columns(num_inputs: int, chunk_bits: int) -> List[int]:
+    # Columnas fijas de las hojas que varían dentro de un bloque alineado de 2^chunk_bits filas;
+    # para la hoja del bit b: 2^b ceros seguidos de 2^b unos, repetido a lo largo del bloque
+    mask = (1 << 2 ** chunk_bits) - 1
+    columns = {}
+    for bit in range(chunk_bits):
+        period = 2 ** (bit + 1)
+        block = ((1 << 2 ** bit) - 1) << 2 ** bit
+        columns[num_inputs - 1 - bit] = block * (mask // ((1 << period) - 1))
+    return columns
+
+
+def iter_chunks(
+    builder: TreeBuilder,
+    chunk_bits: int = 16,
+    start: int = 0,
+    stop: Optional[int] = None,
+    ff_map: Optional[Dict[str, tuple]] = None
+) -> Iterator[Tuple[int, int, int]]:
+    """
+    Recorre la tabla de verdad en orden binario por bloques empaquetados.
+
+    Args:
+        builder: TreeBuilder que describe el circuito
+        chunk_bits: Cada bloque cubre 2^chunk_bits filas (se reduce si el circuito es menor)
+        start: Primera fila a recorrer (múltiplo del tamaño de bloque)
+        stop: Fila final, exclusiva (múltiplo del tamaño de bloque; None = todas)
+        ff_map: Flip-flops del circuito (ver BatchEvaluator)
+    Raises:
+        ValueError: Si el rango no está alineado al tamaño de bloque
+    Returns:
+        Generador de tuplas (fila inicial, cantidad de filas, columna de salidas);
+        el bit k de la columna es la salida de la fila inicial + k
+    """
+    if chunk_bits < 0:
+        raise ValueError("chunk_bits no puede ser negativo")
+    evaluator = BatchEvaluator(builder, ff_map)
+    num_inputs = evaluator.num_inputs
+    chunk_bits = min(chunk_bits, num_inputs)
+    count = 2 ** chunk_bits
+    if stop is None:
+        stop = 2 ** num_inputs
+    if start % count or stop % count:
+        raise ValueError(f"El rango debe estar alineado a bloques de {count} filas")
+
+    mask = (1 << count) - 1
+    periodic = _periodic_columns(num_inputs, chunk_bits)
+    # Las hojas de los bits altos son constantes dentro de cada bloque
+    fixed = num_inputs - chunk_bits
+
+    for base in range(start, stop, count):
+        columns = [
+            mask if (base >> (num_inputs - 1 - leaf)) & 1 else 0
+            for leaf in range(fixed)
+        ]
+        columns.extend(periodic[leaf] for leaf in range(fixed, num_inputs))
+        yield base, count, evaluator.evaluate(columns, count).output
+
+
+def iter_rows(builder: TreeBuilder, order: str = 'binary') -> Iterator[Tuple[Tuple[int, ...], int]]:
+    """
+    Recorre la tabla de verdad fila por fila.
+
+    Args:
+        builder: TreeBuilder que describe el circuito
+        order: 'binary' (conteo binario) o 'gray' (una sola hoja cambia entre filas)
+    Raises:
+        ValueError: Si el orden no es válido
+    Returns:
+        Generador de tuplas (valores de las hojas, salida de la raíz)
+    """
+    if order == 'binary':
+        return _iter_rows_binary(builder)
+    if order == 'gray':
+        return _iter_rows_gray(builder)
+    raise ValueError(f"Orden desconocido: {order!r} (use 'binary' o 'gray')")
+
+
+def _iter_rows_binary(builder: TreeBuilder):
+    num_inputs = 2 ** builder.num_levels
+    for base, count, outputs in iter_chunks(builder):
+        for k in range(count):
+            row = base + k
+            inputs = tuple(int(c) for c in format(row, f'0{num_inputs}b'))
+            yield inputs, (outputs >> k) & 1
+
+
+def _iter_rows_gray(builder: TreeBuilder):
+    # Netlist propia con todas las hojas en 0, sin tocar los Nodo del builder
+    netlist = Netlist(builder.num_levels, [opcode_for(g) for g in builder.gate_types])
+    num_inputs = netlist.num_inputs
+    current = [0] * num_inputs
+    yield tuple(current), netlist.evaluate()
+
+    for row in range(1, 2 ** num_inputs):
+        # Entre los códigos Gray de row-1 y row cambia el bit menos significativo encendido de row
+        bit = (row & -row).bit_length() - 1
+        leaf = num_inputs - 1 - bit
+        current[leaf] ^= 1
+        netlist.update_leaves({leaf: current[leaf]})
+        yield tuple(current), netlist.values[1]
+
+
+def write_csv(builder: TreeBuilder, dest, order: str = 'binary') -> int:
+    """
+    Escribe la tabla de verdad como CSV (una columna por hoja y la columna 'out').
+
+    Args:
+        builder: TreeBuilder que describe el circuito
+        dest: Ruta del archivo o archivo de texto abierto
+        order: 'binary' o 'gray'
+    Returns:
+        Cantidad de filas escritas
+    """
+    if isinstance(dest, (str, bytes)) or hasattr(dest, '__fspath__'):
+        with open(dest, 'w', newline='') as f:
+            return write_csv(builder, f, order)
+
+    num_inputs = 2 ** builder.num_levels
+    writer = csv.writer(dest)
+    writer.writerow([f"in{i}" for i in range(num_inputs)] + ["out"])
+    rows = 0
+    for inputs, output in iter_rows(builder, order):
+        writer.writerow(inputs + (output,))
+        rows += 1
+    return rows
+
+
+def write_bitmap(builder: TreeBuilder, dest, chunk_bits: int = 16) -> int:
+    """
+    Escribe las salidas en orden binario como bitmap: el bit r del archivo (orden
+    little-endian, bit 0 = bit menos significativo del primer byte) es la salida de la fila r.
+
+    Args:
+        builder: TreeBuilder que describe el circuito
+        dest: Ruta del archivo o archivo binario abierto
+        chunk_bits: Tamaño de bloque usado al evaluar (ver iter_chunks)
+    Returns:
+        Cantidad de bytes escritos
+    """
+    if isinstance(dest, (str, bytes)) or hasattr(dest, '__fspath__'):
+        with open(dest, 'wb') as f:
+            return write_bitmap(builder, f, chunk_bits)
+
+    # Con bloques de al menos 8 filas cada bloque ocupa bytes completos
+    written = 0
+    for _, count, outputs in iter_chunks(builder, max(chunk_bits, 3)):
+        data = outputs.to_bytes(max(1, count // 8), 'little')
+        dest.write(data)
+        written += len(data)
+    return written